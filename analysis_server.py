@@ -0,0 +1,340 @@
+"""
+Local HTTP/JSON analysis service for Adventure Communist save files
+Keeps one process running so tools get decodes and recommendations without start-up costs
+"""
+
+import argparse
+import collections
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from decode_cache import DecodeCache
+from experiments_roi import analyze_experiments, get_industry_production_ranking
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+# Requests waiting for or running on the pool before new ones get 503
+DEFAULT_MAX_PENDING = 64
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# Latencies kept for the percentiles in /metrics
+LATENCY_WINDOW = 1000
+# Throughput in /metrics also covers just the last this many seconds
+RECENT_SECONDS = 60.0
+
+
+class ServiceError(Exception):
+    """A request the service can't handle, with the HTTP status to answer with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ServiceMetrics:
+    """Request counts, latencies and throughput, safe to update from many threads."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = collections.Counter()  # endpoint -> requests
+        self.errors = collections.Counter()  # status -> responses
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._finished = collections.deque()  # completion times in the recent window
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, status):
+        """Record one finished request."""
+        now = time.monotonic()
+        with self._lock:
+            self.requests[endpoint] += 1
+            if status >= 400:
+                self.errors[status] += 1
+            self._latencies.append(seconds)
+            self._finished.append(now)
+            while self._finished and now - self._finished[0] > RECENT_SECONDS:
+                self._finished.popleft()
+
+    def snapshot(self, cache=None):
+        """Metrics as a JSON-ready dict."""
+        with self._lock:
+            uptime = time.monotonic() - self.started
+            latencies = sorted(self._latencies)
+            total = sum(self.requests.values())
+            recent = len(self._finished)
+            snapshot = {
+                "uptime_seconds": uptime,
+                "requests": total,
+                "requests_by_endpoint": dict(self.requests),
+                "errors_by_status": {str(k): v for k, v in self.errors.items()},
+                "requests_per_sec": total / uptime if uptime > 0 else 0.0,
+                "recent_requests_per_sec": recent / min(uptime, RECENT_SECONDS)
+                if uptime > 0
+                else 0.0,
+            }
+
+        if latencies:
+            snapshot["latency_ms"] = {
+                "p50": latencies[int(0.5 * (len(latencies) - 1))] * 1000,
+                "p90": latencies[int(0.9 * (len(latencies) - 1))] * 1000,
+                "p99": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+                "max": latencies[-1] * 1000,
+            }
+        if cache is not None:
+            snapshot["cache"] = {"hits": cache.hits, "misses": cache.misses}
+        return snapshot
+
+
+def analysis_payload(decoded_data, horizon_hours=None):
+    """Decoded cards, mission progress and experiment ranking as a JSON-ready dict."""
+    cards = decoded_data["cards"]
+    recommendations, current_scientists = analyze_experiments(
+        decoded_data, horizon_hours=horizon_hours
+    )
+    return {
+        "currency": {
+            "scientists": cards.get(36, {}).get("value", 0),
+            "comrades": cards.get(38, {}).get("value", 0),
+        },
+        "mission_progress": decoded_data["mission_progress"],
+        "cards": {card_id: card["value"] for card_id, card in cards.items()},
+        "production": get_industry_production_ranking(decoded_data),
+        "scientists": current_scientists,
+        "recommendations": recommendations,
+    }
+
+
+class AnalysisService:
+    """
+    Decodes and analyzes saves on a bounded worker pool with a shared cache.
+
+    At most max_pending requests wait for or run on the pool; further ones
+    are turned away with 503 instead of queueing without limit. Saves are only
+    read by path from inside saves_dir; without one, send the save bytes.
+    """
+
+    def __init__(
+        self, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING, cache=None, saves_dir=None
+    ):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.saves_dir = os.path.realpath(saves_dir) if saves_dir is not None else None
+        self.cache = cache if cache is not None else DecodeCache(max_entries=1024)
+        self.metrics = ServiceMetrics()
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def resolve_path(self, path):
+        """Real path of a requested save, which must be inside saves_dir."""
+        if self.saves_dir is None:
+            raise ServiceError(403, "Path requests are disabled - start with --saves-dir")
+        real_path = os.path.realpath(os.path.join(self.saves_dir, path))
+        if os.path.commonpath([self.saves_dir, real_path]) != self.saves_dir:
+            raise ServiceError(403, f"Path outside the saves directory: {path}")
+        return real_path
+
+    def analyze(self, data=None, path=None, horizon_hours=None):
+        """Decode a save (bytes or a path) and rank its experiments. Runs on the pool."""
+        if path is not None:
+            path = self.resolve_path(path)
+            if not os.path.isfile(path):
+                raise ServiceError(404, f"File not found: {path}")
+            decoded_data = self.cache.get(path)
+        else:
+            decoded_data = self.cache.get_bytes(data)
+
+        if not decoded_data:
+            raise ServiceError(422, "Not an Adventure Communist save (no ADCM header)")
+        return analysis_payload(decoded_data, horizon_hours)
+
+    def submit(self, data=None, path=None, horizon_hours=None):
+        """Run analyze() on the pool and wait for it."""
+        # A non-blocking acquire can't be a with block; released below
+        if not self._slots.acquire(blocking=False):  # pylint: disable=consider-using-with
+            raise ServiceError(503, "Too many requests in flight - try again shortly")
+        try:
+            future = self.executor.submit(self.analyze, data, path, horizon_hours)
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        self.executor.shutdown(wait=False)
+
+
+def _parse_horizon(value):
+    """Optional horizon in hours from a query string or JSON body."""
+    if value is None or value == "":
+        return None
+    try:
+        horizon_hours = float(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"Invalid horizon: {value!r}") from None
+    if not 0 < horizon_hours < math.inf:
+        raise ServiceError(400, "horizon must be a positive number of hours")
+    return horizon_hours
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET  /analyze?path=...&horizon=...  analyze a save file in the saves directory
+    POST /analyze                       raw save bytes, or JSON {"path", "horizon"}
+    GET  /metrics                       request latency, throughput and cache stats
+    GET  /health                        liveness check
+    """
+
+    server_version = "ADCMAnalysis/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/health":
+            self._respond(url.path, lambda: {"status": "ok"})
+        elif url.path == "/metrics":
+            service = self.server.service
+            self._respond(url.path, lambda: service.metrics.snapshot(service.cache))
+        elif url.path == "/analyze":
+            self._respond(
+                url.path,
+                lambda: self.server.service.submit(
+                    path=self._require(query, "path"),
+                    horizon_hours=_parse_horizon(query.get("horizon", [None])[0]),
+                ),
+            )
+        else:
+            self._respond("other", self._not_found)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST requests."""
+        url = urlparse(self.path)
+        if url.path != "/analyze":
+            self._respond("other", self._not_found)
+            return
+
+        query = parse_qs(url.query)
+        self._respond(url.path, lambda: self._analyze_body(query))
+
+    def _analyze_body(self, query):
+        """Analyze the save bytes (or JSON path request) in the request body."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ServiceError(400, "Invalid Content-Length") from None
+        if length < 0:
+            raise ServiceError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise ServiceError(413, f"Body larger than {MAX_BODY_BYTES:,} bytes")
+        body = self.rfile.read(length)
+        if not body:
+            raise ServiceError(400, "Send save bytes or a JSON body with a path")
+
+        horizon = query.get("horizon", [None])[0]
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                request = json.loads(body)
+            except ValueError as e:
+                raise ServiceError(400, f"Invalid JSON: {e}") from None
+            if not isinstance(request, dict) or "path" not in request:
+                raise ServiceError(400, 'JSON body must be {"path": ...}')
+            return self.server.service.submit(
+                path=request["path"],
+                horizon_hours=_parse_horizon(request.get("horizon", horizon)),
+            )
+
+        return self.server.service.submit(data=body, horizon_hours=_parse_horizon(horizon))
+
+    @staticmethod
+    def _require(query, name):
+        values = query.get(name)
+        if not values or not values[0]:
+            raise ServiceError(400, f"Missing query parameter: {name}")
+        return values[0]
+
+    def _not_found(self):
+        raise ServiceError(404, f"Unknown endpoint: {urlparse(self.path).path}")
+
+    def _respond(self, endpoint, handler):
+        """Run handler, send its result (or error) as JSON and record metrics."""
+        start = time.perf_counter()
+        try:
+            status, payload = 200, handler()
+        except ServiceError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:  # pylint: disable=broad-except
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+        if status >= 400:
+            # The request body may not have been read - don't reuse the connection
+            self.close_connection = True
+
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.service.metrics.record(endpoint, time.perf_counter() - start, status)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """HTTP server that hands its requests to an AnalysisService."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service, verbose=False):
+        super().__init__(address, AnalysisRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+def main():
+    """Main entry point for the analysis service."""
+    parser = argparse.ArgumentParser(
+        description="Serve save decoding and experiment recommendations over local HTTP."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port (default: 8765)")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help="Decode worker threads"
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=DEFAULT_MAX_PENDING,
+        help="Requests in flight before new ones are rejected with 503",
+    )
+    parser.add_argument(
+        "--saves-dir", help="Allow analyzing saves by path, but only inside this directory"
+    )
+    parser.add_argument("--cache-dir", help="Also keep decoded saves in this directory")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    cache = DecodeCache(max_entries=1024, cache_dir=args.cache_dir)
+    service = AnalysisService(args.workers, args.max_pending, cache, args.saves_dir)
+    server = AnalysisServer((args.host, args.port), service, args.verbose)
+
+    print(f"Serving on http://{args.host}:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,47 +3,50 @@ Command-line Experiments ROI analysis tool for Adventure Communist
 Shows which experiments give the best return on investment
 """
 
+import argparse
+import os
 import sys
-from decoder_gui import decode_adventure_communist_save
+from card_history import CardHistory, append_save
+from decode_cache import DecodeCache
+from growth_forecast import GrowthModel, experiment_etas, format_forecast
+from profiler import Profile, format_profile, profiling, write_records
+from save_watcher import SaveWatcher, analysis_inputs
+from snapshot_rates import recent_growth
+from purchase_planner import format_purchase_plan, plan_purchases
 from experiments_roi import (
     analyze_experiments,
     format_experiment_recommendations,
     get_industry_production_ranking,
 )
+from production_projection import positive_hours
 
 
-def main():
-    """Main entry point for experiments analysis."""
-    # Get save file path
-    if len(sys.argv) > 1:
-        save_path = sys.argv[1]
-    else:
-        save_path = "game.sav"
-
-    print(f"Analyzing experiments from: {save_path}\n")
-
-    # Decode save file
-    decoded_data = decode_adventure_communist_save(save_path)
-
-    if not decoded_data:
-        print("Error: Could not decode save file")
-        return 1
-
+def print_analysis(decoded_data, horizon_hours=None, growth=None):
+    """
+    Print the industry ranking and experiment recommendations. With growth
+    (hourly rates by card ID) industries are ranked by growth, not totals.
+    """
     # Show industry production ranking
     print("\n" + "=" * 90)
-    print("INDUSTRY PRODUCTION RANKING (Focus on weakest industries)")
+    if growth:
+        print("INDUSTRY GROWTH RANKING (Per hour - focus on slowest-growing industries)")
+    else:
+        print("INDUSTRY PRODUCTION RANKING (Focus on weakest industries)")
     print("=" * 90)
-    production = get_industry_production_ranking(decoded_data)
+    production = get_industry_production_ranking(decoded_data, growth)
+    unit = "/h" if growth else ""
     for i, (industry, value) in enumerate(production.items(), 1):
         progress_bar = (
             "#" * min(50, int(value / max(production.values()) * 50))
             if value > 0
             else ""
         )
-        print(f"{i}. {industry:10} {value:12.2e} {progress_bar}")
+        print(f"{i}. {industry:10} {value:12.2e}{unit} {progress_bar}")
 
     # Analyze experiments
-    recommendations, current_scientists = analyze_experiments(decoded_data)
+    recommendations, current_scientists = analyze_experiments(
+        decoded_data, horizon_hours=horizon_hours
+    )
 
     # Note: The save file doesn't store which specific experiments are researched
     # To get accurate recommendations, update KNOWN_RESEARCHED list in experiments_roi.py
@@ -54,6 +57,177 @@ def main():
     )
     print("\n" + output)
 
+    # Best bundle to buy with the Scientists on hand
+    print("\n" + format_purchase_plan(plan_purchases(current_scientists)))
+
+
+def print_forecast(model):
+    """Print growth fits and Scientists ETAs once there are snapshots to fit."""
+    if model.snapshots >= 2:
+        print("\n" + format_forecast(model, experiment_etas(model)))
+
+
+def report_profile(profile, save_path, profile_output=None):
+    """Print a run's profile and optionally append it to a JSON lines file."""
+    record = profile.record(path=save_path)
+    print("\n" + format_profile(record))
+    if profile_output:
+        write_records(profile_output, [record])
+
+
+def read_save(decode_cache, save_path):
+    """
+    Decode the save and get its modification time, or print why it can't be
+    read (missing or locked while the game rewrites it) and return (None, None).
+    """
+    try:
+        return decode_cache.get(save_path), os.path.getmtime(save_path)
+    except OSError as e:
+        print(f"Error: Could not read save file: {e}")
+        return None, None
+
+
+def watch(
+    save_path,
+    decode_cache,
+    interval,
+    debounce,
+    horizon_hours=None,
+    profile=False,
+    profile_output=None,
+    history=None,
+):
+    """Re-analyze the save every time the game writes it."""
+    print(f"Watching {save_path} for changes (Ctrl+C to stop)\n")
+    last_inputs = None
+    # Refitted with each new snapshot rather than from the whole history
+    forecast = GrowthModel.from_history(history) if history is not None else None
+
+    try:
+        for _ in SaveWatcher(save_path, debounce=debounce).watch(interval):
+            run_profile = Profile() if profile else None
+            with profiling(run_profile):
+                decoded_data, saved_at = read_save(decode_cache, save_path)
+                if saved_at is None:
+                    continue
+                if not decoded_data:
+                    print("Error: Could not decode save file")
+                    continue
+                growth = None
+                if history is not None:
+                    history.append(decoded_data["cards"], saved_at)
+                    growth = recent_growth(history)
+                    forecast.update(saved_at, decoded_data["cards"])
+
+                inputs = analysis_inputs(decoded_data)
+                if inputs == last_inputs:
+                    print("Save changed - Scientists and resources unchanged, skipping analysis")
+                    continue
+
+                last_inputs = inputs
+                print_analysis(decoded_data, horizon_hours, growth)
+                if forecast is not None:
+                    print_forecast(forecast)
+
+            if run_profile:
+                report_profile(run_profile, save_path, profile_output)
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def main():
+    """Main entry point for experiments analysis."""
+    parser = argparse.ArgumentParser(
+        description="Show which experiments give the best return on investment."
+    )
+    parser.add_argument(
+        "save_path", nargs="?", default="game.sav", help="Save file (default: game.sav)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Keep decoded saves in this directory so unchanged saves aren't re-parsed",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-analyze whenever the save file changes",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Seconds between checks in watch mode"
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="Seconds a changed save must stay unchanged before it is decoded",
+    )
+    parser.add_argument(
+        "--horizon",
+        type=positive_hours,
+        help="Rank by production projected over this many hours instead of ROI score",
+    )
+    parser.add_argument(
+        "--history",
+        help="Append every decoded snapshot's card values to this history directory "
+        "to rank industries by growth over the last day and forecast experiment ETAs",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Show time spent per phase (read, card parsing, analysis, ...) and counters",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Append machine-readable profile records to this JSON lines file",
+    )
+    args = parser.parse_args()
+    save_path = args.save_path
+    decode_cache = DecodeCache(cache_dir=args.cache_dir)
+    profile = args.profile or bool(args.profile_output)
+    history = CardHistory(args.history) if args.history else None
+
+    if args.watch:
+        try:
+            return watch(
+                save_path,
+                decode_cache,
+                args.interval,
+                args.debounce,
+                args.horizon,
+                profile,
+                args.profile_output,
+                history,
+            )
+        finally:
+            if history is not None:
+                history.close()
+
+    print(f"Analyzing experiments from: {save_path}\n")
+
+    run_profile = Profile() if profile else None
+    with profiling(run_profile):
+        # Decode save file
+        decoded_data = decode_cache.get(save_path)
+
+        if not decoded_data:
+            print("Error: Could not decode save file")
+            return 1
+
+        growth = forecast = None
+        if history is not None:
+            with history:
+                append_save(history, decoded_data, save_path)
+                growth = recent_growth(history)
+                forecast = GrowthModel.from_history(history)
+
+        print_analysis(decoded_data, args.horizon, growth)
+        if forecast is not None:
+            print_forecast(forecast)
+
+    if run_profile:
+        report_profile(run_profile, save_path, args.profile_output)
     return 0
 
 
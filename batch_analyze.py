@@ -0,0 +1,183 @@
+"""
+Batch decoder and Experiments ROI analyzer for Adventure Communist
+Walks a directory tree of save snapshots and analyzes them on a process pool
+"""
+
+import argparse
+import fnmatch
+import functools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decoder import decode_adventure_communist_save
+from experiments_roi import analyze_experiments
+from profiler import (
+    Profile,
+    aggregate_records,
+    format_profile,
+    profiling,
+    write_records,
+)
+
+
+def find_save_files(root, pattern="*.sav"):
+    """Yield every save file below root matching pattern, in a stable order."""
+    if os.path.isfile(root):
+        yield root
+        return
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if fnmatch.fnmatch(name, pattern):
+                yield os.path.join(dirpath, name)
+
+
+def analyze_save_file(save_path, full=False):
+    """
+    Decode one save file and rank its experiments.
+    Returns the path, Scientists and top experiment's name (None if there is
+    none). With full=True the decoded save and every recommendation are
+    included too - they are large, so batch runs leave them out by default.
+    """
+    decoded_data = decode_adventure_communist_save(save_path)
+    if not decoded_data:
+        raise ValueError("No ADCM header found")
+
+    recommendations, current_scientists = analyze_experiments(decoded_data)
+    result = {
+        "path": save_path,
+        "scientists": current_scientists,
+        "top": recommendations[0]["name"] if recommendations else None,
+    }
+    if full:
+        result["decoded"] = decoded_data
+        result["recommendations"] = recommendations
+    return result
+
+
+def _analyze_worker(save_path, profile=False, full=False):
+    """
+    Process pool entry point - never raises so one bad save can't stop the run.
+    Returns (result, failure, profile record or None).
+    """
+    run_profile = Profile() if profile else None
+    with profiling(run_profile):
+        try:
+            outcome = analyze_save_file(save_path, full), None
+        except Exception as e:  # pylint: disable=broad-except
+            if run_profile:
+                run_profile.count("exceptions_swallowed")
+            outcome = None, (save_path, f"{type(e).__name__}: {e}")
+
+    record = run_profile.record(path=save_path) if run_profile else None
+    return outcome + (record,)
+
+
+def _collect_outcomes(outcomes, results, failures, profiles):
+    """Split worker outcomes into successful results, failures and profile records."""
+    for result, failure, record in outcomes:
+        if failure:
+            failures.append(failure)
+        else:
+            results.append(result)
+        if record:
+            profiles.append(record)
+
+
+def batch_analyze(save_paths, workers=None, chunksize=16, profile=False, full=False):
+    """
+    Decode and analyze many save files in parallel.
+    Per-file failures are collected instead of aborting the run.
+    Use workers=1 to run everything in the current process.
+    With profile=True every save's phase timings and counters are returned
+    in "profiles", one record per save. Results are summaries unless full
+    is set (see analyze_save_file).
+    """
+    save_paths = list(save_paths)
+    results = []
+    failures = []
+    profiles = []
+    worker = functools.partial(_analyze_worker, profile=profile, full=full)
+
+    start = time.perf_counter()
+    if workers == 1:
+        _collect_outcomes(map(worker, save_paths), results, failures, profiles)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = executor.map(worker, save_paths, chunksize=chunksize)
+            _collect_outcomes(outcomes, results, failures, profiles)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "results": results,
+        "failures": failures,
+        "profiles": profiles,
+        "elapsed": elapsed,
+        "saves_per_sec": len(save_paths) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    """Main entry point for batch analysis."""
+    parser = argparse.ArgumentParser(
+        description="Decode and analyze every save file in a directory tree."
+    )
+    parser.add_argument("root", help="Directory (or single file) to scan")
+    parser.add_argument(
+        "--pattern", default="*.sav", help="Filename pattern to match (default: *.sav)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=16, help="Saves handed to a worker at a time"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Show time spent per phase and counters, summed over all saves",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Append one machine-readable profile record per save to this JSON lines file",
+    )
+    args = parser.parse_args()
+    profile = args.profile or bool(args.profile_output)
+
+    save_paths = list(find_save_files(args.root, args.pattern))
+    if not save_paths:
+        print(f"No save files matching {args.pattern} found in: {args.root}")
+        return 1
+
+    print(f"Analyzing {len(save_paths)} save files from: {args.root}\n")
+    report = batch_analyze(
+        save_paths, workers=args.workers, chunksize=args.chunksize, profile=profile
+    )
+
+    for result in report["results"]:
+        top = result["top"] or "-"
+        print(f"{result['path']}: Scientists {result['scientists']:,} | Top: {top}")
+
+    if report["failures"]:
+        print(f"\nFAILED ({len(report['failures'])}):")
+        for save_path, error in report["failures"]:
+            print(f"  {save_path}: {error}")
+
+    print("\n" + "=" * 90)
+    print(
+        f"Decoded {len(report['results'])}/{len(save_paths)} saves in "
+        f"{report['elapsed']:.2f}s ({report['saves_per_sec']:,.1f} saves/sec)"
+    )
+
+    if profile:
+        print("\n" + format_profile(aggregate_records(report["profiles"])))
+    if args.profile_output:
+        write_records(args.profile_output, report["profiles"])
+
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Benchmark suite for the Adventure Communist decoder and analyzer
+Times decoding, analysis, formatting and batch runs over synthetic save corpora
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from batch_analyze import batch_analyze
+from decoder import decode_adventure_communist_save
+from experiments_roi import analyze_experiments, format_experiment_recommendations
+from save_generator import generate_corpus
+
+BENCHMARKS = ("decode", "analyze", "format", "batch")
+DEFAULT_SIZES = (10, 1000)
+# Flag a benchmark when it gets this much slower than its baseline (0.2 = 20%)
+DEFAULT_THRESHOLD = 0.2
+# Corpus saves cycle through card sections inside and outside the scan window
+CORPUS_CARD_OFFSETS = (0x14A8, 0x1400, 0x900, 0x2000, 0x8000)
+DEFAULT_CORPUS_DIR = os.path.join(tempfile.gettempdir(), "adcm_benchmark_corpus")
+
+
+def _best_time(func, repeat):
+    """Best wall-clock time of repeat calls to func."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _record(seconds, files):
+    """Benchmark result in the layout baselines are stored in."""
+    per_save = seconds / files
+    return {
+        "files": files,
+        "seconds": seconds,
+        "seconds_per_save": per_save,
+        "saves_per_sec": 1 / per_save if per_save > 0 else 0.0,
+    }
+
+
+def _decode_all(paths):
+    return [decode_adventure_communist_save(path) for path in paths]
+
+
+def _analyze_all(decoded):
+    return [analyze_experiments(data) for data in decoded]
+
+
+def _format_all(analyses):
+    return [
+        format_experiment_recommendations(recommendations, scientists)
+        for recommendations, scientists in analyses
+    ]
+
+
+def corpus(size, corpus_dir=DEFAULT_CORPUS_DIR):
+    """Synthetic save paths for a corpus of size files (generated on first use)."""
+    directory = os.path.join(corpus_dir, f"corpus_{size}")
+    return generate_corpus(directory, size, card_offsets=CORPUS_CARD_OFFSETS)
+
+
+def run_benchmarks(
+    sizes=DEFAULT_SIZES,
+    benchmarks=BENCHMARKS,
+    corpus_dir=DEFAULT_CORPUS_DIR,
+    repeat=3,
+    workers=None,
+):
+    """
+    Time each benchmark over each corpus size.
+    Returns {"decode[1000]": {"files", "seconds", "seconds_per_save", "saves_per_sec"}, ...}.
+    """
+    results = {}
+    for size in sizes:
+        paths = corpus(size, corpus_dir)
+        decoded = [decode_adventure_communist_save(path) for path in paths]
+        analyses = [analyze_experiments(data) for data in decoded]
+
+        timed = {
+            "decode": functools.partial(_decode_all, paths),
+            "analyze": functools.partial(_analyze_all, decoded),
+            "format": functools.partial(_format_all, analyses),
+            "batch": functools.partial(batch_analyze, paths, workers=workers),
+        }
+        for name in benchmarks:
+            results[f"{name}[{size}]"] = _record(_best_time(timed[name], repeat), size)
+
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results with a stored baseline.
+    Returns one entry per benchmark in both, with the relative change in time
+    per save and whether it is a regression beyond threshold.
+    """
+    comparisons = []
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if not previous or previous["seconds_per_save"] <= 0:
+            continue
+        change = result["seconds_per_save"] / previous["seconds_per_save"] - 1
+        comparisons.append(
+            {
+                "benchmark": name,
+                "baseline": previous["seconds_per_save"],
+                "current": result["seconds_per_save"],
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+    return comparisons
+
+
+def load_baseline(path):
+    """Read a baseline written by save_baseline."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    """Store results with enough context to tell baselines from different machines apart."""
+    baseline = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def format_benchmark_report(results, comparisons=None, threshold=DEFAULT_THRESHOLD):
+    """Format benchmark results (and any baseline comparison) as readable text."""
+    changes = {entry["benchmark"]: entry for entry in comparisons or ()}
+
+    output = []
+    output.append(f"{'='*90}")
+    output.append("BENCHMARK RESULTS")
+    output.append(f"{'='*90}\n")
+    output.append(
+        f"{'Benchmark':22} {'Files':>8} {'Total (s)':>10} {'us/save':>10} {'saves/sec':>12}"
+    )
+
+    for name, result in results.items():
+        line = (
+            f"{name:22} {result['files']:8,} {result['seconds']:10.3f} "
+            f"{result['seconds_per_save'] * 1e6:10.1f} {result['saves_per_sec']:12,.0f}"
+        )
+        if name in changes:
+            entry = changes[name]
+            line += f"  {entry['change']:+7.1%}"
+            if entry["regression"]:
+                line += "  REGRESSION"
+        output.append(line)
+
+    regressions = [entry for entry in changes.values() if entry["regression"]]
+    if comparisons is not None:
+        output.append("")
+        if regressions:
+            output.append(
+                f"❌ {len(regressions)} benchmark(s) more than {threshold:.0%} "
+                "slower than the baseline"
+            )
+        else:
+            output.append(f"✅ No regressions beyond {threshold:.0%}")
+
+    return "\n".join(output)
+
+
+def main():
+    """Main entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark decoding and analysis on synthetic save corpora."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Corpus sizes in files (default: 10 1000)",
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="Benchmarks to run"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (best is kept)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for batch")
+    parser.add_argument(
+        "--corpus-dir", default=DEFAULT_CORPUS_DIR, help="Where generated corpora are kept"
+    )
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--save-baseline", help="Write the results to this baseline JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown that counts as a regression (default: 0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.sizes, args.only, args.corpus_dir, args.repeat, args.workers
+    )
+
+    comparisons = None
+    if args.baseline:
+        comparisons = compare_to_baseline(
+            results, load_baseline(args.baseline), args.threshold
+        )
+    print(format_benchmark_report(results, comparisons, args.threshold))
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+        print(f"\nBaseline saved to: {args.save_baseline}")
+
+    if comparisons and any(entry["regression"] for entry in comparisons):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Card value history for Adventure Communist save files
+Append-only columnar store of card values across decoded snapshots
+"""
+
+import argparse
+import bisect
+import contextlib
+import math
+import mmap
+import os
+import sys
+import time
+from array import array
+from decoder import CARD_NAMES, decode_adventure_communist_save
+
+TIMESTAMP_COLUMN = "timestamp"
+COLUMN_SUFFIX = ".f64"
+# Columns are raw float64 arrays in the machine's byte order
+_CELL = array("d").itemsize
+_MISSING = array("d", [math.nan]).tobytes()
+
+
+class CardHistory:
+    """
+    Columnar history of card values, one row per snapshot.
+
+    Every card ID has its own file of float64 values and timestamp.f64 holds
+    the snapshot times, so a query only reads the columns it asks for, through
+    mmap. Rows are appended in time order. The timestamp column is written
+    last, so it decides how many rows exist; anything a crashed append left
+    in the other columns is cut off by the next append.
+
+    Cards missing from a snapshot are stored as NaN. One writer per directory.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._writers = {}  # column -> open append handle
+        self._files = contextlib.ExitStack()  # closes the append handles
+        self._card_ids = self._stored_card_ids()
+        self._rows = self._stored_rows(TIMESTAMP_COLUMN)
+        self._last_timestamp = None
+        if self._rows:
+            times, _ = self._read(TIMESTAMP_COLUMN, self._rows - 1, self._rows)
+            self._last_timestamp = times[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._rows
+
+    def close(self):
+        """Close the column files kept open for appending."""
+        self._files.close()
+        self._writers.clear()
+
+    def _path(self, column):
+        return os.path.join(self.directory, f"{column}{COLUMN_SUFFIX}")
+
+    def _stored_rows(self, column):
+        try:
+            return os.path.getsize(self._path(column)) // _CELL
+        except OSError:
+            return 0
+
+    def _stored_card_ids(self):
+        ids = set()
+        for name in os.listdir(self.directory):
+            stem, suffix = os.path.splitext(name)
+            if suffix == COLUMN_SUFFIX and stem.startswith("card_"):
+                ids.add(int(stem[5:]))
+        return ids
+
+    def card_ids(self):
+        """Card IDs with a column in the store."""
+        return sorted(self._card_ids)
+
+    def _writer(self, column):
+        """Append handle for a column, trimmed or NaN-padded to the committed rows."""
+        writer = self._writers.get(column)
+        if writer is None:
+            path = self._path(column)
+            mode = "r+b" if os.path.exists(path) else "w+b"
+            writer = self._files.enter_context(open(path, mode))
+            size = os.path.getsize(path)
+            stored = min(size // _CELL, self._rows)
+            if size != stored * _CELL:
+                # Cut off rows without a timestamp and any partial cell of a torn write
+                writer.truncate(stored * _CELL)
+            writer.seek(0, os.SEEK_END)
+            if stored < self._rows:
+                writer.write(_MISSING * (self._rows - stored))
+            self._writers[column] = writer
+        return writer
+
+    def append(self, cards, timestamp=None):
+        """
+        Append a snapshot of card values ({card_id: value} or a decoded save's
+        cards). Returns the new row number, or None if timestamp isn't later
+        than the last row (e.g. the same save decoded twice).
+        """
+        timestamp = time.time() if timestamp is None else float(timestamp)
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            return None
+
+        values = {
+            card_id: value["value"] if isinstance(value, dict) else float(value)
+            for card_id, value in cards.items()
+        }
+        self._card_ids.update(values)
+        for card_id in self._card_ids:
+            value = values.get(card_id, math.nan)
+            self._writer(f"card_{card_id}").write(array("d", [value]).tobytes())
+
+        for card_id in self._card_ids:
+            self._writers[f"card_{card_id}"].flush()
+        # Written last: the row only counts once its timestamp is on disk
+        writer = self._writer(TIMESTAMP_COLUMN)
+        writer.write(array("d", [timestamp]).tobytes())
+        writer.flush()
+
+        self._rows += 1
+        self._last_timestamp = timestamp
+        return self._rows - 1
+
+    def _read(self, column, first, last):
+        """Rows first..last-1 of a column as an array of floats, read through mmap."""
+        values = array("d")
+        if last <= first or not os.path.exists(self._path(column)):
+            return values, False
+        writer = self._writers.get(column)
+        if writer:
+            writer.flush()
+
+        with open(self._path(column), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < last * _CELL:
+                return values, False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                values.frombytes(data[first * _CELL : last * _CELL])
+        return values, True
+
+    def _row_range(self, start, end):
+        """Rows whose timestamps fall within [start, end], by bisecting the timestamp column."""
+        if not self._rows:
+            return 0, 0
+        path = self._path(TIMESTAMP_COLUMN)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            with memoryview(data) as view, view[: self._rows * _CELL].cast("d") as times:
+                first = 0 if start is None else bisect.bisect_left(times, start)
+                last = self._rows if end is None else bisect.bisect_right(times, end)
+        return first, last
+
+    def query(self, card_id, start=None, end=None):
+        """
+        Values of one card between two Unix timestamps (inclusive, None for
+        open-ended). Returns (timestamps, values) as arrays of floats.
+        """
+        first, last = self._row_range(start, end)
+        times, _ = self._read(TIMESTAMP_COLUMN, first, last)
+        values, found = self._read(f"card_{card_id}", first, last)
+        if not found:
+            values = array("d", [math.nan]) * len(times)
+        return times, values
+
+    def since(self, card_id, seconds, now=None):
+        """Values of one card over the last `seconds` (e.g. 30 * 86400 for 30 days)."""
+        now = time.time() if now is None else now
+        return self.query(card_id, start=now - seconds)
+
+    def latest(self, card_id):
+        """(timestamp, value) of a card's last row, or None if the store is empty."""
+        times, values = self.query(card_id, start=self._last_timestamp)
+        if not times:
+            return None
+        return times[-1], values[-1]
+
+
+def append_save(history, decoded_data, save_path):
+    """Record a decoded save, timestamped with the save file's modification time."""
+    return history.append(decoded_data["cards"], os.path.getmtime(save_path))
+
+
+def format_card_history(card_id, times, values):
+    """Format one card's history as readable text."""
+    name = CARD_NAMES.get(card_id, f"Card {card_id}")
+    output = []
+    output.append(f"{'='*90}")
+    output.append(f"{name} - {len(times):,} SNAPSHOTS")
+    output.append(f"{'='*90}\n")
+    for timestamp, value in zip(times, values):
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+        shown = "-" if math.isnan(value) else f"{value:,.2f}" if value < 1e15 else f"{value:.3e}"
+        output.append(f"{when}  {shown:>20}")
+    return "\n".join(output)
+
+
+def main():
+    """Main entry point for the card history store."""
+    parser = argparse.ArgumentParser(
+        description="Record card values from saves and query them over time."
+    )
+    parser.add_argument("history", help="History directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Append decoded saves (oldest first)")
+    add.add_argument("saves", nargs="+", help="Save files")
+
+    show = commands.add_parser("show", help="Show one card over time")
+    show.add_argument("--card", type=int, default=36, help="Card ID (default: 36, Scientists)")
+    show.add_argument("--days", type=float, help="Only the last this many days")
+    args = parser.parse_args()
+
+    with CardHistory(args.history) as history:
+        if args.command == "add":
+            added = 0
+            for save_path in sorted(args.saves, key=os.path.getmtime):
+                decoded_data = decode_adventure_communist_save(save_path)
+                if not decoded_data:
+                    print(f"Skipping {save_path}: no ADCM header found")
+                    continue
+                if append_save(history, decoded_data, save_path) is not None:
+                    added += 1
+            print(f"Added {added} snapshots ({len(history):,} total)")
+            return 0
+
+        if args.days is None:
+            times, values = history.query(args.card)
+        else:
+            times, values = history.since(args.card, args.days * 86400)
+        print(format_card_history(args.card, times, values))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
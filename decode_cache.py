@@ -0,0 +1,189 @@
+"""
+Decode cache for Adventure Communist save files
+Returns previously decoded data for unchanged saves without re-parsing them
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+import profiler
+from decoder import SAVE_HEADER_SIZE, SAVE_MAGIC, decode_save_bytes
+
+
+def content_hash(data):
+    """Hash the raw bytes of a save file."""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class DecodeCache:
+    """
+    Cache of decoded saves with an in-memory LRU and an optional on-disk store.
+
+    Saves are looked up by (path, size, mtime_ns) first, so an unchanged file
+    is served without being read. Anything else is read and matched by its
+    content hash, which also lets copies of the same snapshot share an entry.
+    With verify=True the content hash is re-checked even on a stat match.
+
+    Cached results are shared between callers and must not be modified.
+    One cache can be shared by several threads.
+    """
+
+    def __init__(self, max_entries=128, cache_dir=None, max_disk_entries=1024, verify=False):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self.verify = verify
+        self.hits = 0
+        self.misses = 0
+
+        self._digests = OrderedDict()  # (path, size, mtime_ns) -> content hash
+        self._decoded = OrderedDict()  # content hash -> decoded data
+        # Guards the LRUs and counters; decoding itself runs outside it
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, filename):
+        """
+        Return the decoded save, parsing it only if it isn't cached.
+        Files without the ADCM header return None without being read further.
+        """
+        stat = os.stat(filename)
+        stat_key = (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            digest = self._digests.get(stat_key)
+            if digest in self._decoded and not self.verify:
+                self._digests.move_to_end(stat_key)
+                self._decoded.move_to_end(digest)
+                self.hits += 1
+                profiler.count("cache_hits")
+                return self._decoded[digest]
+
+        with profiler.phase("read"):
+            with open(filename, "rb") as f:
+                header = f.read(SAVE_HEADER_SIZE)
+                if len(header) < SAVE_HEADER_SIZE or header[4:8] != SAVE_MAGIC:
+                    profiler.count("bytes_read", len(header))
+                    return None
+                data = header + f.read()
+        profiler.count("bytes_read", len(data))
+        return self._get_content(data, stat_key)
+
+    def get_bytes(self, data):
+        """Return the decoded contents of a save held in memory, cached by content hash."""
+        return self._get_content(data)
+
+    def clear(self):
+        """Drop every in-memory entry (the on-disk store is kept)."""
+        with self._lock:
+            self._digests.clear()
+            self._decoded.clear()
+
+    def _get_content(self, data, stat_key=None):
+        """Look a save's bytes up by content hash, decoding them on a miss."""
+        with profiler.phase("hash"):
+            digest = content_hash(data)
+
+        with self._lock:
+            decoded_data = self._decoded.get(digest)
+        if decoded_data is None:
+            decoded_data = self._load_from_disk(digest)
+        if decoded_data is None:
+            with self._lock:
+                self.misses += 1
+            profiler.count("cache_misses")
+            decoded_data = decode_save_bytes(data)
+            if not decoded_data:
+                return decoded_data
+            self._save_to_disk(digest, decoded_data)
+        else:
+            with self._lock:
+                self.hits += 1
+            profiler.count("cache_hits")
+
+        self._remember(stat_key, digest, decoded_data)
+        return decoded_data
+
+    def _remember(self, stat_key, digest, decoded_data):
+        """Store an entry in the memory LRU, evicting the oldest ones."""
+        with self._lock:
+            if stat_key is not None:
+                self._digests[stat_key] = digest
+                self._digests.move_to_end(stat_key)
+            self._decoded[digest] = decoded_data
+            self._decoded.move_to_end(digest)
+
+            while len(self._decoded) > self.max_entries:
+                self._decoded.popitem(last=False)
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+
+    def _disk_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+
+    def _load_from_disk(self, digest):
+        """Load a decoded save from the on-disk store, or None."""
+        if not self.cache_dir:
+            return None
+
+        try:
+            with profiler.phase("disk_cache"):
+                with open(self._disk_path(digest), "rb") as f:
+                    stored_digest, decoded_data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            profiler.count("exceptions_swallowed")
+            return None
+
+        if stored_digest != digest:
+            return None
+
+        # Refresh the timestamp so disk eviction is least-recently-used
+        try:
+            os.utime(self._disk_path(digest))
+        except OSError:
+            pass
+        return decoded_data
+
+    def _save_to_disk(self, digest, decoded_data):
+        """Write a decoded save to the on-disk store and enforce its size bound."""
+        if not self.cache_dir:
+            return
+
+        path = self._disk_path(digest)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((digest, decoded_data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing decode cache: {e}")
+            return
+
+        with self._lock:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove the least recently used entries beyond max_disk_entries."""
+        entries = [
+            entry
+            for entry in os.scandir(self.cache_dir)
+            if entry.name.endswith(".pickle")
+        ]
+        if len(entries) <= self.max_disk_entries:
+            return
+
+        try:
+            entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        except OSError:
+            return  # Another process is evicting too
+        for entry in entries[: len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
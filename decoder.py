@@ -0,0 +1,483 @@
+"""
+Decoder for Adventure Communist save files.
+Parses the binary FlatBuffer format (ADCM header) without any GUI dependencies.
+"""
+
+import os
+import fnmatch
+import mmap
+import re
+import struct
+import functools
+import itertools
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+import profiler
+
+# Save files start with a 4-byte root table offset followed by the ADCM identifier
+SAVE_HEADER_SIZE = 8
+SAVE_MAGIC = b"ADCM"
+
+# Card entries: 4 bytes ID + 4 bytes flags + 8 bytes double value
+CARD_RECORD = struct.Struct("<IId")
+MAX_CARD_ENTRIES = 100
+MAX_CARD_ID = 200
+
+# FlatBuffer primitives
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_VTABLE_HEADER = struct.Struct("<HH")
+
+# Tables below the root table searched for the cards vector
+FLATBUFFER_MAX_DEPTH = 2
+# Fallback offset range when the FlatBuffer walk fails
+CARD_SCAN_WINDOW = (0x1400, 0x1600)
+
+# Mission strings tracked in the save - add entries here to track more missions
+MISSION_KEYWORDS = (
+    b"Capsules and Scientists",
+    b"Medals",
+    b"Potatoes",
+    b"Intro",
+    b"Medicine",
+    b"Weapon",
+    b"Ore",
+    b"Land",
+)
+# Bytes after a mission string searched for its progress value
+MISSION_VALUE_WINDOW = 20
+MAX_MISSION_VALUE = 500
+# String terminator - found with re so it also works on memoryviews
+_NUL = re.compile(b"\x00")
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy on first use - it's optional and slow to import."""
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
+
+
+def parse_card_table(data, start, max_entries=MAX_CARD_ENTRIES, use_numpy=False):
+    """
+    Parse the card table starting at start in one pass.
+    Records are read straight from a memoryview (or a NumPy structured array
+    when use_numpy is set and NumPy is installed) without per-entry slicing.
+    Parsing stops at the first card ID above MAX_CARD_ID.
+    """
+    count = max(0, min(max_entries, (len(data) - start) // CARD_RECORD.size))
+
+    np = _numpy() if use_numpy else None
+    if np is not None:
+        card_dtype = np.dtype([("id", "<u4"), ("flags", "<u4"), ("value", "<f8")])
+        records = np.frombuffer(data, dtype=card_dtype, count=count, offset=start)
+        invalid = np.flatnonzero(records["id"] > MAX_CARD_ID)
+        if invalid.size:
+            records = records[: invalid[0]]
+        return _build_card_table(records.tolist())
+
+    # The view is released before returning so a memory-mapped file can be closed
+    with memoryview(data) as view:
+        return _build_card_table(
+            CARD_RECORD.iter_unpack(view[start : start + count * CARD_RECORD.size])
+        )
+
+
+def _build_card_table(entries):
+    """Collect (card_id, flags, value) entries up to the first invalid card ID."""
+    return CardTable.from_entries(
+        itertools.takewhile(lambda entry: entry[0] <= MAX_CARD_ID, entries)
+    )
+
+
+class CardTable(Mapping):
+    """
+    Decoded cards stored as parallel arrays of IDs, flags and values.
+
+    Reads like the old OrderedDict of {"id", "value", "flags"} dicts, so
+    cards[36]["value"], cards.get(36, {}).get("value", 0), `in` and items()
+    all keep working. The per-card dicts are built on access; only the
+    arrays (13 bytes per card) and a row index by card ID are kept.
+    """
+
+    __slots__ = ("ids", "flags", "values", "_rows")
+
+    def __init__(self, ids, flags, values):
+        self.ids = ids
+        self.flags = flags
+        self.values = values
+
+        # Card IDs are small, so rows are looked up by indexing a short array
+        self._rows = array("b" if len(ids) < 128 else "h", [-1])
+        self._rows *= max(ids, default=-1) + 1
+        for row, card_id in enumerate(ids):
+            self._rows[card_id] = row
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build a table from (card_id, flags, value) tuples. Later duplicates win."""
+        ids = []
+        flags = []
+        values = []
+        rows = {}
+
+        for card_id, card_flags, value in entries:
+            row = rows.get(card_id)
+            if row is None:
+                rows[card_id] = len(ids)
+                ids.append(card_id)
+                flags.append(card_flags)
+                values.append(value)
+            else:
+                flags[row] = card_flags
+                values[row] = value
+
+        # Arrays built from complete lists are allocated at their exact size
+        id_type = "B" if max(ids, default=0) < 256 else "I"
+        return cls(array(id_type, ids), array("I", flags), array("d", values))
+
+    def _row(self, card_id):
+        if isinstance(card_id, int) and 0 <= card_id < len(self._rows):
+            return self._rows[card_id]
+        return -1
+
+    def value(self, card_id, default=0):
+        """Return a card's value without building its dict."""
+        row = self._row(card_id)
+        return self.values[row] if row >= 0 else default
+
+    def __getitem__(self, card_id):
+        row = self._row(card_id)
+        if row < 0:
+            raise KeyError(card_id)
+        return {"id": card_id, "value": self.values[row], "flags": self.flags[row]}
+
+    def __contains__(self, card_id):
+        return self._row(card_id) >= 0
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return f"CardTable({dict(zip(self.ids, self.values))})"
+
+
+def _descending_card_ids(data, pos):
+    """Return the first card ID if three consecutive entries at pos count down by one."""
+    id1 = _U32.unpack_from(data, pos)[0]
+    id2 = _U32.unpack_from(data, pos + CARD_RECORD.size)[0]
+    id3 = _U32.unpack_from(data, pos + 2 * CARD_RECORD.size)[0]
+    if id2 == id1 - 1 and id3 == id2 - 1:
+        return id1
+    return None
+
+
+def _table_field_positions(data, table_pos):
+    """Return the absolute positions of the fields set in a FlatBuffer table."""
+    if table_pos + 4 > len(data):
+        return []
+
+    vtable_pos = table_pos - _I32.unpack_from(data, table_pos)[0]
+    if vtable_pos < 0 or vtable_pos % 2 or vtable_pos + 4 > len(data):
+        return []
+
+    vtable_size, table_size = _VTABLE_HEADER.unpack_from(data, vtable_pos)
+    if (
+        vtable_size < 4
+        or vtable_size % 2
+        or vtable_pos + vtable_size > len(data)
+        or table_pos + table_size > len(data)
+    ):
+        return []
+
+    positions = []
+    for entry in range(vtable_pos + 4, vtable_pos + vtable_size, 2):
+        field_offset = _U16.unpack_from(data, entry)[0]
+        # Only fields wide enough to hold a 32-bit offset can lead anywhere
+        if field_offset and field_offset + 4 <= table_size:
+            positions.append(table_pos + field_offset)
+    return positions
+
+
+def _card_vector_at(data, vector_pos):
+    """Return (start, count) if a FlatBuffer vector of card entries starts at vector_pos."""
+    if vector_pos + 4 > len(data):
+        return None
+
+    count = _U32.unpack_from(data, vector_pos)[0]
+    start = vector_pos + 4
+    if count < 3 or start + count * CARD_RECORD.size > len(data):
+        return None
+
+    first_id = _descending_card_ids(data, start)
+    if first_id is None or first_id > MAX_CARD_ID:
+        return None
+    return start, count
+
+
+def find_card_vector(data):
+    """
+    Locate the cards vector by following the FlatBuffer root table.
+    Every offset field of the root table (and of the tables it points to, up to
+    FLATBUFFER_MAX_DEPTH) is checked for a vector of 16-byte card entries.
+    Returns (start, count) or None if the walk fails.
+    """
+    if len(data) < 8:
+        return None
+
+    pending = deque([(_U32.unpack_from(data, 0)[0], 0)])
+    visited = set()
+    while pending:
+        table_pos, depth = pending.popleft()
+        if table_pos in visited:
+            continue
+        visited.add(table_pos)
+        profiler.count("tables_visited")
+
+        for field_pos in _table_field_positions(data, table_pos):
+            target = field_pos + _U32.unpack_from(data, field_pos)[0]
+            card_vector = _card_vector_at(data, target)
+            if card_vector:
+                return card_vector
+            if depth < FLATBUFFER_MAX_DEPTH:
+                pending.append((target, depth + 1))
+
+    return None
+
+
+def scan_card_section(data, window=CARD_SCAN_WINDOW):
+    """Fallback: scan a bounded offset window for the start of the card entries."""
+    first, last = window
+    last = min(last, len(data) - 3 * CARD_RECORD.size + 1)
+    for start_pos in range(first, last):
+        first_id = _descending_card_ids(data, start_pos)
+        if first_id is not None and 30 < first_id < 50:
+            profiler.count("offsets_probed", start_pos - first + 1)
+            return start_pos
+    profiler.count("offsets_probed", max(last - first, 0))
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _keyword_pattern(keywords):
+    """
+    Compile one regex matching every keyword, including overlapping matches.
+    Longer keywords are tried first, so each match is the longest keyword at
+    its offset; also returns, per keyword, the keywords that are its prefixes
+    (and so occur at the same offset).
+    """
+    longest_first = sorted(keywords, key=len, reverse=True)
+    alternation = b"|".join(re.escape(keyword) for keyword in longest_first)
+    prefixes = {
+        keyword: tuple(other for other in keywords if keyword.startswith(other))
+        for keyword in keywords
+    }
+    return re.compile(b"(?=(" + alternation + b"))"), prefixes
+
+
+def index_keywords(data, keywords=MISSION_KEYWORDS):
+    """
+    Find the first occurrence of every keyword in a single pass over data.
+    Returns a dict of keyword -> offset for the keywords that were found.
+    Empty keywords are ignored.
+    """
+    keywords = tuple(keyword for keyword in keywords if keyword)
+    if not keywords:
+        return {}
+    pattern, prefixes = _keyword_pattern(keywords)
+    wanted = len(set(keywords))
+    index = {}
+    for match in pattern.finditer(data):
+        for keyword in prefixes[match.group(1)]:
+            index.setdefault(keyword, match.start())
+        if len(index) == wanted:
+            break
+    return index
+
+
+def parse_mission_progress(data, keywords=MISSION_KEYWORDS):
+    """Read the progress value stored after each tracked mission string."""
+    mission_progress = OrderedDict()
+    index = index_keywords(data, keywords)
+
+    for keyword in keywords:
+        pos = index.get(keyword)
+        if pos is None:
+            continue
+        terminator = _NUL.search(data, pos)
+        if not terminator or terminator.start() <= pos:
+            continue
+        end = terminator.start()
+
+        key = bytes(data[pos:end]).decode("utf-8", errors="ignore")
+        last = min(end + MISSION_VALUE_WINDOW, len(data) - 4)
+        for offset in range(end + 1, last):
+            val = _U32.unpack_from(data, offset)[0]
+            if val <= MAX_MISSION_VALUE:
+                mission_progress[key] = val
+                break
+
+    return mission_progress
+
+
+def decode_adventure_communist_save(
+    filename, use_numpy=False, mission_keywords=MISSION_KEYWORDS, use_mmap=True
+):
+    """
+    Decode Adventure Communist save file (FlatBuffer format).
+    The 8-byte header is checked before anything else is read. With use_mmap
+    the rest of the file is memory-mapped, so only the pages the decoder
+    touches (tables, card vector, mission strings) are read from disk.
+    """
+    with open(filename, "rb") as f:
+        header = f.read(SAVE_HEADER_SIZE)
+        if len(header) < SAVE_HEADER_SIZE or header[4:8] != SAVE_MAGIC:
+            return None
+
+        if not use_mmap:
+            with profiler.phase("read"):
+                data = header + f.read()
+            profiler.count("bytes_read", len(data))
+            return decode_save_bytes(data, use_numpy, mission_keywords)
+
+        with profiler.phase("read"):
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Mapped pages are only read from disk as the later phases touch them,
+        # so the mapping's size is not counted as bytes read
+        profiler.count("bytes_mapped", len(data))
+        with data:
+            return decode_save_bytes(data, use_numpy, mission_keywords)
+
+
+def decode_save_bytes(data, use_numpy=False, mission_keywords=MISSION_KEYWORDS):
+    """Decode the raw contents of an Adventure Communist save file."""
+    # Check for ADCM header
+    if data[4:8] != SAVE_MAGIC:
+        return None
+
+    # Follow the FlatBuffer tables to the cards vector, scan only if that fails
+    with profiler.phase("card_search"):
+        card_vector = find_card_vector(data)
+    if card_vector:
+        start, entries = card_vector
+    else:
+        profiler.count("scan_fallbacks")
+        with profiler.phase("offset_scan"):
+            start = scan_card_section(data)
+        entries = MAX_CARD_ENTRIES
+
+    with profiler.phase("card_parse"):
+        if start is not None:
+            cards = parse_card_table(data, start, max_entries=entries, use_numpy=use_numpy)
+        else:
+            cards = CardTable.from_entries(())
+    profiler.count("cards_parsed", len(cards))
+
+    with profiler.phase("missions"):
+        mission_progress = parse_mission_progress(data, mission_keywords)
+    profiler.count("missions_found", len(mission_progress))
+
+    # Note: Researched experiments are stored as IDs in the binary format
+    # The save file doesn't contain easily extractable experiment data
+    # Users need to manually track which experiments they've researched
+
+    return {
+        "cards": cards,
+        "mission_progress": mission_progress,
+    }
+
+
+def decode_save_buffer(source, use_numpy=False, mission_keywords=MISSION_KEYWORDS):
+    """
+    Decode a save held in memory: bytes, bytearray, memoryview or an open
+    binary file-like object. Buffers are parsed in place without copying.
+    """
+    if hasattr(source, "read"):
+        source = source.read()
+    if isinstance(source, memoryview) and source.format != "B":
+        source = source.cast("B")
+    return decode_save_bytes(source, use_numpy, mission_keywords)
+
+
+def iter_archive_saves(archive_path, pattern="*.sav", use_numpy=False):
+    """
+    Decode every save inside a .zip or .tar(.gz/.bz2/.xz) archive without
+    extracting it. Yields (member_name, decoded_data) - decoded_data is None
+    for members that aren't Adventure Communist saves.
+    """
+    # Archive support is imported on demand to keep the CLI start-up fast
+    import tarfile  # pylint: disable=import-outside-toplevel
+    import zipfile  # pylint: disable=import-outside-toplevel
+
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not fnmatch.fnmatch(
+                    os.path.basename(info.filename), pattern
+                ):
+                    continue
+                data = archive.read(info)
+                yield info.filename, decode_save_bytes(data, use_numpy)
+        return
+
+    # Stream mode reads compressed tarballs front to back without seeking
+    with tarfile.open(archive_path, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile() or not fnmatch.fnmatch(
+                os.path.basename(member.name), pattern
+            ):
+                continue
+            data = archive.extractfile(member).read()
+            yield member.name, decode_save_bytes(data, use_numpy)
+
+
+# Card names mapping
+CARD_NAMES = {
+    1: "POTATOES (Total Earned)",
+    2: "LAND (Total Earned)",
+    3: "WEAPONS (Total Earned)",
+    4: "ORE (Total Earned)",
+    5: "MEDICINE (Total Earned)",
+    6: "Farmer (Upgrade Cost)",
+    7: "Commune (Upgrade Cost)",
+    8: "Collective (Upgrade Cost)",
+    9: "Plantation (Count/Level)",
+    10: "Hive (Count/Level)",
+    11: "Worker (Level)",
+    12: "Blasting Site (Count)",
+    13: "Clearcut (Upgrade Cost)",
+    14: "Road (Count)",
+    15: "Highway (Count/Level)",
+    16: "Super Highway (Level)",
+    17: "Miner (Level)",
+    18: "Mine (Count)",
+    19: "Excavator (Count)",
+    20: "Mega Mine (Level)",
+    21: "Deep Bore (Count/Level)",
+    22: "Mega Drill (Level)",
+    23: "Soldier (Level)",
+    24: "Fireteam (Count)",
+    25: "Squad (Upgrade Cost)",
+    26: "Platoon (Count)",
+    27: "Division (Count/Level)",
+    28: "Communist Ideal (Level)",
+    29: "Nurse (Level)",
+    30: "Ambulance (Count)",
+    31: "Field Hospital (Count)",
+    32: "Clinic (Level)",
+    33: "Hospital (Count/Level)",
+    34: "Cloning Lab (Count/Level)",
+    35: "Card 35 (Level)",
+    36: "SCIENTISTS",
+    37: "Potatoes (Current Resource)",
+    38: "COMRADES",
+    39: "Card 39",
+}
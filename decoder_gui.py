@@ -1,138 +1,35 @@
 """
-GUI and decoder for Adventure Communist save files.
-Decodes binary FlatBuffer format and analyzes experiments ROI.
+GUI for Adventure Communist save files.
+Decodes saves with the decoder module and analyzes experiments ROI.
 """
 
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext
 import os
-import struct
 import json
-from collections import OrderedDict
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+# decode_adventure_communist_save is re-exported for scripts importing it from here
+from decoder import CARD_NAMES, decode_adventure_communist_save  # pylint: disable=unused-import
+from decode_cache import DecodeCache
+from card_history import CardHistory, append_save
+from save_watcher import SaveWatcher, analysis_inputs
+from snapshot_rates import recent_growth
+from growth_forecast import GrowthModel, experiment_etas, format_forecast
+from purchase_planner import format_purchase_plan, plan_purchases
+import profiler
+from profiler import Profile, format_profile_summary, profiling
 from experiments_roi import (
     analyze_experiments,
     format_experiment_recommendations,
     get_industry_production_ranking,
 )
 
-
-def decode_adventure_communist_save(filename):
-    """Decode Adventure Communist save file (FlatBuffer format)."""
-    with open(filename, "rb") as f:
-        data = f.read()
-
-    # Check for ADCM header
-    if data[4:8] != b"ADCM":
-        return None
-
-    cards = OrderedDict()
-
-    # Find the card data section (search wider range as offset can vary)
-    for start_pos in range(0x1400, 0x1600):
-        try:
-            id1 = struct.unpack("<I", data[start_pos : start_pos + 4])[0]
-            id2 = struct.unpack("<I", data[start_pos + 16 : start_pos + 20])[0]
-            id3 = struct.unpack("<I", data[start_pos + 32 : start_pos + 36])[0]
-
-            if 30 < id1 < 50 and id2 == id1 - 1 and id3 == id2 - 1:
-                pos = start_pos
-                entry_count = 0
-                while pos + 16 <= len(data) and entry_count < 100:
-                    card_id = struct.unpack("<I", data[pos : pos + 4])[0]
-                    flags = struct.unpack("<I", data[pos + 4 : pos + 8])[0]
-                    value = struct.unpack("<d", data[pos + 8 : pos + 16])[0]
-
-                    if card_id > 200:
-                        break
-
-                    cards[card_id] = {"id": card_id, "value": value, "flags": flags}
-
-                    pos += 16
-                    entry_count += 1
-                break
-        except:
-            continue
-
-    # Parse mission progress
-    mission_progress = OrderedDict()
-    mission_keywords = [
-        b"Capsules and Scientists",
-        b"Medals",
-        b"Potatoes",
-        b"Intro",
-        b"Medicine",
-        b"Weapon",
-        b"Ore",
-        b"Land",
-    ]
-
-    for keyword in mission_keywords:
-        pos = data.find(keyword)
-        if pos != -1:
-            end = data.find(b"\x00", pos)
-            if end > pos:
-                key = data[pos:end].decode("utf-8", errors="ignore")
-                for offset in range(end + 1, min(end + 20, len(data) - 4)):
-                    try:
-                        val = struct.unpack("<I", data[offset : offset + 4])[0]
-                        if 0 <= val <= 500:
-                            mission_progress[key] = val
-                            break
-                    except:
-                        pass
-
-    # Note: Researched experiments are stored as IDs in the binary format
-    # The save file doesn't contain easily extractable experiment data
-    # Users need to manually track which experiments they've researched
-
-    return {
-        "cards": cards,
-        "mission_progress": mission_progress,
-    }
-
-
-# Card names mapping
-CARD_NAMES = {
-    1: "POTATOES (Total Earned)",
-    2: "LAND (Total Earned)",
-    3: "WEAPONS (Total Earned)",
-    4: "ORE (Total Earned)",
-    5: "MEDICINE (Total Earned)",
-    6: "Farmer (Upgrade Cost)",
-    7: "Commune (Upgrade Cost)",
-    8: "Collective (Upgrade Cost)",
-    9: "Plantation (Count/Level)",
-    10: "Hive (Count/Level)",
-    11: "Worker (Level)",
-    12: "Blasting Site (Count)",
-    13: "Clearcut (Upgrade Cost)",
-    14: "Road (Count)",
-    15: "Highway (Count/Level)",
-    16: "Super Highway (Level)",
-    17: "Miner (Level)",
-    18: "Mine (Count)",
-    19: "Excavator (Count)",
-    20: "Mega Mine (Level)",
-    21: "Deep Bore (Count/Level)",
-    22: "Mega Drill (Level)",
-    23: "Soldier (Level)",
-    24: "Fireteam (Count)",
-    25: "Squad (Upgrade Cost)",
-    26: "Platoon (Count)",
-    27: "Division (Count/Level)",
-    28: "Communist Ideal (Level)",
-    29: "Nurse (Level)",
-    30: "Ambulance (Count)",
-    31: "Field Hospital (Count)",
-    32: "Clinic (Level)",
-    33: "Hospital (Count/Level)",
-    34: "Cloning Lab (Count/Level)",
-    35: "Card 35 (Level)",
-    36: "SCIENTISTS",
-    37: "Potatoes (Current Resource)",
-    38: "COMRADES",
-    39: "Card 39",
-}
+# How often the Tk thread checks on background jobs
+JOB_POLL_MS = 50
+# How often watch mode checks the save file for changes
+WATCH_POLL_MS = 1000
 
 
 class AdventureDecoderGUI:
@@ -145,6 +42,23 @@ class AdventureDecoderGUI:
 
         # Initialize data storage
         self.decoded_data = None
+        self.growth = None  # hourly resource growth from the card history
+        # Growth fits per history directory, refitted as snapshots arrive.
+        # Only used from the worker thread.
+        self.forecasts = {}
+        self.forecast = None
+        self.decode_cache = DecodeCache()
+
+        # Decoding and analysis run here so the window stays responsive.
+        # A single worker also keeps the decode cache on one thread.
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.current_job = None
+        self.job_id = 0
+
+        # Watch mode state
+        self.watcher = None
+        self.watch_inputs = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Detect Steam save path
         self.default_path = self.detect_steam_path()
@@ -225,6 +139,24 @@ class AdventureDecoderGUI:
         )
         self.roi_button.grid(row=0, column=4, padx=5, pady=5)
 
+        # Cancel button for the job in flight
+        self.cancel_button = ttk.Button(
+            top_frame, text="Cancel", command=self.cancel_job, state="disabled"
+        )
+        self.cancel_button.grid(row=0, column=5, padx=5, pady=5)
+
+        # Watch mode re-analyzes whenever the game writes the save
+        self.watch_var = tk.BooleanVar(value=False)
+        watch_check = ttk.Checkbutton(
+            top_frame, text="Watch", variable=self.watch_var, command=self.toggle_watch
+        )
+        watch_check.grid(row=0, column=6, padx=5, pady=5)
+
+        # Profile mode adds per-phase timings to the status line
+        self.profile_var = tk.BooleanVar(value=False)
+        profile_check = ttk.Checkbutton(top_frame, text="Profile", variable=self.profile_var)
+        profile_check.grid(row=0, column=7, padx=5, pady=5)
+
         # Status label
         self.status_var = tk.StringVar(value="Ready")
         status_label = ttk.Label(
@@ -267,13 +199,13 @@ class AdventureDecoderGUI:
             self.load_button.config(state="normal")
             self.status_var.set("File selected")
 
-    def load_save(self):
-        """Load and decode the save file"""
+    def selected_save_path(self):
+        """Return the selected save file path, or None after reporting why not"""
         filepath = self.path_var.get()
 
         if not filepath:
             self.status_var.set("Error: No file selected")
-            return
+            return None
 
         # Handle directory path - look for game.sav
         if os.path.isdir(filepath):
@@ -283,202 +215,439 @@ class AdventureDecoderGUI:
                 self.path_var.set(filepath)
             else:
                 self.status_var.set("Error: game.sav not found in directory")
-                return
+                return None
 
         if not os.path.exists(filepath):
             self.status_var.set("Error: File not found")
-            return
+            return None
 
         if not filepath.endswith(".sav"):
             self.status_var.set("Error: File must end with .sav")
-            return
+            return None
 
-        try:
-            self.status_var.set("Decoding...")
-            self.root.update()
+        return filepath
+
+    def load_save(self):
+        """Load and decode the save file on the worker thread"""
+        filepath = self.selected_save_path()
+        if not filepath:
+            return
 
-            # Decode the save file
-            decoded_data = decode_adventure_communist_save(filepath)
+        self.start_job(
+            "Decoding...",
+            lambda cancel_event: self.decode_job(filepath, cancel_event),
+            lambda result: self.display_results(result, filepath),
+            "Error decoding save file",
+        )
 
-            if not decoded_data:
-                self.status_var.set("Error: Invalid save file (no ADCM header)")
-                return
+    def decode_job(self, filepath, cancel_event):
+        """Decode, format and export a save. Runs on the worker thread."""
+        # Decode the save file (unchanged saves come from the cache)
+        decoded_data = self.decode_cache.get(filepath)
+        if not decoded_data:
+            return None
+        check_cancelled(cancel_event)
 
-            # Display results
-            self.display_results(decoded_data, filepath)
-            self.status_var.set(f"Successfully decoded: {os.path.basename(filepath)}")
+        with profiler.phase("format"):
+            output_text = format_decoded_data(decoded_data, filepath)
+        check_cancelled(cancel_event)
 
-        except Exception as e:
-            self.status_var.set(f"Error: {str(e)}")
-            self.output_text.delete(1.0, tk.END)
-            self.output_text.insert(tk.END, f"Error decoding save file:\n{str(e)}")
+        with profiler.phase("export"):
+            json_path = export_decoded_json(decoded_data, filepath)
+            history_rows, growth, forecast = record_history(
+                decoded_data, filepath, self.forecasts
+            )
+        return decoded_data, output_text, json_path, history_rows, growth, forecast
 
-    def display_results(self, decoded_data, filepath):
+    def display_results(self, result, filepath):
         """Display decoded data in the text area"""
+        if not result:
+            self.status_var.set("Error: Invalid save file (no ADCM header)")
+            return
+
+        decoded_data, output_text, json_path, history_rows, growth, forecast = result
+
         # Store decoded data for ROI analysis
         self.decoded_data = decoded_data
+        self.growth = growth
+        self.forecast = forecast
         self.roi_button.config(state="normal")
 
         self.output_text.delete(1.0, tk.END)
+        self.output_text.insert(tk.END, output_text)
 
-        output = []
-        output.append(f"Decoded: {filepath}\n")
-        output.append("=" * 80)
-        output.append("\nCURRENCIES")
-        output.append("=" * 80)
-
-        scientists = decoded_data["cards"].get(36, {}).get("value", 0)
-        comrades = decoded_data["cards"].get(38, {}).get("value", 0)
-        output.append(f"Scientists: {scientists:,.0f}")
-        output.append(f"Comrades:   {comrades:,.2e}\n")
-
-        # Mission progress
-        output.append("=" * 80)
-        output.append("MISSION PROGRESS & MEDALS")
-        output.append("=" * 80)
-
-        if decoded_data["mission_progress"]:
-            mission_labels = {
-                "Intro": "Farming Medals",
-                "Medals": "Total Medals",
-                "Potatoes": "Potato Missions",
-                "Land": "Land Missions",
-                "Ore": "Ore Missions",
-                "Weapon": "Weapon Missions",
-                "Medicine.Earned.Total": "Industry Experiments",
-            }
-
-            for key, value in decoded_data["mission_progress"].items():
-                display_key = mission_labels.get(key, key)
-                output.append(f"{display_key:30s}: {value:5d}")
-
-
-        # Resources
-        output.append("\n" + "=" * 80)
-        output.append("TOTAL RESOURCES EARNED")
-        output.append("=" * 80)
-
-        resource_ids = [1, 2, 3, 4, 5]
-        for card_id in resource_ids:
-            if card_id in decoded_data["cards"]:
-                card = decoded_data["cards"][card_id]
-                name = CARD_NAMES.get(card_id, f"Resource {card_id}")
-                value = card["value"]
-                output.append(f"{name:30s}: {value:.2e}")
-
-        # Generators by industry
-        output.append("\n" + "=" * 80)
-        output.append("GENERATORS & UPGRADES")
-        output.append("=" * 80)
-
-        industries = {
-            "POTATO": range(6, 11),
-            "LAND": range(11, 16),
-            "ORE": range(16, 22),
-            "WEAPONS": range(22, 28),
-            "MEDICINE": range(28, 34),
-        }
-
-        for industry_name, id_range in industries.items():
-            has_data = False
-            industry_lines = []
-
-            for card_id in id_range:
-                if card_id in decoded_data["cards"]:
-                    card = decoded_data["cards"][card_id]
-                    value = card["value"]
-                    if value > 0:
-                        has_data = True
-                        name = CARD_NAMES.get(card_id, f"Card {card_id}")
-                        if value > 1e6:
-                            industry_lines.append(
-                                f"  [{card_id:2d}] {name:30s}: {value:.2e}"
-                            )
-                        else:
-                            industry_lines.append(
-                                f"  [{card_id:2d}] {name:30s}: {value:,.0f}"
-                            )
-
-            if has_data:
-                output.append(f"\n{industry_name}:")
-                output.extend(industry_lines)
-
-        # Display in text widget
-        self.output_text.insert(tk.END, "\n".join(output))
-
-        # Save to JSON
-        try:
-            json_path = os.path.join(os.path.dirname(filepath), "decoded_save.json")
-            output_data = {
-                "currency": {"scientists": scientists, "comrades": comrades},
-                "mission_progress": decoded_data["mission_progress"],
-                "cards": {k: v["value"] for k, v in decoded_data["cards"].items()},
-            }
-
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(output_data, f, indent=2)
-
+        if json_path:
             self.output_text.insert(tk.END, f"\n\n{'=' * 80}\n")
             self.output_text.insert(tk.END, f"Data saved to: {json_path}\n")
+            if history_rows:
+                self.output_text.insert(
+                    tk.END, f"Card history: {history_rows:,} snapshots\n"
+                )
             self.output_text.insert(tk.END, "=" * 80)
-        except Exception as e:
-            print(f"Error saving JSON: {e}")
+
+        self.status_var.set(f"Successfully decoded: {os.path.basename(filepath)}")
+
+    def toggle_watch(self):
+        """Start or stop watching the selected save file"""
+        if not self.watch_var.get():
+            self.watcher = None
+            self.status_var.set("Watch stopped")
+            return
+
+        filepath = self.selected_save_path()
+        if not filepath:
+            self.watch_var.set(False)
+            return
+
+        # Decode the current file right away and only poll for later changes
+        self.watcher = SaveWatcher(filepath)
+        self.watcher.sync()
+        self.watch_inputs = None
+        self.status_var.set(f"Watching: {os.path.basename(filepath)}")
+        self.start_job(
+            "Decoding...",
+            lambda cancel_event: self.decode_job(filepath, cancel_event),
+            lambda result: self.display_watch_results(result, filepath),
+            "Error decoding save file",
+        )
+        self.root.after(WATCH_POLL_MS, self.poll_watch, self.watcher)
+
+    def poll_watch(self, watcher):
+        """Decode the save again once a change to it has settled"""
+        if watcher is not self.watcher:
+            return  # Watch was stopped or restarted
+
+        # Don't poll while a job runs - poll() marks the change as reported,
+        # so a save that settled meanwhile would never be decoded
+        if not self.current_job and watcher.poll():
+            self.start_job(
+                "Save changed - decoding...",
+                lambda cancel_event: self.decode_job(watcher.path, cancel_event),
+                lambda result: self.display_watch_results(result, watcher.path),
+                "Error decoding save file",
+            )
+
+        self.root.after(WATCH_POLL_MS, self.poll_watch, watcher)
+
+    def display_watch_results(self, result, filepath):
+        """Re-run the analysis only if the cards it depends on changed"""
+        if not result:
+            self.status_var.set("Error: Invalid save file (no ADCM header)")
+            return
+
+        decoded_data = result[0]
+        self.decoded_data = decoded_data
+        self.growth = result[4]
+        self.forecast = result[5]
+        self.roi_button.config(state="normal")
+
+        inputs = analysis_inputs(decoded_data)
+        if inputs == self.watch_inputs:
+            self.status_var.set(
+                f"Watching: {os.path.basename(filepath)} - recommendations unchanged"
+            )
+            return
+
+        self.watch_inputs = inputs
+        self.analyze_roi()
 
     def analyze_roi(self):
-        """Analyze and display Experiments ROI recommendations"""
+        """Analyze Experiments ROI recommendations on the worker thread"""
         if not hasattr(self, "decoded_data") or not self.decoded_data:
             self.status_var.set("Error: No save file loaded")
             return
 
-        try:
-            self.status_var.set("Analyzing Experiments...")
-            self.root.update()
-
-            # Show industry ranking
-            self.output_text.delete(1.0, tk.END)
+        decoded_data = self.decoded_data
+        growth = self.growth
+        forecast = self.forecast
+        self.start_job(
+            "Analyzing Experiments...",
+            lambda cancel_event: analyze_job(decoded_data, cancel_event, growth, forecast),
+            self.display_analysis,
+            "Error analyzing experiments",
+        )
 
-            output = []
-            output.append("=" * 90)
-            output.append("INDUSTRY PRODUCTION RANKING (Focus on weakest)")
-            output.append("=" * 90 + "\n")
-
-            production = get_industry_production_ranking(self.decoded_data)
-            for i, (industry, value) in enumerate(production.items(), 1):
-                progress_bar = (
-                    "█" * min(40, int(value / max(production.values()) * 40))
-                    if value > 0
-                    else ""
-                )
-                output.append(f"{i}. {industry:10} {value:12.2e} {progress_bar}")
+    def display_analysis(self, result):
+        """Display Experiments ROI recommendations in the text area"""
+        output_text, experiments_analyzed = result
 
-            self.output_text.insert(tk.END, "\n".join(output) + "\n\n")
+        self.output_text.delete(1.0, tk.END)
+        self.output_text.insert(tk.END, output_text)
 
-            # Analyze experiments
-            # Note: Save file doesn't store which specific experiments are researched
-            # User needs to manually update KNOWN_RESEARCHED in experiments_roi.py
-            recommendations, current_scientists = analyze_experiments(self.decoded_data)
+        status_msg = (
+            f"Experiments Analysis Complete - "
+            f"{experiments_analyzed} experiments analyzed"
+        )
+        self.status_var.set(status_msg)
+
+    def start_job(self, status, work, on_success, error_title):
+        """
+        Run work(cancel_event) on the worker thread and pass its result to
+        on_success on the Tk thread. Any job still in flight is cancelled and
+        its result ignored.
+        """
+        self.cancel_job()
+        self.status_var.set(status)
+
+        self.job_id += 1
+        cancel_event = threading.Event()
+        profile = Profile() if self.profile_var.get() else None
+        future = self.executor.submit(run_profiled, work, cancel_event, profile)
+        self.current_job = (future, cancel_event)
+        self.cancel_button.config(state="normal")
+
+        self.root.after(
+            JOB_POLL_MS,
+            self.poll_job,
+            self.job_id,
+            future,
+            on_success,
+            error_title,
+            profile,
+        )
 
-            # Display results
-            exp_output = format_experiment_recommendations(
-                recommendations, current_scientists, top_n=20
+    def poll_job(self, job_id, future, on_success, error_title, profile=None):
+        """Check on a background job and show its result once it is done."""
+        if job_id != self.job_id:
+            return  # Superseded or cancelled - drop the stale result
+
+        if not future.done():
+            self.root.after(
+                JOB_POLL_MS,
+                self.poll_job,
+                job_id,
+                future,
+                on_success,
+                error_title,
+                profile,
             )
-            self.output_text.insert(tk.END, exp_output)
+            return
 
-            status_msg = (
-                f"Experiments Analysis Complete - "
-                f"{len(recommendations)} experiments analyzed"
-            )
-            self.status_var.set(status_msg)
+        self.current_job = None
+        self.cancel_button.config(state="disabled")
 
-        except Exception as e:
-            self.status_var.set(f"Error: {str(e)}")
+        error = future.exception()
+        if isinstance(error, JobCancelled):
+            return
+        if error:
+            self.status_var.set(f"Error: {str(error)}")
             self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(tk.END, f"{error_title}:\n{str(error)}\n\n")
             self.output_text.insert(
-                tk.END, f"Error analyzing experiments:\n{str(e)}\n\n"
+                tk.END,
+                "".join(
+                    traceback.format_exception(type(error), error, error.__traceback__)
+                ),
             )
-            import traceback
+            return
+
+        on_success(future.result())
+        # on_success may have chained another job - it owns the status line then
+        if profile and not self.current_job:
+            summary = format_profile_summary(profile.record())
+            self.status_var.set(f"{self.status_var.get()} | {summary}")
+
+    def cancel_job(self):
+        """Cancel the job in flight, if any."""
+        if not self.current_job:
+            return
+
+        future, cancel_event = self.current_job
+        cancel_event.set()
+        future.cancel()
+        self.current_job = None
+        self.job_id += 1
+        self.cancel_button.config(state="disabled")
+        self.status_var.set("Cancelled")
+
+    def on_close(self):
+        """Stop background work and close the window."""
+        self.cancel_job()
+        self.executor.shutdown(wait=False)
+        self.root.destroy()
+
+
+class JobCancelled(Exception):
+    """Raised inside a background job once it has been cancelled."""
+
+
+def run_profiled(work, cancel_event, profile):
+    """Run a job on the worker thread, recording into profile if it isn't None."""
+    with profiling(profile):
+        return work(cancel_event)
+
+
+def check_cancelled(cancel_event):
+    """Stop a background job at a safe point if it has been cancelled."""
+    if cancel_event.is_set():
+        raise JobCancelled()
+
+
+def format_decoded_data(decoded_data, filepath):
+    """Format decoded save data as the text shown in the GUI"""
+    output = []
+    output.append(f"Decoded: {filepath}\n")
+    output.append("=" * 80)
+    output.append("\nCURRENCIES")
+    output.append("=" * 80)
+
+    scientists = decoded_data["cards"].get(36, {}).get("value", 0)
+    comrades = decoded_data["cards"].get(38, {}).get("value", 0)
+    output.append(f"Scientists: {scientists:,.0f}")
+    output.append(f"Comrades:   {comrades:,.2e}\n")
+
+    # Mission progress
+    output.append("=" * 80)
+    output.append("MISSION PROGRESS & MEDALS")
+    output.append("=" * 80)
+
+    if decoded_data["mission_progress"]:
+        mission_labels = {
+            "Intro": "Farming Medals",
+            "Medals": "Total Medals",
+            "Potatoes": "Potato Missions",
+            "Land": "Land Missions",
+            "Ore": "Ore Missions",
+            "Weapon": "Weapon Missions",
+            "Medicine.Earned.Total": "Industry Experiments",
+        }
+
+        for key, value in decoded_data["mission_progress"].items():
+            display_key = mission_labels.get(key, key)
+            output.append(f"{display_key:30s}: {value:5d}")
+
+    # Resources
+    output.append("\n" + "=" * 80)
+    output.append("TOTAL RESOURCES EARNED")
+    output.append("=" * 80)
+
+    resource_ids = [1, 2, 3, 4, 5]
+    for card_id in resource_ids:
+        if card_id in decoded_data["cards"]:
+            card = decoded_data["cards"][card_id]
+            name = CARD_NAMES.get(card_id, f"Resource {card_id}")
+            value = card["value"]
+            output.append(f"{name:30s}: {value:.2e}")
+
+    # Generators by industry
+    output.append("\n" + "=" * 80)
+    output.append("GENERATORS & UPGRADES")
+    output.append("=" * 80)
+
+    industries = {
+        "POTATO": range(6, 11),
+        "LAND": range(11, 16),
+        "ORE": range(16, 22),
+        "WEAPONS": range(22, 28),
+        "MEDICINE": range(28, 34),
+    }
+
+    for industry_name, id_range in industries.items():
+        has_data = False
+        industry_lines = []
+
+        for card_id in id_range:
+            if card_id in decoded_data["cards"]:
+                card = decoded_data["cards"][card_id]
+                value = card["value"]
+                if value > 0:
+                    has_data = True
+                    name = CARD_NAMES.get(card_id, f"Card {card_id}")
+                    if value > 1e6:
+                        industry_lines.append(
+                            f"  [{card_id:2d}] {name:30s}: {value:.2e}"
+                        )
+                    else:
+                        industry_lines.append(
+                            f"  [{card_id:2d}] {name:30s}: {value:,.0f}"
+                        )
+
+        if has_data:
+            output.append(f"\n{industry_name}:")
+            output.extend(industry_lines)
+
+    return "\n".join(output)
+
+
+def export_decoded_json(decoded_data, filepath):
+    """Save decoded data to decoded_save.json next to the save file"""
+    try:
+        json_path = os.path.join(os.path.dirname(filepath), "decoded_save.json")
+        output_data = {
+            "currency": {
+                "scientists": decoded_data["cards"].get(36, {}).get("value", 0),
+                "comrades": decoded_data["cards"].get(38, {}).get("value", 0),
+            },
+            "mission_progress": decoded_data["mission_progress"],
+            "cards": {k: v["value"] for k, v in decoded_data["cards"].items()},
+        }
+
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(output_data, f, indent=2)
+        return json_path
+    except Exception as e:
+        print(f"Error saving JSON: {e}")
+        return None
 
-            self.output_text.insert(tk.END, traceback.format_exc())
+
+def record_history(decoded_data, filepath, forecasts):
+    """
+    Append the card values to card_history/ next to the save file.
+    forecasts keeps a GrowthModel per history directory, updated with each new
+    snapshot instead of refitted from the whole history.
+    Returns (snapshots in the history, recent resource growth, GrowthModel).
+    """
+    try:
+        history_dir = os.path.join(os.path.dirname(filepath), "card_history")
+        with CardHistory(history_dir) as history:
+            append_save(history, decoded_data, filepath)
+            forecast = forecasts.get(history_dir)
+            if forecast is None:
+                forecast = forecasts[history_dir] = GrowthModel.from_history(history)
+            else:
+                forecast.update(os.path.getmtime(filepath), decoded_data["cards"])
+            return len(history), recent_growth(history), forecast
+    except Exception as e:
+        print(f"Error saving card history: {e}")
+        return None, None, None
+
+
+def analyze_job(decoded_data, cancel_event, growth=None, forecast=None):
+    """Build the Experiments ROI report. Runs on the worker thread."""
+    # Show industry ranking
+    output = []
+    output.append("=" * 90)
+    if growth:
+        output.append("INDUSTRY GROWTH RANKING (Per hour - focus on slowest-growing)")
+    else:
+        output.append("INDUSTRY PRODUCTION RANKING (Focus on weakest)")
+    output.append("=" * 90 + "\n")
+
+    production = get_industry_production_ranking(decoded_data, growth)
+    unit = "/h" if growth else ""
+    for i, (industry, value) in enumerate(production.items(), 1):
+        progress_bar = (
+            "█" * min(40, int(value / max(production.values()) * 40))
+            if value > 0
+            else ""
+        )
+        output.append(f"{i}. {industry:10} {value:12.2e}{unit} {progress_bar}")
+    check_cancelled(cancel_event)
+
+    # Analyze experiments
+    # Note: Save file doesn't store which specific experiments are researched
+    # User needs to manually update KNOWN_RESEARCHED in experiments_roi.py
+    recommendations, current_scientists = analyze_experiments(decoded_data)
+    check_cancelled(cancel_event)
+
+    exp_output = format_experiment_recommendations(
+        recommendations, current_scientists, top_n=20
+    )
+    plan_output = format_purchase_plan(plan_purchases(current_scientists))
+    report = "\n".join(output) + "\n\n" + exp_output + "\n\n" + plan_output
+    if forecast is not None and forecast.snapshots >= 2:
+        report += "\n\n" + format_forecast(forecast, experiment_etas(forecast))
+    return report, len(recommendations)
 
 
 def main():
@@ -0,0 +1,212 @@
+"""
+Experiment catalog for Adventure Communist
+Loads experiment definitions from JSON/CSV into compact, indexed records
+"""
+
+import bisect
+import collections
+import csv
+import json
+import os
+from collections.abc import Mapping
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "experiments.json"
+)
+
+# What an experiment's effect number means:
+#   multiplier - production multiplier for its industry (for duration_seconds if set)
+#   passive    - production multiplier for every industry
+#   instant    - hours of every industry's output granted at once
+EFFECT_KINDS = ("multiplier", "passive", "instant")
+# Categories are listed in this order, followed by any new ones
+CATEGORY_ORDER = ("INDUSTRY", "STATE", "TRIALS")
+
+_FIELDS = (
+    "name",
+    "cost",
+    "type",
+    "boost",
+    "multiplier",
+    "kind",
+    "effect",
+    "duration_seconds",
+    "priority",
+    "description",
+)
+
+
+class Experiment(collections.namedtuple("Experiment", _FIELDS)):
+    """
+    One experiment. `multiplier` is what the game shows ("x99999", "Instant");
+    `kind` and the numeric `effect` say what it actually does.
+    """
+
+    __slots__ = ()
+
+    @property
+    def duration_hours(self):
+        """How long the effect lasts in hours, or None if it is permanent."""
+        if self.duration_seconds is None:
+            return None
+        return self.duration_seconds / 3600
+
+    def as_dict(self):
+        """The record in the dict layout analysis code reads."""
+        data = self._asdict()
+        del data["name"]
+        data["duration_hours"] = self.duration_hours
+        return data
+
+
+def _optional_number(value):
+    """CSV cells are strings - blanks mean missing."""
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _display_multiplier(value):
+    """Keep numeric multipliers as numbers so they format as x99,999."""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    return value
+
+
+def experiment_from_row(row):
+    """Build an Experiment from a JSON object or CSV row."""
+    kind = row.get("kind") or "multiplier"
+    if kind not in EFFECT_KINDS:
+        raise ValueError(f"{row.get('name')}: unknown effect kind {kind!r}")
+
+    return Experiment(
+        name=row["name"],
+        cost=int(row["cost"]),
+        type=row["type"],
+        boost=row["boost"],
+        multiplier=_display_multiplier(row["multiplier"]),
+        kind=kind,
+        effect=float(row["effect"]),
+        duration_seconds=_optional_number(row.get("duration_seconds")),
+        priority=int(row["priority"]),
+        description=row.get("description", ""),
+    )
+
+
+def read_experiments(path):
+    """Read Experiment records from a .json list of objects or a .csv with a header row."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = json.load(f)
+    return [experiment_from_row(row) for row in rows]
+
+
+class ExperimentCatalog(Mapping):
+    """
+    The experiments, keyed by name.
+
+    catalog[name] returns the experiment as a dict, the layout the ROI code has
+    always used. Records are also indexed by type, boost and cost, so category
+    and affordability queries don't scan the whole catalog.
+    """
+
+    def __init__(self, experiments=()):
+        self._records = {}
+        self._dicts = {}
+        self._by_type = {}
+        self._by_boost = {}
+        self._costs = []  # sorted costs
+        self._cost_names = []  # experiment names in the same order as _costs
+        for experiment in experiments:
+            self.add(experiment)
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_CATALOG_PATH):
+        """Load a catalog from a JSON or CSV file."""
+        return cls(read_experiments(path))
+
+    def add(self, experiment):
+        """Add an experiment, replacing any existing one with the same name."""
+        if experiment.name in self._records:
+            self.remove(experiment.name)
+
+        self._records[experiment.name] = experiment
+        self._dicts[experiment.name] = experiment.as_dict()
+        self._by_type.setdefault(experiment.type, []).append(experiment)
+        self._by_boost.setdefault(experiment.boost, []).append(experiment)
+        index = bisect.bisect_right(self._costs, experiment.cost)
+        self._costs.insert(index, experiment.cost)
+        self._cost_names.insert(index, experiment.name)
+
+    def remove(self, name):
+        """Remove an experiment by name."""
+        experiment = self._records.pop(name)
+        del self._dicts[name]
+        self._by_type[experiment.type].remove(experiment)
+        self._by_boost[experiment.boost].remove(experiment)
+        index = self._cost_names.index(name)
+        del self._costs[index]
+        del self._cost_names[index]
+
+    def load(self, path):
+        """Add or replace experiments from a JSON or CSV file."""
+        for experiment in read_experiments(path):
+            self.add(experiment)
+
+    def record(self, name):
+        """Return the Experiment record for name."""
+        return self._records[name]
+
+    def records(self):
+        """All Experiment records in catalog order."""
+        return list(self._records.values())
+
+    def types(self):
+        """Experiment categories (INDUSTRY, STATE, TRIALS, ...) present in the catalog."""
+        present = [exp_type for exp_type, group in self._by_type.items() if group]
+        known = [exp_type for exp_type in CATEGORY_ORDER if exp_type in present]
+        return known + [exp_type for exp_type in present if exp_type not in known]
+
+    def by_type(self, exp_type):
+        """Experiments in one category."""
+        return list(self._by_type.get(exp_type, ()))
+
+    def by_boost(self, boost):
+        """Experiments that boost one industry or resource."""
+        return list(self._by_boost.get(boost, ()))
+
+    def affordable(self, scientists):
+        """Experiments costing at most scientists, cheapest first."""
+        index = bisect.bisect_right(self._costs, scientists)
+        return [self._records[name] for name in self._cost_names[:index]]
+
+    def costs(self):
+        """Distinct experiment costs, lowest first."""
+        return sorted(set(self._costs))
+
+    def __getitem__(self, name):
+        return self._dicts[name]
+
+    def __contains__(self, name):
+        return name in self._records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __repr__(self):
+        return f"ExperimentCatalog({len(self)} experiments)"
+
+
+def format_effect(experiment_data):
+    """Effect as shown in game: x99,999 for multipliers, the text otherwise."""
+    if experiment_data["kind"] == "multiplier":
+        return f"x{experiment_data['multiplier']:,}"
+    return experiment_data["multiplier"]
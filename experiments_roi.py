@@ -4,209 +4,17 @@ Analyzes which experiment upgrades give the best return on investment
 Based on actual game mechanics from the EXPERIMENTS section
 """
 
-# EXPERIMENTS data based on Adventure Communist game mechanics
-# Format: {name: {'cost': scientists, 'type': category, 'multiplier': boost, 'priority': importance}}
-
-EXPERIMENTS = {
-    # INDUSTRY Tab - Permanent multipliers (HIGHEST PRIORITY)
-    "Button Auto-Clickers": {
-        "cost": 25,
-        "type": "STATE",
-        "multiplier": "Auto-click all buttons",
-        "boost": "Passive",
-        "priority": 9,
-        "description": "Automatically clicks production buttons - massive time saver",
-    },
-    # x99999 Multipliers - Industry-wide permanent boosts
-    "Best-est Potato Button": {
-        "cost": 60,
-        "type": "INDUSTRY",
-        "multiplier": 99999,
-        "boost": "Potato",
-        "priority": 10,
-        "description": "POTATO production x99999 - HUGE permanent boost",
-    },
-    "Best-est Land Button": {
-        "cost": 60,
-        "type": "INDUSTRY",
-        "multiplier": 99999,
-        "boost": "Land",
-        "priority": 10,
-        "description": "LAND production x99999 - HUGE permanent boost",
-    },
-    "Best-est Weapon Button": {
-        "cost": 60,
-        "type": "INDUSTRY",
-        "multiplier": 99999,
-        "boost": "Weapons",
-        "priority": 10,
-        "description": "WEAPONS production x99999 - HUGE permanent boost",
-    },
-    "Best-est Ore Button": {
-        "cost": 60,
-        "type": "INDUSTRY",
-        "multiplier": 99999,
-        "boost": "Ore",
-        "priority": 10,
-        "description": "ORE production x99999 - HUGE permanent boost",
-    },
-    "Best-est Medicine Button": {
-        "cost": 60,
-        "type": "INDUSTRY",
-        "multiplier": 99999,
-        "boost": "Medicine",
-        "priority": 10,
-        "description": "MEDICINE production x99999 - HUGE permanent boost",
-    },
-    # x9999 Multipliers - Slightly lower tier
-    "Better-est Potato Button": {
-        "cost": 45,
-        "type": "INDUSTRY",
-        "multiplier": 9999,
-        "boost": "Potato",
-        "priority": 8,
-        "description": "POTATO production x9999 - Very strong boost",
-    },
-    "Better-est Land Button": {
-        "cost": 45,
-        "type": "INDUSTRY",
-        "multiplier": 9999,
-        "boost": "Land",
-        "priority": 8,
-        "description": "LAND production x9999 - Very strong boost",
-    },
-    "Better-est Weapon Button": {
-        "cost": 45,
-        "type": "INDUSTRY",
-        "multiplier": 9999,
-        "boost": "Weapons",
-        "priority": 8,
-        "description": "WEAPONS production x9999 - Very strong boost",
-    },
-    "Better-est Ore Button": {
-        "cost": 45,
-        "type": "INDUSTRY",
-        "multiplier": 9999,
-        "boost": "Ore",
-        "priority": 8,
-        "description": "ORE production x9999 - Very strong boost",
-    },
-    "Better-est Medicine Button": {
-        "cost": 45,
-        "type": "INDUSTRY",
-        "multiplier": 9999,
-        "boost": "Medicine",
-        "priority": 8,
-        "description": "MEDICINE production x9999 - Very strong boost",
-    },
-    # x999 Multipliers
-    "Better-er Potato Button": {
-        "cost": 30,
-        "type": "INDUSTRY",
-        "multiplier": 999,
-        "boost": "Potato",
-        "priority": 7,
-        "description": "POTATO production x999 - Strong boost",
-    },
-    "Better-er Land Button": {
-        "cost": 30,
-        "type": "INDUSTRY",
-        "multiplier": 999,
-        "boost": "Land",
-        "priority": 7,
-        "description": "LAND production x999 - Strong boost",
-    },
-    "Better-er Weapon Button": {
-        "cost": 30,
-        "type": "INDUSTRY",
-        "multiplier": 999,
-        "boost": "Weapons",
-        "priority": 7,
-        "description": "WEAPONS production x999 - Strong boost",
-    },
-    "Better-er Ore Button": {
-        "cost": 30,
-        "type": "INDUSTRY",
-        "multiplier": 999,
-        "boost": "Ore",
-        "priority": 7,
-        "description": "ORE production x999 - Strong boost",
-    },
-    "Better-er Medicine Button": {
-        "cost": 30,
-        "type": "INDUSTRY",
-        "multiplier": 999,
-        "boost": "Medicine",
-        "priority": 7,
-        "description": "MEDICINE production x999 - Strong boost",
-    },
-    # Temporary boosts (TRIALS tab) - Lower priority
-    "Comrade Blast": {
-        "cost": 5,
-        "type": "TRIALS",
-        "multiplier": 7777,
-        "boost": "Comrades",
-        "priority": 3,
-        "description": "Comrade boost x7777 for 30 seconds - temporary",
-    },
-    "Potato Button Blast": {
-        "cost": 10,
-        "type": "TRIALS",
-        "multiplier": 7777,
-        "boost": "Potato",
-        "priority": 4,
-        "description": "Potato button x7777 for 20 seconds - temporary",
-    },
-    "Land Button Blast": {
-        "cost": 10,
-        "type": "TRIALS",
-        "multiplier": 7777,
-        "boost": "Land",
-        "priority": 4,
-        "description": "Land button x7777 for 20 seconds - temporary",
-    },
-    "Ore Button Blast": {
-        "cost": 10,
-        "type": "TRIALS",
-        "multiplier": 7777,
-        "boost": "Ore",
-        "priority": 4,
-        "description": "Ore button x7777 for 20 seconds - temporary",
-    },
-    "Weapon Button Blast": {
-        "cost": 10,
-        "type": "TRIALS",
-        "multiplier": 7777,
-        "boost": "Weapons",
-        "priority": 4,
-        "description": "Weapons button x7777 for 20 seconds - temporary",
-    },
-    "Medicine Button Blast": {
-        "cost": 10,
-        "type": "TRIALS",
-        "multiplier": 7777,
-        "boost": "Medicine",
-        "priority": 4,
-        "description": "Medicine button x7777 for 20 seconds - temporary",
-    },
-    # Resource surges (STATE tab) - Temporary
-    "Big Resource Surge": {
-        "cost": 50,
-        "type": "STATE",
-        "multiplier": "Instant",
-        "boost": "Resources",
-        "priority": 2,
-        "description": "Get 4 hours worth of resources instantly",
-    },
-    "Mega Resource Surge": {
-        "cost": 150,
-        "type": "STATE",
-        "multiplier": "Instant",
-        "boost": "Resources",
-        "priority": 1,
-        "description": "Get 24 hours worth of resources instantly",
-    },
-}
+import bisect
+import functools
+import profiler
+from experiment_catalog import ExperimentCatalog, format_effect
+from production_projection import rank_by_projection
+
+# EXPERIMENTS data based on Adventure Communist game mechanics, loaded from
+# experiments.json - add new game experiments there, no code changes needed.
+# EXPERIMENTS[name] is a dict: {'cost', 'type', 'boost', 'multiplier', 'kind',
+# 'effect', 'duration_seconds', 'duration_hours', 'priority', 'description'}
+EXPERIMENTS = ExperimentCatalog.from_file()
 
 # Known researched experiments
 # The save file doesn't store which specific experiments you own, only the count.
@@ -217,6 +25,19 @@ KNOWN_RESEARCHED = [
     # Example: "Button Auto-Clickers",
 ]
 
+# Industry priority for tiebreaking (weakest first)
+# Medicine > Weapons > Ore > Land > Potato
+INDUSTRY_PRIORITY = {
+    "Medicine": 5,
+    "Weapons": 4,
+    "Ore": 3,
+    "Land": 2,
+    "Potato": 1,
+    "Comrades": 0,
+    "Resources": 0,
+    "Passive": 0,
+}
+
 
 def calculate_experiment_roi(
     experiment_name, experiment_data, current_scientists, current_production
@@ -231,18 +52,18 @@ def calculate_experiment_roi(
     if cost > current_scientists:
         return None  # Can't afford
 
-    multiplier = experiment_data.get("multiplier", 1)
+    effect = experiment_data["effect"]
     exp_type = experiment_data["type"]
     priority = experiment_data["priority"]
 
     # Calculate ROI score
-    if isinstance(multiplier, (int, float)):
+    if experiment_data["kind"] == "multiplier":
         # Permanent multipliers are MUCH more valuable
         if exp_type == "INDUSTRY":
-            roi_score = (multiplier / cost) * priority
+            roi_score = (effect / cost) * priority
         else:
             # Temporary boosts are worth less
-            roi_score = (multiplier / cost) * priority * 0.01
+            roi_score = (effect / cost) * priority * 0.01
     else:
         # Special cases like auto-clickers or surges
         roi_score = priority * 100 / cost
@@ -251,7 +72,10 @@ def calculate_experiment_roi(
         "name": experiment_name,
         "cost": cost,
         "type": exp_type,
-        "multiplier": multiplier,
+        "multiplier": experiment_data["multiplier"],
+        "kind": experiment_data["kind"],
+        "effect": effect,
+        "duration_hours": experiment_data["duration_hours"],
         "boost": experiment_data["boost"],
         "priority": priority,
         "description": experiment_data["description"],
@@ -260,10 +84,65 @@ def calculate_experiment_roi(
     }
 
 
-def analyze_experiments(decoded_data, researched_experiments=None):
+@functools.lru_cache(maxsize=32)
+def _roi_table(researched_experiments):
+    """
+    Precompute ranked recommendations for every affordability threshold.
+    Returns the sorted distinct costs and, for each one, the recommendations
+    affordable at that many Scientists in ROI order.
+    """
+    ranked = []
+    for exp_name, exp_data in EXPERIMENTS.items():
+        # Skip if already researched
+        if exp_name in researched_experiments:
+            continue
+
+        roi = calculate_experiment_roi(exp_name, exp_data, exp_data["cost"], {})
+        # Add industry priority for tiebreaking
+        roi["industry_priority"] = INDUSTRY_PRIORITY.get(roi["boost"], 0)
+        ranked.append(roi)
+
+    # Sort by ROI score (highest first), then by industry priority (weakest industry first)
+    ranked.sort(key=lambda x: (x["roi_score"], x["industry_priority"]), reverse=True)
+
+    thresholds = sorted({roi["cost"] for roi in ranked})
+    tables = [
+        tuple(roi for roi in ranked if roi["cost"] <= threshold)
+        for threshold in thresholds
+    ]
+    return thresholds, tables
+
+
+def get_roi_recommendations(current_scientists, researched_experiments=None):
+    """
+    Recommendations affordable with current_scientists, best first.
+    Served from a precomputed table - the returned dicts are shared, don't modify them.
+    """
+    if researched_experiments is None:
+        researched_experiments = KNOWN_RESEARCHED
+
+    thresholds, tables = _roi_table(frozenset(researched_experiments))
+    index = bisect.bisect_right(thresholds, current_scientists)
+    return list(tables[index - 1]) if index else []
+
+
+def invalidate_roi_table():
+    """Drop precomputed rankings - call this after changing EXPERIMENTS."""
+    _roi_table.cache_clear()
+
+
+def load_experiments(path):
+    """Add or replace experiments from a JSON or CSV file and refresh the rankings."""
+    EXPERIMENTS.load(path)
+    invalidate_roi_table()
+
+
+def analyze_experiments(decoded_data, researched_experiments=None, horizon_hours=None):
     """
     Analyze all experiments and rank by ROI.
     Returns recommendations sorted by value.
+    With horizon_hours, experiments are ranked by the production they are
+    projected to add over that many hours per Scientist instead.
     """
     if not decoded_data or "mission_progress" not in decoded_data:
         return [], 0
@@ -286,46 +165,24 @@ def analyze_experiments(decoded_data, researched_experiments=None):
                     "value", 0
                 )
 
-    # Industry priority for tiebreaking (weakest first)
-    # Medicine > Weapons > Ore > Land > Potato
-    industry_priority = {
-        "Medicine": 5,
-        "Weapons": 4,
-        "Ore": 3,
-        "Land": 2,
-        "Potato": 1,
-        "Comrades": 0,
-        "Resources": 0,
-        "Passive": 0,
-    }
-
     if researched_experiments is None:
         researched_experiments = KNOWN_RESEARCHED
 
-    recommendations = []
-
-    # Analyze each experiment
-    for exp_name, exp_data in EXPERIMENTS.items():
-        # Skip if already researched
-        if exp_name in researched_experiments:
-            continue
+    # Rankings only depend on Scientists and the researched set - look them up
+    with profiler.phase("analysis"):
+        recommendations = get_roi_recommendations(current_scientists, researched_experiments)
+    profiler.count("experiments_ranked", len(recommendations))
 
-        roi = calculate_experiment_roi(
-            exp_name, exp_data, current_scientists, current_production
-        )
-        if roi:
-            # Add industry priority for tiebreaking
-            roi["industry_priority"] = industry_priority.get(roi["boost"], 0)
-            recommendations.append(roi)
-
-    # Sort by ROI score (highest first), then by industry priority (weakest industry first)
-    recommendations.sort(
-        key=lambda x: (x["roi_score"], x["industry_priority"]), reverse=True
-    )
+    if horizon_hours:
+        with profiler.phase("projection"):
+            recommendations = rank_by_projection(
+                recommendations, current_production, horizon_hours
+            )
 
     return recommendations, current_scientists
 
 
+@profiler.timed("format")
 def format_experiment_recommendations(recommendations, current_scientists, top_n=15):
     """Format experiment recommendations as readable text."""
     if not recommendations:
@@ -347,11 +204,7 @@ def format_experiment_recommendations(recommendations, current_scientists, top_n
     if affordable:
         output.append("✅ AFFORDABLE NOW:\n")
         for i, rec in enumerate(affordable[:top_n], 1):
-            mult_str = (
-                f"x{rec['multiplier']:,}"
-                if isinstance(rec["multiplier"], (int, float))
-                else rec["multiplier"]
-            )
+            mult_str = format_effect(rec)
             output.append(f"{i}. {rec['name']}")
             output.append(f"   Type: {rec['type']} | Industry: {rec['boost']}")
             output.append(f"   Cost: {rec['cost']:,} Scientists")
@@ -367,11 +220,7 @@ def format_experiment_recommendations(recommendations, current_scientists, top_n
         output.append(f"\n❌ NEED MORE SCIENTISTS:\n")
         remaining = top_n - len(affordable)
         for i, rec in enumerate(unaffordable[:remaining], len(affordable) + 1):
-            mult_str = (
-                f"x{rec['multiplier']:,}"
-                if isinstance(rec["multiplier"], (int, float))
-                else rec["multiplier"]
-            )
+            mult_str = format_effect(rec)
             output.append(
                 f"{i}. {rec['name']} - Need {rec['cost'] - current_scientists} more Scientists"
             )
@@ -385,19 +234,18 @@ def format_experiment_recommendations(recommendations, current_scientists, top_n
     output.append("BEST EXPERIMENT BY CATEGORY")
     output.append(f"{'='*90}\n")
 
+    categories = EXPERIMENTS.types()
     best_by_type = {}
     for rec in recommendations:
         if rec["type"] not in best_by_type and rec["affordable"]:
             best_by_type[rec["type"]] = rec
+            if len(best_by_type) == len(categories):
+                break
 
-    for exp_type in ["INDUSTRY", "STATE", "TRIALS"]:
+    for exp_type in categories:
         if exp_type in best_by_type:
             rec = best_by_type[exp_type]
-            mult_str = (
-                f"x{rec['multiplier']:,}"
-                if isinstance(rec["multiplier"], (int, float))
-                else rec["multiplier"]
-            )
+            mult_str = format_effect(rec)
             status = "✅ AFFORDABLE" if rec["affordable"] else "❌ TOO EXPENSIVE"
             output.append(
                 f"{exp_type:12} - {rec['name']:30} | {mult_str:12} | {rec['cost']:3} Scientists | {status}"
@@ -425,8 +273,12 @@ def format_experiment_recommendations(recommendations, current_scientists, top_n
     return "\n".join(output)
 
 
-def get_industry_production_ranking(decoded_data):
-    """Rank industries by current production to suggest focus areas."""
+def get_industry_production_ranking(decoded_data, growth=None):
+    """
+    Rank industries by current production to suggest focus areas.
+    growth ({card_id: rate per hour}, see snapshot_rates.growth_rates) ranks
+    them by how fast they grow instead, so the weakest is the slowest-growing.
+    """
     if "cards" not in decoded_data:
         return {}
 
@@ -434,7 +286,10 @@ def get_industry_production_ranking(decoded_data):
     production = {}
 
     for card_id, name in resource_map.items():
-        if card_id in decoded_data["cards"]:
+        if growth is not None:
+            if card_id in growth:
+                production[name] = growth[card_id]
+        elif card_id in decoded_data["cards"]:
             production[name] = decoded_data["cards"][card_id].get("value", 0)
 
     # Sort by production (lowest first = weakest industry)
@@ -0,0 +1,277 @@
+"""
+Streaming export pipeline for Adventure Communist save files
+Decodes, analyzes and writes one compact NDJSON or CSV record per save
+"""
+
+import argparse
+import collections
+import csv
+import functools
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from batch_analyze import find_save_files
+from decoder import decode_adventure_communist_save
+from experiments_roi import analyze_experiments, get_industry_production_ranking
+from production_projection import INDUSTRIES, positive_hours
+from save_watcher import ANALYSIS_CARD_IDS
+
+FIELDS = ("path", "scientists", "comrades", "cards", "missions", "production", "top")
+DEFAULT_FIELDS = ("path", "scientists", "cards", "top")
+DEFAULT_TOP_N = 3
+NO_HEADER_ERROR = "No ADCM header found"
+# Saves handed to the worker pool ahead of the writer, per worker
+IN_FLIGHT_PER_WORKER = 32
+
+
+def error_message(error):
+    """How a save that couldn't be read is described in exported records."""
+    return f"{type(error).__name__}: {error}"
+
+
+def top_recommendations(decoded_data, top_n=DEFAULT_TOP_N, horizon_hours=None):
+    """(best top_n experiments - all of them if top_n is None, current Scientists)."""
+    recommendations, scientists = analyze_experiments(decoded_data, horizon_hours=horizon_hours)
+    if top_n is not None:
+        recommendations = recommendations[:top_n]
+    return recommendations, scientists
+
+
+def finite_or_none(value):
+    """A number as is, or None if it is missing, NaN or infinite (not valid JSON)."""
+    return value if value is not None and math.isfinite(value) else None
+
+
+def build_record(
+    path,
+    decoded_data,
+    fields=DEFAULT_FIELDS,
+    card_ids=None,
+    top_n=DEFAULT_TOP_N,
+    horizon_hours=None,
+):
+    """
+    Flat record for one decoded save with only the selected fields.
+    card_ids limits "cards" to those IDs (all cards if None); cards missing
+    from the save are None, so they can't be mistaken for a real 0. NaN and
+    infinite values are None too.
+    """
+    record = {}
+    if "path" in fields:
+        record["path"] = path
+
+    cards = decoded_data["cards"]
+    if "scientists" in fields:
+        record["scientists"] = finite_or_none(cards.value(36, None))
+    if "comrades" in fields:
+        record["comrades"] = finite_or_none(cards.value(38, None))
+    if "cards" in fields:
+        ids = cards if card_ids is None else card_ids
+        record["cards"] = {
+            card_id: finite_or_none(cards.value(card_id, None)) for card_id in ids
+        }
+    if "missions" in fields:
+        record["missions"] = dict(decoded_data["mission_progress"])
+    if "production" in fields:
+        record["production"] = {
+            industry: finite_or_none(total)
+            for industry, total in get_industry_production_ranking(decoded_data).items()
+        }
+    if "top" in fields:
+        recommendations, _ = top_recommendations(decoded_data, top_n, horizon_hours)
+        record["top"] = [rec["name"] for rec in recommendations]
+    return record
+
+
+def save_record(path, options):
+    """
+    Decode and analyze one save (also the process pool entry point).
+    Errors become a record instead of an exception.
+    """
+    try:
+        decoded_data = decode_adventure_communist_save(path)
+        if not decoded_data:
+            return {"path": path, "error": NO_HEADER_ERROR}
+        return build_record(path, decoded_data, **options)
+    except Exception as e:  # pylint: disable=broad-except
+        return {"path": path, "error": error_message(e)}
+
+
+def bounded_map(func, items, workers, initializer=None, initargs=()):
+    """
+    Like executor.map, but only keeps a bounded number of items in flight,
+    so memory stays constant however many items there are. Order is kept.
+    """
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        pending = collections.deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def stream_records(
+    paths,
+    fields=DEFAULT_FIELDS,
+    card_ids=None,
+    top_n=DEFAULT_TOP_N,
+    horizon_hours=None,
+    workers=1,
+):
+    """
+    Yield one record per save path, decoding lazily as records are consumed.
+    paths can be any iterable, including a generator over a huge directory.
+    """
+    options = {
+        "fields": tuple(fields),
+        "card_ids": card_ids,
+        "top_n": top_n,
+        "horizon_hours": horizon_hours,
+    }
+    worker = functools.partial(save_record, options=options)
+    if workers == 1:
+        return map(worker, paths)
+    return bounded_map(worker, paths, workers)
+
+
+def write_ndjson(records, out):
+    """Write records as compact JSON, one per line. Returns the number written."""
+    written = 0
+    for record in records:
+        out.write(json.dumps(record, separators=(",", ":")) + "\n")
+        written += 1
+    return written
+
+
+def csv_columns(fields=DEFAULT_FIELDS, card_ids=ANALYSIS_CARD_IDS, top_n=DEFAULT_TOP_N):
+    """CSV header for the selected fields - nested fields get one column per item."""
+    columns = []
+    for field in FIELDS:
+        if field not in fields:
+            continue
+        if field == "cards":
+            columns.extend(f"card_{card_id}" for card_id in card_ids)
+        elif field == "production":
+            columns.extend(f"production_{industry}" for industry in INDUSTRIES)
+        elif field == "top":
+            columns.extend(f"top_{rank}" for rank in range(1, top_n + 1))
+        else:
+            columns.append(field)
+    columns.append("error")
+    return columns
+
+
+def _flatten(record):
+    """Spread a record's nested fields over the CSV columns."""
+    row = {}
+    for key, value in record.items():
+        if key == "cards":
+            row.update((f"card_{card_id}", card_value) for card_id, card_value in value.items())
+        elif key == "production":
+            row.update((f"production_{industry}", total) for industry, total in value.items())
+        elif key == "top":
+            row.update((f"top_{rank}", name) for rank, name in enumerate(value, 1))
+        elif key == "missions":
+            row[key] = json.dumps(value, separators=(",", ":"))
+        else:
+            row[key] = value
+    return row
+
+
+def write_csv(records, out, columns):
+    """Write records as CSV rows under columns. Returns the number written."""
+    writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    written = 0
+    for record in records:
+        writer.writerow(_flatten(record))
+        written += 1
+    return written
+
+
+def add_corpus_arguments(parser):
+    """Arguments shared by the bulk exporters: root, --pattern, --horizon and --workers."""
+    parser.add_argument("root", help="Directory (or single file) to scan")
+    parser.add_argument(
+        "--pattern", default="*.sav", help="Filename pattern to match (default: *.sav)"
+    )
+    parser.add_argument(
+        "--horizon",
+        type=positive_hours,
+        help="Rank by production projected over this many hours instead of ROI score",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+
+
+def main():
+    """Main entry point for the export pipeline."""
+    parser = argparse.ArgumentParser(
+        description="Stream one NDJSON or CSV record per save file for bulk processing."
+    )
+    add_corpus_arguments(parser)
+    parser.add_argument(
+        "--format", choices=("ndjson", "csv"), default="ndjson", help="Output format"
+    )
+    parser.add_argument("--output", help="Write to this file instead of stdout")
+    parser.add_argument(
+        "--fields",
+        nargs="+",
+        choices=FIELDS,
+        default=list(DEFAULT_FIELDS),
+        help="Fields per record (default: path scientists cards top)",
+    )
+    parser.add_argument(
+        "--cards",
+        type=int,
+        nargs="+",
+        help="Card IDs to include (default: all for NDJSON, Scientists and resources for CSV)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=DEFAULT_TOP_N, help="Recommendations per save"
+    )
+    args = parser.parse_args()
+
+    card_ids = args.cards
+    if args.format == "csv" and card_ids is None:
+        card_ids = ANALYSIS_CARD_IDS
+
+    records = stream_records(
+        find_save_files(args.root, args.pattern),
+        fields=args.fields,
+        card_ids=card_ids,
+        top_n=args.top,
+        horizon_hours=args.horizon,
+        workers=args.workers,
+    )
+
+    def write(out):
+        if args.format == "csv":
+            return write_csv(records, out, csv_columns(args.fields, card_ids, args.top))
+        return write_ndjson(records, out)
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as out:
+            written = write(out)
+    else:
+        try:
+            written = write(sys.stdout)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader (e.g. head) stopped early - point stdout at devnull so
+            # the flush at exit doesn't raise again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+
+    print(f"Wrote {written:,} records", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Growth forecasting for Adventure Communist save files
+Fits exponential growth to card history and predicts when Scientists reach each experiment cost
+"""
+
+import argparse
+import math
+import operator
+import os
+import sys
+import time
+from card_history import CardHistory
+from decoder import CARD_NAMES
+from experiments_roi import EXPERIMENTS, KNOWN_RESEARCHED
+from snapshot_rates import RESOURCE_CARD_IDS, card_matrix
+
+SCIENTISTS_CARD_ID = 36
+FORECAST_CARD_IDS = RESOURCE_CARD_IDS + (SCIENTISTS_CARD_ID,)
+# A drop of more than this in log10 (about 11%) - e.g. Scientists spent on
+# experiments - ends one exponential piece and starts the next
+DEFAULT_BREAK_LOG10 = 0.05
+# Points a piece needs before its own slope is trusted over the previous piece's
+MIN_SEGMENT_POINTS = 3
+
+
+def _sums(times, logs):
+    """Least-squares sums (n, sum t, sum y, sum t*t, sum t*y) of a run of points."""
+    return (
+        len(times),
+        math.fsum(times),
+        math.fsum(logs),
+        math.fsum(map(operator.mul, times, times)),
+        math.fsum(map(operator.mul, times, logs)),
+    )
+
+
+def _slope(sums):
+    """Least-squares slope of y over t from _sums(), or None if it isn't defined."""
+    n, sum_t, sum_y, sum_tt, sum_ty = sums
+    spread = n * sum_tt - sum_t * sum_t
+    if n < 2 or spread <= 0:
+        return None
+    return (n * sum_ty - sum_t * sum_y) / spread
+
+
+class _CardFit:
+    """Running log-linear fit of one card's current exponential piece."""
+
+    __slots__ = ("start", "sums", "last_time", "last_log", "previous_slope")
+
+    def __init__(self):
+        self.start = None  # Unix time the current piece began
+        self.sums = (0, 0.0, 0.0, 0.0, 0.0)
+        self.last_time = None
+        self.last_log = math.inf  # so the first point always starts a piece
+        self.previous_slope = None
+
+    def add(self, times, logs):
+        """Add points (hours since the piece began) to the current piece."""
+        hours = [(t - self.start) / 3600.0 for t in times]
+        self.sums = tuple(map(operator.add, self.sums, _sums(hours, logs)))
+        self.last_time, self.last_log = times[-1], logs[-1]
+
+    def new_piece(self, start):
+        """Close the current piece, keeping its slope as a fallback, and start another."""
+        slope = _slope(self.sums)
+        if slope is not None:
+            self.previous_slope = slope
+        self.start = start
+        self.sums = (0, 0.0, 0.0, 0.0, 0.0)
+
+    def slope(self):
+        """log10 growth per hour of the current piece (or the previous one while it's short)."""
+        if self.sums[0] >= MIN_SEGMENT_POINTS:
+            return _slope(self.sums)
+        return self.previous_slope
+
+
+class GrowthModel:
+    """
+    Piecewise exponential growth of card values, refitted incrementally.
+
+    Each card's log10 value is fitted with a straight line in time by least
+    squares. The fit is kept as running sums, so a new snapshot costs the
+    same however long the history is. When a value drops (Scientists spent,
+    a reset), the current piece ends and a new one starts from that point.
+    """
+
+    def __init__(self, card_ids=FORECAST_CARD_IDS, break_log10=DEFAULT_BREAK_LOG10):
+        self.card_ids = tuple(card_ids)
+        self.break_log10 = break_log10
+        self.latest = None  # Unix time of the last snapshot added
+        self.snapshots = 0
+        self._fits = {card_id: _CardFit() for card_id in self.card_ids}
+
+    @classmethod
+    def from_history(cls, history, **options):
+        """Fit a model to every row of a CardHistory."""
+        model = cls(**options)
+        columns = []
+        times = []
+        for card_id in model.card_ids:
+            times, column = history.query(card_id)
+            columns.append(column)
+        model._add_columns(list(times), columns)
+        return model
+
+    def extend(self, snapshots):
+        """
+        Add (timestamp, cards) snapshots, where cards is a decoded save's cards
+        or {card_id: value}. Snapshots not later than the last one are ignored.
+        Returns how many were added.
+        """
+        times, values = card_matrix(snapshots, self.card_ids)
+        width = len(self.card_ids)
+        columns = [values[column::width] for column in range(width)]
+        return self._add_columns(list(times), columns)
+
+    def update(self, timestamp, cards):
+        """Add one snapshot. Returns whether it was added."""
+        return self.extend([(timestamp, cards)]) == 1
+
+    def _add_columns(self, times, columns):
+        first = 0
+        if self.latest is not None:
+            while first < len(times) and times[first] <= self.latest:
+                first += 1
+        times = times[first:]
+        if not times:
+            return 0
+
+        for card_id, column in zip(self.card_ids, columns):
+            points = [(t, math.log10(v)) for t, v in zip(times, column[first:]) if v > 0]
+            if points:
+                self._add_points(self._fits[card_id], *map(list, zip(*points)))
+
+        self.latest = times[-1]
+        self.snapshots += len(times)
+        return len(times)
+
+    def _add_points(self, fit, times, logs):
+        """Split points into pieces at every drop and add them to the card's fit."""
+        previous = [fit.last_log] + logs[:-1]
+        breaks = [
+            i
+            for i, drop in enumerate(map(operator.sub, previous, logs))
+            if drop > self.break_log10
+        ]
+        piece_start = 0
+        for piece_end in breaks + [len(times)]:
+            if piece_end > piece_start:
+                fit.add(times[piece_start:piece_end], logs[piece_start:piece_end])
+            if piece_end < len(times):
+                fit.new_piece(times[piece_end])
+            piece_start = piece_end
+
+    def growth(self, card_id):
+        """
+        Current fit of a card: {"value", "log10_per_hour", "percent_per_hour",
+        "doubling_hours", "points", "piece_start"}, or None without a slope yet.
+        """
+        fit = self._fits.get(card_id)
+        slope = fit.slope() if fit else None
+        if slope is None:
+            return None
+        return {
+            "value": 10.0**fit.last_log,
+            "log10_per_hour": slope,
+            "percent_per_hour": (10.0**slope - 1.0) * 100,
+            "doubling_hours": math.log10(2) / slope if slope > 0 else None,
+            "points": fit.sums[0],
+            "piece_start": fit.start,
+        }
+
+    def eta(self, card_id, target):
+        """
+        Hours after the latest snapshot until a card reaches target: 0 if it
+        already has, None if it isn't growing.
+        """
+        fit = self._fits.get(card_id)
+        if fit is None or fit.last_time is None:
+            return None
+        target_log = math.log10(target) if target > 0 else -math.inf
+        if fit.last_log >= target_log:
+            return 0.0
+        slope = fit.slope()
+        if slope is None or slope <= 0:
+            return None
+        return (target_log - fit.last_log) / slope
+
+
+def experiment_etas(model, researched_experiments=None):
+    """
+    When Scientists reach each experiment cost, cheapest first:
+    [{"cost", "names", "eta_hours", "eta_timestamp"}] (None when not growing).
+    """
+    if researched_experiments is None:
+        researched_experiments = KNOWN_RESEARCHED
+
+    by_cost = {}
+    for name, exp_data in EXPERIMENTS.items():
+        if name not in researched_experiments:
+            by_cost.setdefault(exp_data["cost"], []).append(name)
+
+    etas = []
+    for cost in sorted(by_cost):
+        hours = model.eta(SCIENTISTS_CARD_ID, cost)
+        etas.append(
+            {
+                "cost": cost,
+                "names": by_cost[cost],
+                "eta_hours": hours,
+                "eta_timestamp": model.latest + hours * 3600 if hours is not None else None,
+            }
+        )
+    return etas
+
+
+def _format_hours(hours):
+    if hours is None:
+        return "not growing"
+    if hours == 0:
+        return "reached"
+    if hours < 48:
+        return f"in {hours:.1f} h"
+    return f"in {hours / 24:.1f} days"
+
+
+def format_forecast(model, etas, top_n=10):
+    """Format growth fits and Scientists ETAs as readable text."""
+    output = []
+    output.append(f"{'='*90}")
+    output.append(f"GROWTH FORECAST ({model.snapshots:,} snapshots)")
+    output.append(f"{'='*90}\n")
+
+    for card_id in model.card_ids:
+        growth = model.growth(card_id)
+        name = CARD_NAMES.get(card_id, f"Card {card_id}")
+        if growth is None:
+            output.append(f"{name:25} not enough snapshots yet")
+            continue
+        doubling = growth["doubling_hours"]
+        doubling_text = f"doubles every {doubling:,.1f} h" if doubling else "not growing"
+        output.append(
+            f"{name:25} {growth['value']:12.2e} {growth['percent_per_hour']:+8.2f}%/h  "
+            f"{doubling_text} ({growth['points']} points)"
+        )
+
+    upcoming = [eta for eta in etas if eta["eta_hours"] != 0][:top_n]
+    if upcoming:
+        output.append("\nScientists needed for the next experiments:")
+        for eta in upcoming:
+            when = ""
+            if eta["eta_timestamp"] is not None:
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(eta["eta_timestamp"]))
+            names = ", ".join(eta["names"])
+            output.append(
+                f"  {eta['cost']:>6,}  {_format_hours(eta['eta_hours']):>14}  {when:16}  {names}"
+            )
+    elif etas:
+        output.append("\nScientists already cover every experiment not yet researched.")
+    return "\n".join(output)
+
+
+def main():
+    """Main entry point for growth forecasting."""
+    parser = argparse.ArgumentParser(
+        description="Forecast growth and experiment ETAs from a card history."
+    )
+    parser.add_argument("history", help="History directory (see card_history.py)")
+    parser.add_argument("--top", type=int, default=10, help="Upcoming experiment costs to show")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.history):
+        print(f"Error: History directory not found: {args.history}")
+        return 1
+    with CardHistory(args.history) as history:
+        model = GrowthModel.from_history(history)
+    if not model.snapshots:
+        print(f"No snapshots in {args.history}")
+        return 1
+    print(format_forecast(model, experiment_etas(model), args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Production projection for Adventure Communist experiments
+Scores experiments by how much output they add to each industry over a time horizon
+"""
+
+import argparse
+import math
+
+INDUSTRIES = ("Potato", "Land", "Ore", "Weapons", "Medicine")
+
+# The save only stores lifetime totals, so hourly output is estimated as the
+# total earned spread over this many hours
+DEFAULT_RATE_WINDOW_HOURS = 24.0
+
+
+def _log10_add(log_a, log_b):
+    """log10(10**log_a + 10**log_b) without leaving log space."""
+    high, low = max(log_a, log_b), min(log_a, log_b)
+    if low == -math.inf:
+        return high
+    return high + math.log10(1.0 + 10.0 ** (low - high))
+
+
+def _log10_positive(value):
+    """log10 of a resource total, treating empty industries as 1."""
+    return math.log10(value) if value > 1.0 else 0.0
+
+
+def positive_hours(value):
+    """argparse type for --horizon: a finite number of hours above zero."""
+    try:
+        hours = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of hours: {value!r}") from None
+    if not 0 < hours < math.inf:
+        raise argparse.ArgumentTypeError(f"must be a positive number of hours: {value!r}")
+    return hours
+
+
+def experiment_effect(recommendation, horizon_hours):
+    """
+    Describe what an experiment does to production over the horizon.
+    Returns (industries, log10 of the extra output in hours of current output).
+    """
+    kind = recommendation["kind"]
+    effect = recommendation["effect"]
+    boost = recommendation["boost"]
+
+    if kind == "instant":
+        # Resource surges hand out hours of every industry's output at once
+        return INDUSTRIES, math.log10(effect)
+
+    if kind == "passive":
+        industries = INDUSTRIES
+    else:
+        industries = (boost,) if boost in INDUSTRIES else ()
+
+    if effect <= 1 or not industries:
+        return (), -math.inf
+
+    hours = recommendation["duration_hours"] or horizon_hours
+    return industries, math.log10(effect - 1) + math.log10(min(hours, horizon_hours))
+
+
+def project_production(
+    current_production, horizon_hours, rate_window_hours=DEFAULT_RATE_WINDOW_HOURS
+):
+    """
+    Project every industry's total over the horizon, all in log10.
+    Returns {industry: (log10 total now, log10 hourly rate, log10 total at horizon)}.
+    """
+    if not 0 < horizon_hours < math.inf:
+        raise ValueError(f"horizon_hours must be positive, not {horizon_hours!r}")
+    log_window = math.log10(rate_window_hours)
+    log_horizon = math.log10(horizon_hours)
+
+    projection = {}
+    for industry in INDUSTRIES:
+        log_total = _log10_positive(current_production.get(industry, 0))
+        log_rate = log_total - log_window
+        projection[industry] = (
+            log_total,
+            log_rate,
+            _log10_add(log_total, log_rate + log_horizon),
+        )
+    return projection
+
+
+def score_by_projection(
+    recommendations,
+    current_production,
+    horizon_hours,
+    rate_window_hours=DEFAULT_RATE_WINDOW_HOURS,
+):
+    """
+    Score every experiment by projected production gain per Scientist.
+
+    An experiment's gain in an industry is the number of decades (log10) it
+    adds to that industry's projected total at the horizon. Gains are weighted
+    by how many decades the industry trails the strongest one, so catching up
+    a weak industry scores higher than padding a strong one. Everything stays
+    in log space, so totals like 5.73e35 can't overflow.
+
+    Returns a list of (projected_gain, score) in the order of recommendations.
+    """
+    projection = project_production(current_production, horizon_hours, rate_window_hours)
+    strongest = max(log_total for log_total, _, _ in projection.values())
+    weights = {
+        industry: 1.0 + strongest - log_total
+        for industry, (log_total, _, _) in projection.items()
+    }
+
+    effects = [experiment_effect(rec, horizon_hours) for rec in recommendations]
+    gains = [
+        sum(
+            weights[industry]
+            * (
+                _log10_add(projection[industry][2], projection[industry][1] + log_extra)
+                - projection[industry][2]
+            )
+            for industry in industries
+        )
+        for industries, log_extra in effects
+    ]
+    return [
+        (gain, gain / rec["cost"]) for gain, rec in zip(gains, recommendations)
+    ]
+
+
+def rank_by_projection(
+    recommendations,
+    current_production,
+    horizon_hours,
+    rate_window_hours=DEFAULT_RATE_WINDOW_HOURS,
+):
+    """Return copies of the recommendations ranked by projected gain per Scientist."""
+    scores = score_by_projection(
+        recommendations, current_production, horizon_hours, rate_window_hours
+    )
+    ranked = [
+        dict(rec, roi_score=score, projected_gain=gain)
+        for rec, (gain, score) in zip(recommendations, scores)
+    ]
+    ranked.sort(key=lambda x: (x["roi_score"], x["industry_priority"]), reverse=True)
+    return ranked
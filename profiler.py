@@ -0,0 +1,160 @@
+"""
+Opt-in profiling for the decoder and analyzer
+Records wall time per phase and event counters while a profile is active
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import time
+
+# The profile recording on this thread, or None when profiling is off
+_active = contextvars.ContextVar("active_profile", default=None)
+_NOT_PROFILING = contextlib.nullcontext()
+
+
+class Profile:
+    """
+    Wall time per phase and event counters for one decode or analysis run.
+
+    Instrumented code calls the module-level phase() and count(), which do
+    nothing unless a Profile has been activated with profiling().
+    """
+
+    __slots__ = ("phases", "counters", "started", "elapsed")
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.elapsed = None  # set when the profiling() block ends
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Add the wall time spent in the block to phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, amount=1):
+        """Add amount to counter name."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, **context):
+        """
+        Machine-readable snapshot: {"total", "phases", "counters"} in seconds
+        and counts, plus any context (e.g. path) passed in.
+        """
+        total = self.elapsed
+        if total is None:
+            total = time.perf_counter() - self.started
+        return dict(
+            context,
+            total=total,
+            phases=dict(self.phases),
+            counters=dict(self.counters),
+        )
+
+
+@contextlib.contextmanager
+def profiling(profile):
+    """
+    Record phases and counters into profile for the block, which is what the
+    profile's total measures. None leaves profiling off.
+    """
+    if profile is None:
+        yield None
+        return
+
+    profile.started = time.perf_counter()
+    token = _active.set(profile)
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+        profile.elapsed = time.perf_counter() - profile.started
+
+
+def phase(name):
+    """Context manager timing a phase of the active profile, if any."""
+    profile = _active.get()
+    if profile is None:
+        return _NOT_PROFILING
+    return profile.phase(name)
+
+
+def count(name, amount=1):
+    """Add to a counter of the active profile, if any."""
+    profile = _active.get()
+    if profile is not None:
+        profile.count(name, amount)
+
+
+def timed(name):
+    """Decorator recording every call of a function as phase name."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def aggregate_records(records):
+    """Sum phases and counters over many records (e.g. one per save in a batch run)."""
+    total = {"saves": 0, "total": 0.0, "phases": {}, "counters": {}}
+    for record in records:
+        total["saves"] += 1
+        total["total"] += record["total"]
+        for key in ("phases", "counters"):
+            for name, value in record[key].items():
+                total[key][name] = total[key].get(name, 0) + value
+    return total
+
+
+def write_records(path, records):
+    """Append records to path as JSON lines."""
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def format_profile(record):
+    """Format a profile record (or an aggregate) as readable text."""
+    output = []
+    output.append(f"{'='*90}")
+    title = "PROFILE"
+    if record.get("saves"):
+        title += f" ({record['saves']:,} saves)"
+    output.append(title)
+    output.append(f"{'='*90}\n")
+
+    total = record["total"]
+    output.append(f"{'Phase':20} {'ms':>10} {'% of total':>11}")
+    for name, seconds in sorted(record["phases"].items(), key=lambda x: x[1], reverse=True):
+        share = seconds / total if total > 0 else 0.0
+        output.append(f"{name:20} {seconds * 1000:10.3f} {share:11.1%}")
+    output.append(f"{'total':20} {total * 1000:10.3f}")
+
+    if record["counters"]:
+        output.append("")
+        output.append(f"{'Counter':20} {'Value':>10}")
+        for name, value in sorted(record["counters"].items()):
+            output.append(f"{name:20} {value:10,}")
+
+    return "\n".join(output)
+
+
+def format_profile_summary(record, top_n=3):
+    """One-line summary of the slowest phases, for a status bar."""
+    slowest = sorted(record["phases"].items(), key=lambda x: x[1], reverse=True)[:top_n]
+    phases = ", ".join(f"{name} {seconds * 1000:.2f} ms" for name, seconds in slowest)
+    total = f"{record['total'] * 1000:.1f} ms"
+    return f"{total} ({phases})" if phases else total
@@ -0,0 +1,179 @@
+"""
+Purchase planner for Adventure Communist experiments
+Finds the best set of experiments to buy with a given number of Scientists
+"""
+
+import functools
+import math
+import profiler
+from experiments_roi import (
+    EXPERIMENTS,
+    INDUSTRY_PRIORITY,
+    KNOWN_RESEARCHED,
+    calculate_experiment_roi,
+)
+
+
+def experiment_value(experiment_name, experiment_data):
+    """
+    Value of owning an experiment: its ROI score times its cost.
+    This is the same scale analyze_experiments ranks by, so a bundle's value is
+    the sum of what each experiment in it is worth.
+    """
+    cost = experiment_data["cost"]
+    roi = calculate_experiment_roi(experiment_name, experiment_data, cost, {})
+    return roi["roi_score"] * cost
+
+
+@functools.lru_cache(maxsize=32)
+def _solve(max_units, items):
+    """
+    0/1 knapsack over (name, units, value) items for every budget up to max_units.
+    Returns the best value per budget and, per item, which budgets take it.
+    """
+    best = [0.0] * (max_units + 1)
+    taken = []
+    for _name, units, value in items:
+        took = bytearray(max_units + 1)
+        for budget in range(max_units, units - 1, -1):
+            candidate = best[budget - units] + value
+            if candidate > best[budget]:
+                best[budget] = candidate
+                took[budget] = 1
+        taken.append(bytes(took))
+    return tuple(best), tuple(taken)
+
+
+class PurchasePlanner:
+    """
+    Best experiment bundles for every budget from 0 to max_budget Scientists.
+
+    One dynamic programming pass covers all budgets, so plan() and
+    marginal_value() are cheap lookups afterwards. Budgets above the cost of
+    every candidate all get the same plan, so the pass stops there. Results
+    are memoized, so planners for the same budget and researched set share
+    the work.
+    """
+
+    def __init__(self, max_budget, researched_experiments=None, experiments=None):
+        if researched_experiments is None:
+            researched_experiments = KNOWN_RESEARCHED
+        if experiments is None:
+            experiments = EXPERIMENTS
+
+        # Ties keep the first item solved, so weakest industries go first
+        candidates = sorted(
+            (
+                (name, data)
+                for name, data in experiments.items()
+                if name not in researched_experiments
+            ),
+            key=lambda item: INDUSTRY_PRIORITY.get(item[1]["boost"], 0),
+            reverse=True,
+        )
+
+        # Costs are all multiples of 5, so budgets are solved in those steps
+        costs = (data["cost"] for _, data in candidates)
+        self.unit = functools.reduce(math.gcd, costs, 0) or 1
+        self.max_budget = max_budget
+        self.items = tuple(
+            (name, data["cost"] // self.unit, experiment_value(name, data))
+            for name, data in candidates
+        )
+        self.costs = {name: data["cost"] for name, data in candidates}
+        solved_budget = min(max_budget, sum(self.costs.values()))
+        self._best, self._taken = _solve(max(solved_budget, 0) // self.unit, self.items)
+
+    def _units(self, budget):
+        """Solved budget step for a budget already clamped to 0..max_budget."""
+        return min(budget // self.unit, len(self._best) - 1)
+
+    def best_value(self, budget):
+        """Highest total value reachable with budget Scientists."""
+        budget = min(max(budget, 0), self.max_budget)
+        return self._best[self._units(budget)]
+
+    def plan(self, budget):
+        """Return the optimal bundle of experiments for budget Scientists."""
+        budget = min(max(budget, 0), self.max_budget)
+        units = self._units(budget)
+        value = self._best[units]
+
+        bundle = []
+        for (name, item_units, _value), took in zip(
+            reversed(self.items), reversed(self._taken)
+        ):
+            if took[units]:
+                bundle.append(name)
+                units -= item_units
+        bundle.reverse()
+
+        cost = sum(self.costs[name] for name in bundle)
+        return {
+            "budget": budget,
+            "experiments": bundle,
+            "cost": cost,
+            "value": value,
+            "leftover": budget - cost,
+        }
+
+    def marginal_value(self, budget):
+        """Extra value the budget-th Scientist adds over budget - 1 Scientists."""
+        if budget <= 0 or budget > self.max_budget:
+            return 0.0
+        return self.best_value(budget) - self.best_value(budget - 1)
+
+    def marginal_values(self):
+        """Marginal value of each Scientist from 1 to max_budget."""
+        return [self.marginal_value(budget) for budget in range(1, self.max_budget + 1)]
+
+    def next_upgrade(self, budget):
+        """Smallest larger budget whose best plan is worth more, or None."""
+        current = self.best_value(budget)
+        start = budget // self.unit + 1
+        for units in range(start, len(self._best)):
+            if self._best[units] > current:
+                return units * self.unit
+        return None
+
+
+@profiler.timed("purchase_plan")
+def plan_purchases(current_scientists, researched_experiments=None, headroom=150):
+    """
+    Plan the best bundle for the current Scientists. The planner also covers
+    `headroom` extra Scientists so the next worthwhile budget can be shown.
+    """
+    planner = PurchasePlanner(current_scientists + headroom, researched_experiments)
+    plan = planner.plan(current_scientists)
+    plan["next_budget"] = planner.next_upgrade(current_scientists)
+    if plan["next_budget"] is not None:
+        plan["next_value"] = planner.best_value(plan["next_budget"])
+    return plan
+
+
+@profiler.timed("format")
+def format_purchase_plan(plan):
+    """Format a purchase plan as readable text."""
+    output = []
+    output.append(f"{'='*90}")
+    output.append(f"BEST PURCHASE PLAN FOR {plan['budget']:,} SCIENTISTS")
+    output.append(f"{'='*90}\n")
+
+    if not plan["experiments"]:
+        output.append("Nothing affordable yet - save up.")
+    for i, name in enumerate(plan["experiments"], 1):
+        output.append(f"{i}. {name} ({EXPERIMENTS[name]['cost']} Scientists)")
+
+    output.append("")
+    output.append(
+        f"Total: {plan['cost']:,} Scientists | Value: {plan['value']:,.0f} | "
+        f"Left over: {plan['leftover']:,}"
+    )
+    if plan.get("next_budget") is not None:
+        output.append(
+            f"Next better plan at {plan['next_budget']:,} Scientists "
+            f"(value {plan['next_value']:,.0f}, "
+            f"+{plan['next_value'] - plan['value']:,.0f})"
+        )
+
+    return "\n".join(output)
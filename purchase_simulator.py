@@ -0,0 +1,327 @@
+"""
+Monte Carlo purchase-order simulator for Adventure Communist experiments
+Compares buying orders by how fast they grow every industry to a production target
+"""
+
+import argparse
+import itertools
+import math
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decoder import decode_adventure_communist_save
+from experiments_roi import (
+    EXPERIMENTS,
+    KNOWN_RESEARCHED,
+    get_industry_production_ranking,
+    get_roi_recommendations,
+)
+from production_projection import DEFAULT_RATE_WINDOW_HOURS, INDUSTRIES
+
+CATEGORIES = ("INDUSTRY", "STATE", "TRIALS")
+# Randomized runs handed to a worker at a time
+CHUNK_RUNS = 250
+
+
+def purchase_effect(experiment_data):
+    """
+    What buying an experiment does: (industry indexes, rate multiplier,
+    hours of current output granted instantly).
+    """
+    kind = experiment_data["kind"]
+    effect = experiment_data["effect"]
+    boost = experiment_data["boost"]
+    industries = tuple(range(len(INDUSTRIES)))
+
+    if kind == "instant":
+        return industries, 1.0, effect
+    if kind == "passive":
+        return industries, effect, 0.0
+    if boost not in INDUSTRIES:
+        return (), 1.0, 0.0
+
+    target = (INDUSTRIES.index(boost),)
+    hours = experiment_data["duration_hours"]
+    if hours is None:
+        return target, effect, 0.0
+
+    # Temporary boosts are short enough to count as a one-off burst of output
+    return target, 1.0, (effect - 1) * hours
+
+
+def _hours_to_goals(totals, rates, goals):
+    """Hours until every industry's total reaches its goal at the current rates."""
+    slowest = 0.0
+    for total, rate, goal in zip(totals, rates, goals):
+        if total < goal:
+            if rate <= 0:
+                return math.inf
+            slowest = max(slowest, (goal - total) / rate)
+    return slowest
+
+
+def simulate_order(order, start, scientists_per_hour, target_multiple, max_hours):
+    """
+    Hours for a purchase order to reach target_multiple x every industry's
+    starting total (math.inf if not within max_hours). Output grows linearly
+    between purchases, so the simulation jumps from purchase to purchase.
+    """
+    totals = list(start["totals"])
+    rates = list(start["rates"])
+    goals = [max(total, 1.0) * target_multiple for total in totals]
+    scientists = start["scientists"]
+    clock = 0.0
+
+    for cost, industries, rate_multiplier, instant_hours in order:
+        if scientists >= cost:
+            wait = 0.0
+        elif scientists_per_hour > 0:
+            wait = (cost - scientists) / scientists_per_hour
+        else:
+            break
+
+        finish = _hours_to_goals(totals, rates, goals)
+        if finish <= wait or clock + wait > max_hours:
+            break
+
+        clock += wait
+        totals = [total + rate * wait for total, rate in zip(totals, rates)]
+        scientists += scientists_per_hour * wait - cost
+        for index in industries:
+            totals[index] += rates[index] * instant_hours
+            rates[index] *= rate_multiplier
+
+    finish = clock + _hours_to_goals(totals, rates, goals)
+    return finish if finish <= max_hours else math.inf
+
+
+def strategy_orders(strategy, candidates, rng):
+    """Return the purchase order (list of experiment names) for one run of a strategy."""
+    if strategy == "greedy_roi":
+        return list(candidates)
+    if strategy == "cheapest_first":
+        return sorted(candidates, key=lambda name: EXPERIMENTS[name]["cost"])
+    if strategy == "random":
+        order = list(candidates)
+        rng.shuffle(order)
+        return order
+
+    # Category orders such as INDUSTRY>STATE>TRIALS, shuffled within each category
+    order = []
+    for category in strategy.split(">"):
+        group = [name for name in candidates if EXPERIMENTS[name]["type"] == category]
+        rng.shuffle(group)
+        order.extend(group)
+    return order
+
+
+STRATEGIES = ("greedy_roi", "cheapest_first", "random") + tuple(
+    ">".join(order) for order in itertools.permutations(CATEGORIES)
+)
+DETERMINISTIC_STRATEGIES = ("greedy_roi", "cheapest_first")
+
+
+def _run_chunk(job):
+    """Process pool entry point - simulate one chunk of runs for a strategy."""
+    strategy, seed, runs, start, candidates, settings = job
+    rng = random.Random(f"{seed}:{strategy}")
+    effects = {
+        name: (EXPERIMENTS[name]["cost"],) + purchase_effect(EXPERIMENTS[name])
+        for name in candidates
+    }
+
+    results = []
+    for _ in range(runs):
+        names = strategy_orders(strategy, candidates, rng)
+        hours = simulate_order(
+            [effects[name] for name in names],
+            start,
+            settings["scientists_per_hour"],
+            settings["target_multiple"],
+            settings["max_hours"],
+        )
+        results.append((hours, names))
+
+    best_hours, best_order = min(results, key=lambda result: result[0])
+    return strategy, [hours for hours, _ in results], best_hours, best_order
+
+
+def starting_state(decoded_data):
+    """Production totals, estimated hourly rates and Scientists from a decoded save."""
+    production = get_industry_production_ranking(decoded_data)
+    totals = [float(production.get(industry, 0)) for industry in INDUSTRIES]
+    return {
+        "totals": totals,
+        "rates": [total / DEFAULT_RATE_WINDOW_HOURS for total in totals],
+        "scientists": int(decoded_data["cards"].get(36, {}).get("value", 0)),
+    }
+
+
+def simulate_strategies(
+    decoded_data,
+    scientists_per_hour,
+    runs=1000,
+    target_multiple=1000.0,
+    max_hours=24 * 365,
+    workers=None,
+    seed=0,
+    researched_experiments=None,
+):
+    """
+    Run every strategy and report its time-to-target distribution (hours).
+    Randomized strategies get `runs` runs each, split into seeded chunks so
+    results are reproducible whatever the number of workers.
+    """
+    start = starting_state(decoded_data)
+    candidates = tuple(
+        rec["name"]
+        for rec in get_roi_recommendations(math.inf, researched_experiments)
+    )
+    settings = {
+        "scientists_per_hour": scientists_per_hour,
+        "target_multiple": target_multiple,
+        "max_hours": max_hours,
+    }
+
+    jobs = []
+    for strategy in STRATEGIES:
+        if strategy in DETERMINISTIC_STRATEGIES:
+            jobs.append((strategy, seed, 1, start, candidates, settings))
+            continue
+        for chunk, first in enumerate(range(0, runs, CHUNK_RUNS)):
+            chunk_runs = min(CHUNK_RUNS, runs - first)
+            jobs.append((strategy, f"{seed}:{chunk}", chunk_runs, start, candidates, settings))
+
+    started = time.perf_counter()
+    if workers == 1:
+        outcomes = list(map(_run_chunk, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(_run_chunk, jobs))
+    elapsed = time.perf_counter() - started
+
+    collected = {}
+    for strategy, hours, best_hours, best_order in outcomes:
+        entry = collected.setdefault(
+            strategy, {"hours": [], "best": math.inf, "best_order": None}
+        )
+        entry["hours"].extend(hours)
+        if entry["best_order"] is None or best_hours < entry["best"]:
+            entry["best"] = best_hours
+            entry["best_order"] = best_order
+
+    simulations = sum(len(entry["hours"]) for entry in collected.values())
+    return {
+        "strategies": {
+            strategy: _summarize(entry) for strategy, entry in collected.items()
+        },
+        "simulations": simulations,
+        "elapsed": elapsed,
+        "sims_per_sec": simulations / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def _summarize(entry):
+    """Distribution of time-to-target over the runs that reached it."""
+    reached = sorted(hours for hours in entry["hours"] if hours != math.inf)
+    summary = {
+        "runs": len(entry["hours"]),
+        "reached": len(reached),
+        "best": entry["best"],
+        "best_order": entry["best_order"],
+    }
+    if reached:
+        summary.update(
+            mean=statistics.mean(reached),
+            median=statistics.median(reached),
+            p10=reached[int(0.1 * (len(reached) - 1))],
+            p90=reached[int(0.9 * (len(reached) - 1))],
+        )
+    return summary
+
+
+def format_simulation_report(report):
+    """Format a simulation report as readable text."""
+    output = []
+    output.append(f"{'='*90}")
+    output.append("TIME TO TARGET BY PURCHASE STRATEGY (hours)")
+    output.append(f"{'='*90}\n")
+    output.append(
+        f"{'Strategy':28} {'Runs':>6} {'Reached':>8} {'Best':>9} "
+        f"{'P10':>9} {'Median':>9} {'P90':>9}"
+    )
+
+    ranked = sorted(
+        report["strategies"].items(),
+        key=lambda item: item[1].get("median", math.inf),
+    )
+    for strategy, summary in ranked:
+        if summary["reached"]:
+            output.append(
+                f"{strategy:28} {summary['runs']:6,} {summary['reached']:8,} "
+                f"{summary['best']:9.1f} {summary['p10']:9.1f} "
+                f"{summary['median']:9.1f} {summary['p90']:9.1f}"
+            )
+        else:
+            output.append(f"{strategy:28} {summary['runs']:6,} {0:8} {'never':>9}")
+
+    # The single fastest run of any strategy, not the best run of the top-median one
+    best_strategy, best_summary = min(ranked, key=lambda item: item[1]["best"])
+    if best_summary["reached"]:
+        output.append(
+            f"\nFastest order found ({best_strategy}, {best_summary['best']:.1f} hours):"
+        )
+        for i, name in enumerate(best_summary["best_order"], 1):
+            output.append(f"{i:3}. {name}")
+
+    output.append(
+        f"\n{report['simulations']:,} simulations in {report['elapsed']:.2f}s "
+        f"({report['sims_per_sec']:,.0f} simulations/sec)"
+    )
+    return "\n".join(output)
+
+
+def main():
+    """Main entry point for the purchase-order simulator."""
+    parser = argparse.ArgumentParser(
+        description="Simulate experiment buying orders and compare how fast they reach a target."
+    )
+    parser.add_argument(
+        "save_path", nargs="?", default="game.sav", help="Save file (default: game.sav)"
+    )
+    parser.add_argument(
+        "--income", type=float, default=10.0, help="Scientists earned per hour"
+    )
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=1000.0,
+        help="Goal: every industry's total earned multiplied by this",
+    )
+    parser.add_argument("--runs", type=int, default=2000, help="Runs per random strategy")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    decoded_data = decode_adventure_communist_save(args.save_path)
+    if not decoded_data:
+        print("Error: Could not decode save file")
+        return 1
+
+    report = simulate_strategies(
+        decoded_data,
+        args.income,
+        runs=args.runs,
+        target_multiple=args.target,
+        workers=args.workers,
+        seed=args.seed,
+        researched_experiments=KNOWN_RESEARCHED,
+    )
+    print(format_simulation_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
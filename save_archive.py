@@ -0,0 +1,292 @@
+"""
+Deduplicating archive of raw Adventure Communist save files
+Stores each distinct save once, compressed, and reads any snapshot back by content hash
+"""
+
+import argparse
+import json
+import lzma
+import os
+import sys
+import time
+import zlib
+from decode_cache import content_hash
+from decoder import decode_save_bytes
+
+PACK_FILE = "saves.pack"
+INDEX_FILE = "index.jsonl"
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+# Deltas stored on top of deltas before a full copy is stored again
+MAX_DELTA_CHAIN = 16
+
+
+def xor_delta(base, data):
+    """
+    Bytes that turn base into data when XORed with it (past the end of base,
+    data is kept as is). Mostly-identical snapshots give mostly zero bytes,
+    which compress to almost nothing.
+    """
+    shared = min(len(base), len(data))
+    if shared == 0:
+        return bytes(data)
+    mixed = int.from_bytes(base[:shared], "little") ^ int.from_bytes(data[:shared], "little")
+    return mixed.to_bytes(shared, "little") + data[shared:]
+
+
+def apply_delta(base, delta, size):
+    """Rebuild size bytes from base and an xor_delta."""
+    return xor_delta(base, delta)[:size]
+
+
+class SaveArchive:
+    """
+    Content-addressed store of raw save files in one directory.
+
+    saves.pack holds compressed blobs back to back; index.jsonl lists where
+    each blob starts, how it is encoded, and every snapshot (name and time)
+    that refers to it. A save that is already stored only adds a snapshot
+    entry. Reading a blob seeks straight to its offset - nothing is scanned.
+
+    With delta=True a blob may be stored as the XOR against the previously
+    stored blob, whichever of the two encodings is smaller.
+    """
+
+    def __init__(self, directory, codec="zlib", delta=True):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r} - use one of {', '.join(CODECS)}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.codec = codec
+        self.delta = delta
+        self._blobs = {}  # content hash -> index entry
+        self._snapshots = []
+        self._seen = set()  # (hash, name, timestamp) of recorded snapshots
+        self._last_digest = None
+        self._load_index()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_index(self):
+        path = self._path(INDEX_FILE)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+
+        complete = content.rfind(b"\n") + 1
+        if complete < len(content):
+            # Torn last line from an interrupted write - cut it off, or the
+            # next entry would be appended onto the fragment and lost too
+            with open(path, "r+b") as f:
+                f.truncate(complete)
+
+        for line in content[:complete].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Damaged line - skip it rather than lose the rest
+            if entry["type"] == "blob":
+                self._blobs[entry["hash"]] = entry
+                self._last_digest = entry["hash"]
+            else:
+                self._snapshots.append(entry)
+                self._seen.add((entry["hash"], entry["name"], entry["timestamp"]))
+
+    def _append_index(self, entry):
+        with open(self._path(INDEX_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _chain_length(self, digest):
+        """Blobs needed to rebuild digest, or None if one of them isn't indexed."""
+        length = 0
+        while digest is not None:
+            entry = self._blobs.get(digest)
+            if entry is None:
+                return None
+            length += 1
+            digest = entry["base"]
+        return length
+
+    def _encode(self, data):
+        """Smallest encoding of data: (payload, base hash or None)."""
+        compress = CODECS[self.codec][0]
+        payload, base = compress(data), None
+
+        last = self._last_digest
+        chain = self._chain_length(last) if self.delta and last is not None else None
+        if chain is not None and chain < MAX_DELTA_CHAIN:
+            delta_payload = compress(xor_delta(self.get(last), data))
+            if len(delta_payload) < len(payload):
+                payload, base = delta_payload, last
+        return payload, base
+
+    def add(self, data, name=None, timestamp=None):
+        """
+        Store a save's bytes (once per distinct content) and record a snapshot
+        of them. Adding the same snapshot again changes nothing. Returns the hash.
+        """
+        data = bytes(data)
+        digest = content_hash(data)
+
+        if digest not in self._blobs:
+            payload, base = self._encode(data)
+            with open(self._path(PACK_FILE), "ab") as pack:
+                offset = pack.tell()
+                pack.write(payload)
+                pack.flush()
+                os.fsync(pack.fileno())
+
+            entry = {
+                "type": "blob",
+                "hash": digest,
+                "offset": offset,
+                "length": len(payload),
+                "size": len(data),
+                "codec": self.codec,
+                "base": base,
+            }
+            # The index is written after the blob, so it never points at missing bytes
+            self._append_index(entry)
+            self._blobs[digest] = entry
+            self._last_digest = digest
+
+        snapshot = {
+            "type": "snapshot",
+            "hash": digest,
+            "name": name,
+            "timestamp": time.time() if timestamp is None else timestamp,
+        }
+        key = (digest, name, snapshot["timestamp"])
+        if key not in self._seen:
+            self._append_index(snapshot)
+            self._snapshots.append(snapshot)
+            self._seen.add(key)
+        return digest
+
+    def add_file(self, path):
+        """Store a save file, timestamped with its modification time."""
+        with open(path, "rb") as f:
+            data = f.read()
+        return self.add(data, name=os.path.basename(path), timestamp=os.path.getmtime(path))
+
+    def resolve(self, prefix):
+        """Full hash for a unique hash prefix."""
+        if prefix in self._blobs:
+            return prefix
+        matches = [digest for digest in self._blobs if digest.startswith(prefix)]
+        if len(matches) != 1:
+            raise KeyError(f"{len(matches)} saves match hash prefix {prefix!r}")
+        return matches[0]
+
+    def get(self, digest):
+        """The original bytes of a stored save, ready for decode_save_bytes."""
+        entry = self._blobs[self.resolve(digest)]
+        with open(self._path(PACK_FILE), "rb") as pack:
+            pack.seek(entry["offset"])
+            payload = pack.read(entry["length"])
+
+        data = CODECS[entry["codec"]][1](payload)
+        if entry["base"] is not None:
+            if entry["base"] not in self._blobs:
+                raise KeyError(f"Delta base of {entry['hash']} is missing from the index")
+            data = apply_delta(self.get(entry["base"]), data, entry["size"])
+
+        if content_hash(data) != entry["hash"]:
+            raise ValueError(f"Archive entry {entry['hash']} is corrupt")
+        return data
+
+    def decode(self, digest):
+        """Decode a stored save."""
+        return decode_save_bytes(self.get(digest))
+
+    def snapshots(self):
+        """Every recorded snapshot, oldest first: {"hash", "name", "timestamp"}."""
+        snapshots = (
+            {key: value for key, value in entry.items() if key != "type"}
+            for entry in self._snapshots
+        )
+        return sorted(snapshots, key=lambda entry: entry["timestamp"])
+
+    def __contains__(self, digest):
+        return digest in self._blobs
+
+    def __len__(self):
+        return len(self._blobs)
+
+    def stats(self):
+        """
+        Snapshot and blob counts with raw versus stored bytes. Snapshots whose
+        blob isn't indexed (lost to a damaged index) count as unreadable.
+        """
+        sizes = {entry["hash"]: entry["size"] for entry in self._blobs.values()}
+        raw = sum(sizes.get(entry["hash"], 0) for entry in self._snapshots)
+        stored = sum(entry["length"] for entry in self._blobs.values())
+        return {
+            "snapshots": len(self._snapshots),
+            "unique_saves": len(self._blobs),
+            "delta_encoded": sum(1 for entry in self._blobs.values() if entry["base"]),
+            "unreadable": sum(1 for entry in self._snapshots if entry["hash"] not in sizes),
+            "raw_bytes": raw,
+            "stored_bytes": stored,
+            "ratio": raw / stored if stored else 0.0,
+        }
+
+
+def main():
+    """Main entry point for the save archive."""
+    parser = argparse.ArgumentParser(description="Deduplicating archive of raw save files.")
+    parser.add_argument("archive", help="Archive directory")
+    parser.add_argument(
+        "--codec", choices=sorted(CODECS), default="zlib", help="Compression for new saves"
+    )
+    parser.add_argument("--no-delta", action="store_true", help="Never store saves as deltas")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Add save files (oldest first)")
+    add.add_argument("saves", nargs="+", help="Save files")
+    commands.add_parser("list", help="List snapshots")
+    commands.add_parser("stats", help="Show space savings")
+    extract = commands.add_parser("extract", help="Write a stored save back out")
+    extract.add_argument("hash", help="Content hash (or a unique prefix)")
+    extract.add_argument("output", help="Where to write the save")
+    args = parser.parse_args()
+
+    archive = SaveArchive(args.archive, codec=args.codec, delta=not args.no_delta)
+
+    if args.command == "add":
+        for save_path in sorted(args.saves, key=os.path.getmtime):
+            digest = archive.add_file(save_path)
+            print(f"{digest[:12]}  {save_path}")
+    elif args.command == "list":
+        for snapshot in archive.snapshots():
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snapshot["timestamp"]))
+            print(f"{snapshot['hash'][:12]}  {when}  {snapshot['name'] or '-'}")
+    elif args.command == "stats":
+        stats = archive.stats()
+        print(
+            f"{stats['snapshots']:,} snapshots, {stats['unique_saves']:,} unique "
+            f"({stats['delta_encoded']:,} as deltas)\n"
+            f"{stats['raw_bytes']:,} bytes raw -> {stats['stored_bytes']:,} stored "
+            f"({stats['ratio']:.1f}x)"
+        )
+        if stats["unreadable"]:
+            print(f"{stats['unreadable']:,} snapshots refer to saves missing from the index")
+    else:
+        try:
+            data = archive.get(args.hash)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}")
+            return 1
+        with open(args.output, "wb") as f:
+            f.write(data)
+        print(f"Wrote {len(data):,} bytes to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Synthetic Adventure Communist save generator
+Writes valid ADCM saves for benchmarking and testing without sharing a real game.sav
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import struct
+import sys
+from decoder import CARD_RECORD, MAX_CARD_ENTRIES, SAVE_HEADER_SIZE, SAVE_MAGIC
+
+DEFAULT_CARD_COUNT = 39
+DEFAULT_CARD_OFFSET = 0x14A8
+DEFAULT_MISSIONS = {
+    "Capsules and Scientists": 12,
+    "Medals": 140,
+    "Potatoes.Intro": 7,
+    "Medicine.Earned.Total": 3,
+    "Weapon.Missions": 5,
+    "Ore.Missions": 4,
+    "Land.Missions": 9,
+}
+# Root table layout: vtable (size, table size, one field) then the table itself
+_VTABLE = struct.Struct("<HHH2x")
+_TABLE = struct.Struct("<iI")
+_U32 = struct.Struct("<I")
+
+
+def _card_value(card_id, scientists, rng):
+    """Plausible value for a card: huge resource totals, small counts otherwise."""
+    if card_id == 36:
+        return float(scientists)
+    if card_id <= 5:
+        return 10 ** rng.uniform(18, 35)
+    return float(rng.randint(0, 5000))
+
+
+def build_save(
+    card_count=DEFAULT_CARD_COUNT,
+    card_offset=DEFAULT_CARD_OFFSET,
+    missions=None,
+    scientists=105,
+    seed=0,
+    flatbuffer=True,
+):
+    """
+    Build the bytes of an ADCM save.
+
+    card_count cards (IDs card_count..1, as the game stores them) start at
+    card_offset, which may be anywhere after the mission strings. With
+    flatbuffer=False the root table doesn't point at the cards, so decoders
+    have to fall back to scanning for them.
+    """
+    if not 3 <= card_count <= MAX_CARD_ENTRIES:
+        raise ValueError(f"card_count must be between 3 and {MAX_CARD_ENTRIES}")
+    if missions is None:
+        missions = DEFAULT_MISSIONS
+    rng = random.Random(seed)
+
+    buf = bytearray(SAVE_HEADER_SIZE)
+    buf[4:SAVE_HEADER_SIZE] = SAVE_MAGIC
+    vtable_pos = len(buf)
+    buf += _VTABLE.pack(6, _TABLE.size, 4)
+    table_pos = len(buf)
+    buf += bytes(_TABLE.size)
+    _U32.pack_into(buf, 0, table_pos)
+
+    for name, value in missions.items():
+        encoded = name.encode("utf-8")
+        buf += _U32.pack(len(encoded)) + encoded + b"\x00" + _U32.pack(value)
+
+    # The vector's u32 count sits just before the first card
+    vector_pos = card_offset - 4
+    if vector_pos < len(buf):
+        raise ValueError(
+            f"card_offset {card_offset:#x} overlaps the mission strings "
+            f"(needs at least {len(buf) + 4:#x})"
+        )
+    buf += bytes(vector_pos - len(buf))
+
+    field_pos = table_pos + 4
+    field = vector_pos - field_pos if flatbuffer else 0
+    _TABLE.pack_into(buf, table_pos, table_pos - vtable_pos, field)
+
+    buf += _U32.pack(card_count)
+    for card_id in range(card_count, 0, -1):
+        buf += CARD_RECORD.pack(card_id, 0, _card_value(card_id, scientists, rng))
+    # Something other than card data follows the vector in real saves
+    buf += b"\xff" * CARD_RECORD.size
+    return bytes(buf)
+
+
+def write_save(path, **options):
+    """Write a synthetic save to path. Options are passed to build_save."""
+    data = build_save(**options)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def corpus_tag(seed=0, card_offsets=None, **options):
+    """Short hash of the settings a corpus is generated with."""
+    settings = repr((str(seed), tuple(card_offsets or ()), sorted(options.items())))
+    return hashlib.blake2b(settings.encode("utf-8"), digest_size=4).hexdigest()
+
+
+def generate_corpus(directory, count, seed=0, card_offsets=None, **options):
+    """
+    Write count saves named save_00000_<tag>.sav... into directory, where tag
+    is a hash of the generation settings. Each save gets its own seed;
+    card_offsets, if given, are cycled through. Files generated with the same
+    settings are reused, so a corpus only has to be generated once.
+    """
+    os.makedirs(directory, exist_ok=True)
+    width = max(5, len(str(count - 1)))
+    tag = corpus_tag(seed, card_offsets, **options)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"save_{i:0{width}d}_{tag}.sav")
+        if not os.path.exists(path):
+            if card_offsets:
+                options["card_offset"] = card_offsets[i % len(card_offsets)]
+            write_save(path, seed=f"{seed}:{i}", **options)
+        paths.append(path)
+    return paths
+
+
+def main():
+    """Main entry point for the save generator."""
+    parser = argparse.ArgumentParser(description="Write synthetic ADCM save files.")
+    parser.add_argument("directory", help="Directory to write the saves to")
+    parser.add_argument("--count", type=int, default=10, help="Number of saves")
+    parser.add_argument(
+        "--cards", type=int, default=DEFAULT_CARD_COUNT, help="Cards per save"
+    )
+    parser.add_argument(
+        "--offset",
+        type=lambda value: int(value, 0),
+        action="append",
+        help="Card section offset, e.g. 0x1800 (repeat to cycle through several)",
+    )
+    parser.add_argument("--scientists", type=int, default=105, help="Scientists per save")
+    parser.add_argument(
+        "--no-flatbuffer",
+        action="store_true",
+        help="Don't point the root table at the cards (forces the offset scan)",
+    )
+    parser.add_argument("--seed", default="0", help="Random seed")
+    args = parser.parse_args()
+
+    try:
+        paths = generate_corpus(
+            args.directory,
+            args.count,
+            seed=args.seed,
+            card_offsets=args.offset,
+            card_count=args.cards,
+            scientists=args.scientists,
+            flatbuffer=not args.no_flatbuffer,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"{len(paths):,} saves in {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
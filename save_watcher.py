@@ -0,0 +1,71 @@
+"""
+Watch mode for Adventure Communist save files
+Polls a save file and reports when a change has finished being written
+"""
+
+import os
+import time
+
+# Card values analyze_experiments depends on: Scientists and total resources earned
+ANALYSIS_CARD_IDS = (36, 1, 2, 3, 4, 5)
+
+
+class SaveWatcher:
+    """
+    Stat-based poller for a save file.
+
+    poll() compares size and mtime against the previous call and only reports
+    a change once it has been stable for `debounce` seconds, so a save that
+    Steam is still writing isn't decoded half-way through.
+    """
+
+    def __init__(self, path, debounce=2.0):
+        self.path = path
+        self.debounce = debounce
+        self._last_seen = None  # (size, mtime_ns) seen by the latest poll
+        self._changed_at = None  # when _last_seen last changed
+        self._reported = None  # (size, mtime_ns) last reported as settled
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def sync(self):
+        """Treat the save's current state as already reported."""
+        self._last_seen = self._reported = self._signature()
+
+    def poll(self, now=None):
+        """Return True if the save changed and has since settled."""
+        now = time.monotonic() if now is None else now
+        signature = self._signature()
+
+        if signature != self._last_seen:
+            self._last_seen = signature
+            self._changed_at = now
+            return False
+
+        if signature is None or signature == self._reported:
+            return False
+        if now - self._changed_at < self.debounce:
+            return False
+
+        self._reported = signature
+        return True
+
+    def watch(self, interval=1.0):
+        """Yield the save path now and every time it settles after a change."""
+        self.sync()
+        yield self.path
+        while True:
+            if self.poll():
+                yield self.path
+            time.sleep(interval)
+
+
+def analysis_inputs(decoded_data):
+    """Return the card values that feed analyze_experiments."""
+    cards = decoded_data["cards"]
+    return tuple(cards.get(card_id, {}).get("value", 0) for card_id in ANALYSIS_CARD_IDS)
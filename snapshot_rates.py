@@ -0,0 +1,155 @@
+"""
+Snapshot diffs and production rates for Adventure Communist save files
+Turns a series of decoded saves (or the card history) into per-card deltas and hourly rates
+"""
+
+import itertools
+import math
+import operator
+from array import array
+from decoder import _numpy
+
+RESOURCE_CARD_IDS = (1, 2, 3, 4, 5)
+GENERATOR_CARD_IDS = tuple(range(6, 35))
+RATE_CARD_IDS = RESOURCE_CARD_IDS + GENERATOR_CARD_IDS + (36, 38)
+# Growth used for the industry ranking is averaged over this much recent history
+DEFAULT_GROWTH_WINDOW_HOURS = 24.0
+
+
+def _card_value(cards, card_id):
+    """A card's value from a decoded save's cards or a {card_id: value} dict, NaN if missing."""
+    if hasattr(cards, "value"):
+        return cards.value(card_id, math.nan)
+    value = cards.get(card_id, math.nan)
+    return value["value"] if isinstance(value, dict) else float(value)
+
+
+def card_matrix(snapshots, card_ids=RATE_CARD_IDS):
+    """
+    Align snapshots on card_ids. snapshots are (timestamp, cards) pairs, where
+    cards is a decoded save's cards or {card_id: value}. Returns (times, values):
+    the snapshot times in order and a flat row-major array with one row per
+    snapshot and one column per card ID (NaN where a card is missing).
+    Snapshots sharing a timestamp keep the last one.
+    """
+    by_time = {}
+    for timestamp, cards in snapshots:
+        by_time[float(timestamp)] = cards
+
+    times = array("d", sorted(by_time))
+    values = array("d")
+    for timestamp in times:
+        cards = by_time[timestamp]
+        values.extend(_card_value(cards, card_id) for card_id in card_ids)
+    return times, values
+
+
+def _diff(times, values, width, use_numpy):
+    """Deltas and hourly rates between consecutive rows, as (interval hours, deltas, rates)."""
+    np = _numpy() if use_numpy else None
+    if np is not None:
+        matrix = np.frombuffer(values, dtype=np.float64).reshape(-1, width)
+        hours = np.diff(np.frombuffer(times, dtype=np.float64)) / 3600.0
+        deltas = np.diff(matrix, axis=0)
+        return hours, deltas, deltas / hours[:, None]
+
+    hours = array("d", map(operator.sub, times[1:], times[:-1]))
+    for i, seconds in enumerate(hours):
+        hours[i] = seconds / 3600.0
+    # Row-major, so each cell's value one snapshot later is `width` cells ahead
+    flat_deltas = array("d", map(operator.sub, values[width:], values[:-width]))
+    per_cell_hours = itertools.chain.from_iterable(itertools.repeat(h, width) for h in hours)
+    flat_rates = array("d", map(operator.truediv, flat_deltas, per_cell_hours))
+
+    rows = range(0, len(flat_deltas), width)
+    deltas = [flat_deltas[row : row + width] for row in rows]
+    rates = [flat_rates[row : row + width] for row in rows]
+    return hours, deltas, rates
+
+
+def snapshot_rates(snapshots, card_ids=RATE_CARD_IDS, use_numpy=False):
+    """
+    Per-card deltas and rates per hour between consecutive snapshots, computed
+    for the whole series at once.
+
+    Returns {"card_ids", "times", "hours", "deltas", "rates"}: hours has one
+    entry per interval; deltas and rates have one row per interval and one
+    column per card ID (NumPy 2-D arrays when use_numpy is set and NumPy is
+    installed, otherwise lists of float arrays).
+    """
+    card_ids = tuple(card_ids)
+    times, values = card_matrix(snapshots, card_ids)
+    return _rates_result(card_ids, times, values, use_numpy)
+
+
+def history_rates(history, card_ids=RATE_CARD_IDS, start=None, end=None, use_numpy=False):
+    """snapshot_rates() for the rows of a CardHistory between two Unix timestamps."""
+    card_ids = tuple(card_ids)
+    times = array("d")
+    columns = []
+    for card_id in card_ids:
+        times, column = history.query(card_id, start, end)
+        columns.append(column)
+
+    # The store is columnar; interleave the columns into rows
+    values = array("d", itertools.chain.from_iterable(zip(*columns)))
+    return _rates_result(card_ids, times, values, use_numpy)
+
+
+def _rates_result(card_ids, times, values, use_numpy):
+    if len(times) < 2 or not card_ids:
+        hours, deltas, rates = array("d"), [], []
+    else:
+        hours, deltas, rates = _diff(times, values, len(card_ids), use_numpy)
+    return {
+        "card_ids": card_ids,
+        "times": times,
+        "hours": hours,
+        "deltas": deltas,
+        "rates": rates,
+    }
+
+
+def growth_rates(result):
+    """
+    Average rate per hour of each card over a snapshot_rates() result:
+    {card_id: rate}. Intervals where a card is missing are left out of its
+    average; cards never seen in two consecutive snapshots are omitted.
+    """
+    deltas = result["deltas"]
+    if not isinstance(deltas, list):
+        # NumPy result - average all columns at once
+        np = _numpy()
+        seen = ~np.isnan(deltas)
+        totals = np.where(seen, deltas, 0.0).sum(axis=0)
+        elapsed = (seen * result["hours"][:, None]).sum(axis=0)
+        return {
+            card_id: total / hours
+            for card_id, total, hours in zip(result["card_ids"], totals.tolist(), elapsed.tolist())
+            if hours > 0
+        }
+
+    growth = {}
+    hours = list(result["hours"])
+    columns = [list(column) for column in zip(*deltas)]
+    for card_id, column in zip(result["card_ids"], columns):
+        total = elapsed = 0.0
+        for delta, interval in zip(column, hours):
+            if not math.isnan(delta):
+                total += delta
+                elapsed += interval
+        if elapsed > 0:
+            growth[card_id] = total / elapsed
+    return growth
+
+
+def recent_growth(history, window_hours=DEFAULT_GROWTH_WINDOW_HOURS, card_ids=RESOURCE_CARD_IDS):
+    """
+    growth_rates() over the last window_hours of a CardHistory (measured back
+    from its latest snapshot), or None if fewer than two snapshots fall in it.
+    """
+    if len(history) < 2:
+        return None
+    latest = history.latest(card_ids[0])[0]
+    growth = growth_rates(history_rates(history, card_ids, start=latest - window_hours * 3600))
+    return growth or None
@@ -0,0 +1,232 @@
+"""
+SQLite export for Adventure Communist save files
+Loads decoded cards, mission progress and experiment rankings of many saves into one database
+"""
+
+import argparse
+import functools
+import math
+import os
+import sqlite3
+import sys
+import time
+from batch_analyze import find_save_files
+from decode_cache import content_hash
+from decoder import decode_save_bytes
+from export_pipeline import (
+    NO_HEADER_ERROR,
+    add_corpus_arguments,
+    bounded_map,
+    error_message,
+    top_recommendations,
+)
+
+DEFAULT_DATABASE = "saves.db"
+# Saves written per transaction
+CHUNK_SAVES = 2000
+# Recommendations stored per save
+DEFAULT_TOP_N = 5
+
+# Child tables are clustered on (save_id, ...) - WITHOUT ROWID makes the
+# primary key the table itself, so there is no separate index to keep up
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    save_id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    scientists INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS cards (
+    save_id INTEGER NOT NULL REFERENCES saves,
+    card_id INTEGER NOT NULL,
+    value REAL NOT NULL,
+    flags INTEGER NOT NULL,
+    PRIMARY KEY (save_id, card_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS missions (
+    save_id INTEGER NOT NULL REFERENCES saves,
+    mission TEXT NOT NULL,
+    progress INTEGER NOT NULL,
+    PRIMARY KEY (save_id, mission)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rankings (
+    save_id INTEGER NOT NULL REFERENCES saves,
+    rank INTEGER NOT NULL,
+    experiment TEXT NOT NULL,
+    cost INTEGER NOT NULL,
+    roi_score REAL,
+    PRIMARY KEY (save_id, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS saves_timestamp ON saves (timestamp);
+"""
+
+# Content hashes already in the database, set in each worker process
+_imported = frozenset()
+
+
+def _init_worker(imported):
+    global _imported  # pylint: disable=global-statement
+    _imported = imported
+
+
+def connect(database):
+    """Open (and create if needed) an export database in WAL mode."""
+    connection = sqlite3.connect(database, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def save_rows(path, top_n=DEFAULT_TOP_N, horizon_hours=None):
+    """
+    Read, hash, decode and analyze one save (also the process pool entry point).
+    Returns (content hash, path, timestamp, scientists, error, cards, missions,
+    rankings), with row tuples lacking the save ID, or None if the save's hash
+    is already imported. Errors are returned, not raised. NaN and infinite
+    card values are left out.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+            timestamp = os.fstat(f.fileno()).st_mtime
+    except OSError as e:
+        return None, path, 0.0, None, error_message(e), (), (), ()
+
+    digest = content_hash(data)
+    if digest in _imported:
+        return None
+
+    try:
+        decoded_data = decode_save_bytes(data)
+        if not decoded_data:
+            return digest, path, timestamp, None, NO_HEADER_ERROR, (), (), ()
+        recommendations, scientists = top_recommendations(decoded_data, top_n, horizon_hours)
+    except Exception as e:  # pylint: disable=broad-except
+        return digest, path, timestamp, None, error_message(e), (), (), ()
+
+    cards = decoded_data["cards"]
+    return (
+        digest,
+        path,
+        timestamp,
+        scientists,
+        None,
+        tuple(row for row in zip(cards.ids, cards.values, cards.flags) if math.isfinite(row[1])),
+        tuple(decoded_data["mission_progress"].items()),
+        tuple(
+            (rank, rec["name"], rec["cost"], rec["roi_score"])
+            for rank, rec in enumerate(recommendations, 1)
+        ),
+    )
+
+
+def _write_chunk(connection, chunk, next_id):
+    """Insert a chunk of save_rows() results in one transaction. Returns the next free save ID."""
+    saves, cards, missions, rankings = [], [], [], []
+    for result in chunk:
+        save_id = next_id
+        next_id += 1
+        saves.append((save_id,) + result[:5])
+        card_rows, mission_rows, ranking_rows = result[5:]
+        cards.extend((save_id,) + row for row in card_rows)
+        missions.extend((save_id,) + row for row in mission_rows)
+        rankings.extend((save_id,) + row for row in ranking_rows)
+
+    connection.execute("BEGIN")
+    try:
+        connection.executemany("INSERT INTO saves VALUES (?, ?, ?, ?, ?, ?)", saves)
+        connection.executemany("INSERT INTO cards VALUES (?, ?, ?, ?)", cards)
+        connection.executemany("INSERT INTO missions VALUES (?, ?, ?)", missions)
+        connection.executemany("INSERT INTO rankings VALUES (?, ?, ?, ?, ?)", rankings)
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+    return next_id
+
+
+def export_saves(
+    connection,
+    paths,
+    workers=1,
+    top_n=DEFAULT_TOP_N,
+    horizon_hours=None,
+    chunk_saves=CHUNK_SAVES,
+):
+    """
+    Decode, analyze and insert every save in paths that isn't in the database
+    yet (by content hash), CHUNK_SAVES per transaction.
+    Returns {"imported", "skipped", "failed"} counts.
+    """
+    imported = frozenset(row[0] for row in connection.execute("SELECT content_hash FROM saves"))
+    next_id = connection.execute("SELECT COALESCE(MAX(save_id), 0) + 1 FROM saves").fetchone()[0]
+
+    worker = functools.partial(save_rows, top_n=top_n, horizon_hours=horizon_hours)
+    if workers == 1:
+        _init_worker(imported)
+        results = map(worker, paths)
+    else:
+        results = bounded_map(worker, paths, workers, _init_worker, (imported,))
+
+    counts = {"imported": 0, "skipped": 0, "failed": 0}
+    seen = set()  # hashes added by this run - copies of one save are stored once
+    chunk = []
+    for result in results:
+        if result is None or result[0] in seen:
+            counts["skipped"] += 1
+            continue
+        if result[0] is None:
+            counts["failed"] += 1  # Unreadable - nothing to key it by
+            continue
+
+        seen.add(result[0])
+        counts["failed" if result[4] else "imported"] += 1
+        chunk.append(result)
+        if len(chunk) >= chunk_saves:
+            next_id = _write_chunk(connection, chunk, next_id)
+            chunk = []
+
+    if chunk:
+        _write_chunk(connection, chunk, next_id)
+    return counts
+
+
+def main():
+    """Main entry point for the SQLite export."""
+    parser = argparse.ArgumentParser(
+        description="Load decoded cards, missions and experiment rankings of saves into SQLite."
+    )
+    add_corpus_arguments(parser)
+    parser.add_argument(
+        "--database", default=DEFAULT_DATABASE, help="SQLite database (default: saves.db)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=DEFAULT_TOP_N, help="Recommendations stored per save"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    connection = connect(args.database)
+    try:
+        counts = export_saves(
+            connection,
+            find_save_files(args.root, args.pattern),
+            workers=args.workers,
+            top_n=args.top,
+            horizon_hours=args.horizon,
+        )
+    finally:
+        connection.close()
+
+    print(
+        f"Imported {counts['imported']:,} saves, skipped {counts['skipped']:,} already "
+        f"imported, {counts['failed']:,} failed ({time.perf_counter() - start:.1f} s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
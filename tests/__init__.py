@@ -0,0 +1 @@
+"""Tests for the Adventure Communist save tools"""
@@ -0,0 +1,116 @@
+"""
+Tests for the analysis service
+Covers horizon and body validation and the saves directory restriction over real HTTP
+"""
+
+import http.client
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from analysis_server import AnalysisServer, AnalysisService, ServiceError, _parse_horizon
+from save_generator import write_save
+
+
+class ParseHorizonTest(unittest.TestCase):
+    """_parse_horizon() only accepts finite positive hours."""
+
+    def test_valid(self):
+        """Missing horizons are None; numbers become floats."""
+        self.assertIsNone(_parse_horizon(None))
+        self.assertIsNone(_parse_horizon(""))
+        self.assertEqual(_parse_horizon("48"), 48.0)
+        self.assertEqual(_parse_horizon(2), 2.0)
+
+    def test_invalid(self):
+        """Zero, negative, non-finite and non-numeric horizons are 400s."""
+        for value in ("0", "-1", "nan", "inf", "-inf", "soon", [1]):
+            with self.subTest(value=value), self.assertRaises(ServiceError) as raised:
+                _parse_horizon(value)
+            self.assertEqual(raised.exception.status, 400)
+
+
+class AnalysisServerTest(unittest.TestCase):
+    """Requests against a server on an ephemeral port."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.saves_dir = os.path.join(self.directory, "saves")
+        os.makedirs(self.saves_dir)
+        self.save_path = write_save(os.path.join(self.saves_dir, "game.sav"))
+        self.outside_path = write_save(os.path.join(self.directory, "other.sav"))
+
+        self.service = AnalysisService(workers=2, saves_dir=self.saves_dir)
+        self.server = AnalysisServer(("127.0.0.1", 0), self.service)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.shutdown()
+        shutil.rmtree(self.directory)
+
+    def request(self, method, url, body=None, headers=None):
+        """Send one request; returns (status, decoded JSON)."""
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port, timeout=5)
+        try:
+            connection.request(method, url, body=body, headers=headers or {})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def test_analyze_path_inside_saves_dir(self):
+        """Relative and absolute paths inside the saves directory are analyzed."""
+        for path in ("game.sav", self.save_path):
+            with self.subTest(path=path):
+                status, payload = self.request("GET", f"/analyze?path={path}")
+                self.assertEqual(status, 200)
+                self.assertIn("recommendations", payload)
+
+    def test_path_outside_saves_dir_is_forbidden(self):
+        """Absolute paths and ../ escapes outside the saves directory get 403."""
+        for path in (self.outside_path, "../other.sav"):
+            with self.subTest(path=path):
+                status, _ = self.request("GET", f"/analyze?path={path}")
+                self.assertEqual(status, 403)
+
+        body = json.dumps({"path": self.outside_path})
+        status, _ = self.request(
+            "POST", "/analyze", body, {"Content-Type": "application/json"}
+        )
+        self.assertEqual(status, 403)
+
+    def test_path_requests_disabled_without_saves_dir(self):
+        """Without a saves directory, path requests are refused."""
+        self.service.saves_dir = None
+        status, _ = self.request("GET", "/analyze?path=game.sav")
+        self.assertEqual(status, 403)
+
+    def test_non_finite_horizon(self):
+        """A NaN horizon is a 400, not NaN in the response."""
+        status, payload = self.request("GET", "/analyze?path=game.sav&horizon=nan")
+        self.assertEqual(status, 400)
+        self.assertIn("horizon", payload["error"])
+
+    def test_negative_content_length(self):
+        """A negative Content-Length is rejected instead of blocking the handler."""
+        status, _ = self.request("POST", "/analyze", headers={"Content-Length": "-1"})
+        self.assertEqual(status, 400)
+
+    def test_post_save_bytes(self):
+        """Raw save bytes are analyzed without a saves directory."""
+        self.service.saves_dir = None
+        with open(self.save_path, "rb") as f:
+            status, payload = self.request("POST", "/analyze", f.read())
+        self.assertEqual(status, 200)
+        self.assertIn("scientists", payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for batch analysis
+Covers file discovery, per-file failures and the process pool
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from batch_analyze import analyze_save_file, batch_analyze, find_save_files
+from save_generator import generate_corpus
+
+
+class BatchAnalyzeTest(unittest.TestCase):
+    """batch_analyze() analyzes every save and collects failures."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = generate_corpus(os.path.join(self.directory, "a"), 3)
+        self.paths += generate_corpus(os.path.join(self.directory, "b"), 2, seed=1)
+        self.broken = os.path.join(self.directory, "broken.sav")
+        with open(self.broken, "wb") as f:
+            f.write(b"not a save")
+        with open(os.path.join(self.directory, "notes.txt"), "w", encoding="utf-8") as f:
+            f.write("ignored")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_find_save_files(self):
+        """Matching files come in a stable order: a directory's files, then its subdirectories."""
+        found = list(find_save_files(self.directory))
+        self.assertEqual(found, [self.broken] + sorted(self.paths))
+        self.assertEqual(list(find_save_files(self.broken)), [self.broken])
+
+    def test_failures_are_collected(self):
+        """One bad save is reported without stopping the run."""
+        result = batch_analyze(find_save_files(self.directory), workers=1, profile=True)
+        self.assertEqual(len(result["results"]), 5)
+        self.assertEqual(result["failures"], [(self.broken, "ValueError: No ADCM header found")])
+        self.assertEqual(len(result["profiles"]), 6)
+
+    def test_process_pool_matches_serial(self):
+        """Worker processes return the same results in the same order."""
+        serial = batch_analyze(self.paths, workers=1)
+        parallel = batch_analyze(self.paths, workers=2, chunksize=2)
+        self.assertEqual(
+            [(r["path"], r["scientists"]) for r in parallel["results"]],
+            [(r["path"], r["scientists"]) for r in serial["results"]],
+        )
+
+    def test_summary_unless_full(self):
+        """Results only carry the summary fields unless the full payload is asked for."""
+        result = batch_analyze(self.paths[:1], workers=1)["results"][0]
+        self.assertEqual(set(result), {"path", "scientists", "top"})
+        full = analyze_save_file(self.paths[0], full=True)
+        self.assertEqual(full["top"], full["recommendations"][0]["name"])
+        self.assertEqual(full["scientists"], full["decoded"]["cards"].value(36))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for the columnar card history
+Covers appends, range queries, missing cards and recovery from a torn append
+"""
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from card_history import CardHistory
+
+
+class CardHistoryTest(unittest.TestCase):
+    """CardHistory stores one row per snapshot and one file per card."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_append_and_query(self):
+        """Rows come back in time order; queries are inclusive ranges."""
+        with CardHistory(self.directory) as history:
+            for hour in range(5):
+                self.assertEqual(history.append({36: 100 + hour}, timestamp=hour * 3600), hour)
+            times, values = history.query(36, start=3600, end=3 * 3600)
+            self.assertEqual(list(times), [3600, 7200, 10800])
+            self.assertEqual(list(values), [101, 102, 103])
+            self.assertEqual(history.latest(36), (4 * 3600, 104))
+            self.assertEqual(list(history.since(36, 3600, now=4 * 3600)[1]), [103, 104])
+
+    def test_rejects_rows_not_later(self):
+        """A snapshot no later than the last row is not appended."""
+        with CardHistory(self.directory) as history:
+            history.append({36: 1}, timestamp=10)
+            self.assertIsNone(history.append({36: 2}, timestamp=10))
+            self.assertIsNone(history.append({36: 2}, timestamp=5))
+            self.assertEqual(len(history), 1)
+
+    def test_missing_cards_are_nan(self):
+        """Cards absent from a snapshot, or added later, read as NaN."""
+        with CardHistory(self.directory) as history:
+            history.append({1: 5.0}, timestamp=1)
+            history.append({1: 6.0, 2: 7.0}, timestamp=2)
+            history.append({2: 8.0}, timestamp=3)
+            self.assertEqual(history.card_ids(), [1, 2])
+            _, first = history.query(1)
+            _, second = history.query(2)
+            _, unknown = history.query(99)
+        self.assertEqual(first[:2].tolist(), [5.0, 6.0])
+        self.assertTrue(math.isnan(first[2]))
+        self.assertTrue(math.isnan(second[0]))
+        self.assertEqual(second[1:].tolist(), [7.0, 8.0])
+        self.assertTrue(all(math.isnan(value) for value in unknown))
+
+    def test_reopen_and_torn_append(self):
+        """Rows persist, and a card value written without its timestamp is dropped."""
+        with CardHistory(self.directory) as history:
+            history.append({36: 1.0}, timestamp=1)
+            history.append({36: 2.0}, timestamp=2)
+        # A crash after the card column but before the timestamp column
+        with open(os.path.join(self.directory, "card_36.f64"), "ab") as f:
+            f.write(b"\x00" * 8)
+
+        with CardHistory(self.directory) as history:
+            self.assertEqual(len(history), 2)
+            history.append({36: 3.0}, timestamp=3)
+            times, values = history.query(36)
+        self.assertEqual(times.tolist(), [1, 2, 3])
+        self.assertEqual(values.tolist(), [1.0, 2.0, 3.0])
+
+    def test_torn_tail(self):
+        """A partial cell left by an interrupted write is cut off in every column."""
+        with CardHistory(self.directory) as history:
+            history.append({36: 1.0}, timestamp=1)
+            history.append({36: 2.0}, timestamp=2)
+        for column in ("timestamp.f64", "card_36.f64"):
+            with open(os.path.join(self.directory, column), "ab") as f:
+                f.write(b"\x01\x02\x03")
+
+        with CardHistory(self.directory) as history:
+            self.assertEqual(len(history), 2)
+            history.append({36: 3.0}, timestamp=3)
+        with CardHistory(self.directory) as history:
+            times, values = history.query(36)
+        self.assertEqual(times.tolist(), [1, 2, 3])
+        self.assertEqual(values.tolist(), [1.0, 2.0, 3.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for the decode cache
+Covers stat and content-hash hits, change detection, eviction and the disk store
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import profiler
+from decode_cache import DecodeCache
+from save_generator import build_save, write_save
+
+
+class DecodeCacheTest(unittest.TestCase):
+    """DecodeCache only decodes saves it hasn't seen."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = write_save(os.path.join(self.directory, "game.sav"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_unchanged_file_is_a_hit(self):
+        """The second get() returns the same object without decoding."""
+        cache = DecodeCache()
+        first = cache.get(self.path)
+        self.assertIs(cache.get(self.path), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_changed_file_is_decoded(self):
+        """A rewritten save is decoded again, even at the same size."""
+        cache = DecodeCache()
+        cache.get(self.path)
+        write_save(self.path, scientists=999)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(cache.get(self.path)["cards"].value(36), 999)
+        self.assertEqual(cache.misses, 2)
+
+    def test_copies_share_an_entry(self):
+        """A copy of a cached save is matched by content hash."""
+        cache = DecodeCache()
+        first = cache.get(self.path)
+        copy = os.path.join(self.directory, "copy.sav")
+        shutil.copyfile(self.path, copy)
+        self.assertIs(cache.get(copy), first)
+        self.assertIs(cache.get_bytes(build_save()), first)
+        self.assertEqual(cache.misses, 1)
+
+    def test_memory_lru_bound(self):
+        """At most max_entries saves stay in memory, least recently used go first."""
+        cache = DecodeCache(max_entries=2)
+        saves = [build_save(scientists=i) for i in range(3)]
+        for data in saves:
+            cache.get_bytes(data)
+        cache.get_bytes(saves[2])
+        cache.get_bytes(saves[0])
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def test_disk_store(self):
+        """A new cache with the same directory loads instead of decoding."""
+        cache_dir = os.path.join(self.directory, "cache")
+        expected = repr(DecodeCache(cache_dir=cache_dir).get(self.path))
+        cache = DecodeCache(cache_dir=cache_dir)
+        self.assertEqual(repr(cache.get(self.path)), expected)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_disk_store_bound(self):
+        """The disk store keeps at most max_disk_entries pickles."""
+        cache_dir = os.path.join(self.directory, "cache")
+        cache = DecodeCache(cache_dir=cache_dir, max_disk_entries=2)
+        for scientists in range(4):
+            cache.get_bytes(build_save(scientists=scientists))
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_not_a_save(self):
+        """Undecodable data is returned as is and not cached."""
+        cache = DecodeCache()
+        self.assertIsNone(cache.get_bytes(b"\x00" * 32))
+        self.assertIsNone(cache.get_bytes(b"\x00" * 32))
+        self.assertEqual(cache.misses, 2)
+
+    def test_file_without_header(self):
+        """A file without the ADCM header is rejected after reading its first 8 bytes."""
+        path = os.path.join(self.directory, "notes.sav")
+        with open(path, "wb") as f:
+            f.write(b"\x00" * 4096)
+        profile = profiler.Profile()
+        with profiler.profiling(profile):
+            self.assertIsNone(DecodeCache().get(path))
+        self.assertEqual(profile.counters, {"bytes_read": 8})
+
+
+if __name__ == "__main__":
+    unittest.main()
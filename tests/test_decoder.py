@@ -0,0 +1,203 @@
+"""
+Tests for the save decoder
+Covers CardTable, card parsing, FlatBuffer walk, scan fallback, input sources and mission index
+"""
+
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+import profiler
+from decoder import (
+    CARD_RECORD,
+    MAX_CARD_ID,
+    CardTable,
+    _numpy,
+    decode_adventure_communist_save,
+    decode_save_buffer,
+    decode_save_bytes,
+    find_card_vector,
+    index_keywords,
+    iter_archive_saves,
+    parse_card_table,
+    parse_mission_progress,
+)
+from save_generator import build_save, write_save
+
+
+class CardTableTest(unittest.TestCase):
+    """CardTable reads like the old dict of card dicts."""
+
+    def test_mapping(self):
+        """Lookups, membership, order and values."""
+        cards = CardTable.from_entries([(3, 1, 30.0), (2, 0, 20.0), (200, 0, 1.0)])
+        self.assertEqual(list(cards), [3, 2, 200])
+        self.assertEqual(cards[3], {"id": 3, "value": 30.0, "flags": 1})
+        self.assertEqual(cards.get(36, {}).get("value", 0), 0)
+        self.assertIn(200, cards)
+        self.assertNotIn(1, cards)
+        self.assertNotIn("3", cards)
+        self.assertEqual(cards.value(2), 20.0)
+        self.assertIsNone(cards.value(99, None))
+        with self.assertRaises(KeyError):
+            cards[-1]  # pylint: disable=pointless-statement
+
+    def test_later_duplicates_win(self):
+        """A repeated card ID keeps its first position and its last value."""
+        cards = CardTable.from_entries([(5, 0, 1.0), (4, 0, 2.0), (5, 7, 3.0)])
+        self.assertEqual(list(cards), [5, 4])
+        self.assertEqual(cards[5], {"id": 5, "value": 3.0, "flags": 7})
+
+
+class ParseCardTableTest(unittest.TestCase):
+    """parse_card_table() reads records until the first invalid ID."""
+
+    def setUp(self):
+        records = [(3, 0, 1.5), (2, 1, 2.5), (1, 0, 3.5), (MAX_CARD_ID + 1, 0, 0.0), (9, 0, 9.0)]
+        self.data = b"pad" + b"".join(CARD_RECORD.pack(*record) for record in records)
+
+    def test_stops_at_invalid_id(self):
+        """Entries after an ID above MAX_CARD_ID are ignored."""
+        cards = parse_card_table(self.data, 3)
+        self.assertEqual(dict(zip(cards.ids, cards.values)), {3: 1.5, 2: 2.5, 1: 3.5})
+
+    def test_max_entries_and_truncated_data(self):
+        """max_entries and the end of the data both bound the table."""
+        self.assertEqual(list(parse_card_table(self.data, 3, max_entries=2)), [3, 2])
+        self.assertEqual(list(parse_card_table(self.data[:3 + 20], 3)), [3])
+
+    @unittest.skipIf(_numpy() is None, "NumPy is not installed")
+    def test_numpy_matches_struct(self):
+        """The NumPy path gives the same table."""
+        self.assertEqual(
+            repr(parse_card_table(self.data, 3, use_numpy=True)),
+            repr(parse_card_table(self.data, 3)),
+        )
+
+
+class DecodeSaveBytesTest(unittest.TestCase):
+    """Cards are found by walking the FlatBuffer, or by scanning as a fallback."""
+
+    def test_flatbuffer_walk(self):
+        """The walk finds cards anywhere, including outside the scan window."""
+        for offset in (0x14A8, 0x900, 0x8000):
+            with self.subTest(offset=hex(offset)):
+                data = build_save(card_offset=offset)
+                self.assertEqual(find_card_vector(data), (offset, 39))
+                cards = decode_save_bytes(data)["cards"]
+                self.assertEqual(list(cards), list(range(39, 0, -1)))
+                self.assertEqual(cards.value(36), 105)
+
+    def test_scan_fallback(self):
+        """Without the root table pointer, only cards in the scan window are found."""
+        data = build_save(flatbuffer=False)
+        self.assertIsNone(find_card_vector(data))
+        self.assertEqual(decode_save_bytes(data)["cards"].value(36), 105)
+        outside = decode_save_bytes(build_save(card_offset=0x8000, flatbuffer=False))
+        self.assertEqual(len(outside["cards"]), 0)
+
+    def test_not_a_save(self):
+        """Data without the ADCM magic is rejected."""
+        self.assertIsNone(decode_save_bytes(b"\x00" * 64))
+
+
+class SourcesTest(unittest.TestCase):
+    """Files, buffers and archives decode to the same result."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data = build_save(seed=3)
+        self.path = write_save(os.path.join(self.directory, "game.sav"), seed=3)
+        self.expected = repr(decode_save_bytes(self.data))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_file(self):
+        """Memory-mapped and fully read files decode alike; other files are rejected."""
+        self.assertEqual(repr(decode_adventure_communist_save(self.path)), self.expected)
+        self.assertEqual(
+            repr(decode_adventure_communist_save(self.path, use_mmap=False)), self.expected
+        )
+        short = os.path.join(self.directory, "short.sav")
+        with open(short, "wb") as f:
+            f.write(b"ADCM")
+        self.assertIsNone(decode_adventure_communist_save(short))
+
+    def test_mapped_bytes_are_not_counted_as_read(self):
+        """A memory-mapped file is counted as mapped, a fully read one as read."""
+        size = len(self.data)
+        for use_mmap, counter in ((True, "bytes_mapped"), (False, "bytes_read")):
+            profile = profiler.Profile()
+            with profiler.profiling(profile):
+                decode_adventure_communist_save(self.path, use_mmap=use_mmap)
+            self.assertEqual(profile.counters[counter], size)
+            self.assertEqual(len({"bytes_mapped", "bytes_read"} & set(profile.counters)), 1)
+
+    def test_buffers(self):
+        """bytearray, memoryview and file-like objects are accepted."""
+        for source in (bytearray(self.data), memoryview(self.data), io.BytesIO(self.data)):
+            with self.subTest(source=type(source).__name__):
+                self.assertEqual(repr(decode_save_buffer(source)), self.expected)
+
+    def test_archives(self):
+        """Saves inside zip and tar archives are decoded without extracting them."""
+        zip_path = os.path.join(self.directory, "saves.zip")
+        with zipfile.ZipFile(zip_path, "w") as archive:
+            archive.write(self.path, "old/game.sav")
+            archive.writestr("notes.txt", "not a save")
+            archive.writestr("broken.sav", b"nope")
+        tar_path = os.path.join(self.directory, "saves.tar.gz")
+        with tarfile.open(tar_path, "w:gz") as archive:
+            archive.add(self.path, "old/game.sav")
+
+        for path in (zip_path, tar_path):
+            with self.subTest(archive=os.path.basename(path)):
+                saves = dict(iter_archive_saves(path))
+                self.assertEqual(repr(saves.pop("old/game.sav")), self.expected)
+                self.assertEqual(saves, {"broken.sav": None} if path == zip_path else {})
+
+
+class MissionIndexTest(unittest.TestCase):
+    """index_keywords() finds the first offset of every keyword in one pass."""
+
+    def test_overlapping_keywords(self):
+        """Keywords that overlap or are prefixes of each other are all found."""
+        data = b"xxOreLand--Ore..Landmark"
+        self.assertEqual(
+            index_keywords(data, (b"Ore", b"Land", b"Landmark", b"Missing")),
+            {b"Ore": 2, b"Land": 5, b"Landmark": 16},
+        )
+        self.assertEqual(
+            index_keywords(b"Landmark..Land", (b"Land", b"Landmark")),
+            {b"Land": 0, b"Landmark": 0},
+        )
+
+    def test_no_keywords(self):
+        """An empty keyword list (or empty keywords) finds nothing."""
+        data = build_save()
+        self.assertEqual(index_keywords(data, ()), {})
+        self.assertEqual(index_keywords(data, (b"",)), {})
+        self.assertEqual(index_keywords(data, (b"", b"Medals")), {b"Medals": data.find(b"Medals")})
+        self.assertEqual(parse_mission_progress(data, ()), {})
+
+    def test_matches_find(self):
+        """Every offset equals what bytes.find() gives for that keyword."""
+        data = build_save()
+        keywords = (b"Potatoes", b"Potatoes.Intro", b"Intro", b"Missions", b"Medals")
+        index = index_keywords(data, keywords)
+        self.assertEqual(index, {keyword: data.find(keyword) for keyword in keywords})
+
+    def test_mission_progress(self):
+        """Each tracked mission string gets the value stored after it."""
+        missions = parse_mission_progress(build_save())
+        self.assertEqual(missions["Medals"], 140)
+        self.assertEqual(missions["Potatoes.Intro"], 7)
+        self.assertEqual(missions["Land.Missions"], 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Tests for the experiment catalog
+Covers loading JSON and CSV, the indexes and replacing experiments
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from experiment_catalog import (
+    DEFAULT_CATALOG_PATH,
+    ExperimentCatalog,
+    experiment_from_row,
+    format_effect,
+)
+
+ROW = {
+    "name": "Test Button",
+    "cost": "40",
+    "type": "INDUSTRY",
+    "boost": "Potato",
+    "multiplier": "5",
+    "kind": "multiplier",
+    "effect": "5",
+    "duration_seconds": "",
+    "priority": "3",
+    "description": "Test",
+}
+
+
+class ExperimentCatalogTest(unittest.TestCase):
+    """ExperimentCatalog keeps its indexes in step with its records."""
+
+    def setUp(self):
+        self.catalog = ExperimentCatalog.from_file(DEFAULT_CATALOG_PATH)
+
+    def test_dict_layout(self):
+        """catalog[name] is the dict the ROI code reads."""
+        name = next(iter(self.catalog))
+        data = self.catalog[name]
+        self.assertEqual(data["cost"], self.catalog.record(name).cost)
+        self.assertIn("duration_hours", data)
+        self.assertNotIn("name", data)
+
+    def test_indexes_match_scans(self):
+        """Type, boost and cost lookups give what scanning every record would."""
+        records = self.catalog.records()
+        self.assertEqual(self.catalog.types()[:3], ["INDUSTRY", "STATE", "TRIALS"])
+        for exp_type in self.catalog.types():
+            self.assertEqual(
+                self.catalog.by_type(exp_type), [r for r in records if r.type == exp_type]
+            )
+        self.assertEqual(
+            self.catalog.by_boost("Potato"), [r for r in records if r.boost == "Potato"]
+        )
+        for scientists in (0, 25, 100, 10**6):
+            self.assertEqual(
+                sorted(r.name for r in self.catalog.affordable(scientists)),
+                sorted(r.name for r in records if r.cost <= scientists),
+            )
+        self.assertEqual(self.catalog.costs(), sorted({r.cost for r in records}))
+
+    def test_replace_and_remove(self):
+        """Adding an existing name replaces it in every index."""
+        size = len(self.catalog)
+        experiment = experiment_from_row(ROW)
+        self.catalog.add(experiment)
+        self.catalog.add(experiment._replace(cost=10**7, boost="Ore"))
+        self.assertEqual(len(self.catalog), size + 1)
+        self.assertNotIn("Test Button", [r.name for r in self.catalog.by_boost("Potato")])
+        self.assertNotIn("Test Button", [r.name for r in self.catalog.affordable(10**6)])
+        self.catalog.remove("Test Button")
+        self.assertNotIn("Test Button", self.catalog)
+        self.assertEqual(len(self.catalog), size)
+
+
+class ReadExperimentsTest(unittest.TestCase):
+    """Rows from JSON and CSV become the same records."""
+
+    def test_csv_row(self):
+        """CSV strings are converted; blank durations mean permanent."""
+        experiment = experiment_from_row(ROW)
+        self.assertEqual((experiment.cost, experiment.multiplier, experiment.effect), (40, 5, 5.0))
+        self.assertIsNone(experiment.duration_hours)
+        self.assertEqual(format_effect(experiment.as_dict()), "x5")
+        timed = experiment_from_row(dict(ROW, duration_seconds="7200"))
+        self.assertEqual(timed.duration_hours, 2.0)
+
+    def test_unknown_kind(self):
+        """An unknown effect kind is rejected."""
+        with self.assertRaises(ValueError):
+            experiment_from_row(dict(ROW, kind="magic"))
+
+    def test_load_csv(self):
+        """load() adds experiments from a CSV file."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "extra.csv")
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=list(ROW))
+                writer.writeheader()
+                writer.writerow(ROW)
+            catalog = ExperimentCatalog()
+            catalog.load(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(list(catalog), ["Test Button"])
+        self.assertEqual(catalog["Test Button"]["priority"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Tests for the precomputed ROI table
+Checks the table lookups against ranking the experiments directly
+"""
+
+import unittest
+from experiments_roi import EXPERIMENTS, calculate_experiment_roi, get_roi_recommendations
+
+
+class RoiTableTest(unittest.TestCase):
+    """get_roi_recommendations() matches ranking the affordable experiments directly."""
+
+    def test_matches_direct_ranking(self):
+        """Every Scientists count gets the same ranking as computing it from scratch."""
+        researched = ["Best-est Potato Button"]
+        for scientists in (0, 24, 25, 60, 61, 150, 1000, 10**6):
+            with self.subTest(scientists=scientists):
+                expected = [
+                    calculate_experiment_roi(name, data, scientists, {})
+                    for name, data in EXPERIMENTS.items()
+                    if name not in researched
+                ]
+                expected = [roi for roi in expected if roi is not None]
+                recommendations = get_roi_recommendations(scientists, researched)
+                self.assertEqual(
+                    sorted(rec["name"] for rec in recommendations),
+                    sorted(roi["name"] for roi in expected),
+                )
+                scores = [rec["roi_score"] for rec in recommendations]
+                self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
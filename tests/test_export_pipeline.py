@@ -0,0 +1,125 @@
+"""
+Tests for the streaming export pipeline
+Covers record building, NDJSON and CSV output and closed-pipe handling
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from decoder import decode_save_bytes
+from export_pipeline import build_record, csv_columns, stream_records, write_csv, write_ndjson
+from save_generator import build_save, generate_corpus, write_save
+
+EXPORT_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "export_pipeline.py")
+
+
+class BuildRecordTest(unittest.TestCase):
+    """build_record() keeps only the selected fields."""
+
+    def setUp(self):
+        self.decoded = decode_save_bytes(build_save(card_count=20, scientists=250))
+
+    def test_missing_cards_are_none(self):
+        """Cards not in the save are None, not 0."""
+        record = build_record(
+            "a.sav", self.decoded, fields=("scientists", "comrades", "cards"), card_ids=[1, 99]
+        )
+        self.assertEqual(record["cards"][1], self.decoded["cards"].value(1))
+        self.assertIsNone(record["cards"][99])
+        # 20 cards stop before Scientists (36) and Comrades (38)
+        self.assertIsNone(record["scientists"])
+        self.assertIsNone(record["comrades"])
+
+    def test_non_finite_values_are_none(self):
+        """NaN and infinite values become None, so NDJSON stays valid JSON."""
+        for value in (float("nan"), float("inf")):
+            decoded = decode_save_bytes(build_save(scientists=value))
+            record = build_record("a.sav", decoded, fields=("scientists", "cards"))
+            self.assertIsNone(record["scientists"])
+            self.assertIsNone(record["cards"][36])
+            out = io.StringIO()
+            write_ndjson([record], out)
+            json.loads(out.getvalue(), parse_constant=self.fail)
+
+    def test_selected_fields_only(self):
+        """Only the requested fields appear, with top limited to top_n."""
+        decoded = decode_save_bytes(build_save())
+        record = build_record("a.sav", decoded, fields=("path", "scientists", "top"), top_n=2)
+        self.assertEqual(set(record), {"path", "scientists", "top"})
+        self.assertEqual(record["scientists"], decoded["cards"].value(36))
+        self.assertEqual(len(record["top"]), 2)
+
+
+class StreamRecordsTest(unittest.TestCase):
+    """stream_records() and the writers over a small corpus."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = generate_corpus(self.directory, 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_ndjson(self):
+        """One JSON line per save, in path order, with unreadable saves as errors."""
+        out = io.StringIO()
+        paths = self.paths + [os.path.join(self.directory, "missing.sav")]
+        self.assertEqual(write_ndjson(stream_records(paths), out), 4)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([record["path"] for record in records], paths)
+        self.assertIn("error", records[-1])
+
+    def test_failed_analysis_is_an_error_record(self):
+        """A save that breaks the analysis yields an error record; the stream goes on."""
+        bad = write_save(os.path.join(self.directory, "inf.sav"), scientists=float("inf"))
+        paths = [self.paths[0], bad, self.paths[1]]
+        records = list(stream_records(paths))
+        self.assertEqual([record["path"] for record in records], paths)
+        self.assertIn("OverflowError", records[1]["error"])
+        self.assertNotIn("error", records[2])
+
+    def test_csv_leaves_missing_cards_empty(self):
+        """Missing cards are empty CSV cells."""
+        out = io.StringIO()
+        fields = ("path", "cards")
+        records = stream_records(self.paths, fields=fields, card_ids=[36, 99])
+        write_csv(records, out, csv_columns(fields, [36, 99]))
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["card_99"], "")
+        self.assertNotEqual(rows[0]["card_36"], "")
+
+
+class ClosedPipeTest(unittest.TestCase):
+    """The CLI stops quietly when its reader goes away."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # Enough output to overflow the pipe buffer
+        generate_corpus(self.directory, 200)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_no_traceback(self):
+        """Closing stdout early doesn't print a BrokenPipeError traceback."""
+        with subprocess.Popen(
+            [sys.executable, EXPORT_SCRIPT, self.directory],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ) as process:
+            process.stdout.readline()
+            process.stdout.close()
+            stderr = process.stderr.read().decode("utf-8", "replace")
+        self.assertNotIn("Traceback", stderr)
+        self.assertNotIn("BrokenPipeError", stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for growth forecasting
+Covers the incremental fit, piece breaks and ETAs
+"""
+
+import math
+import shutil
+import tempfile
+import unittest
+from card_history import CardHistory
+from growth_forecast import SCIENTISTS_CARD_ID, GrowthModel, experiment_etas
+
+# Scientists grow tenfold every 10 hours; Potatoes double every hour
+SNAPSHOTS = [
+    (hour * 3600.0, {SCIENTISTS_CARD_ID: 10 ** (1 + hour / 10), 1: 2.0**hour})
+    for hour in range(12)
+]
+
+
+class GrowthModelTest(unittest.TestCase):
+    """GrowthModel fits log-linear growth incrementally."""
+
+    def test_recovers_exponential_rate(self):
+        """The fitted slope and doubling time match the generated growth."""
+        model = GrowthModel()
+        self.assertEqual(model.extend(SNAPSHOTS), len(SNAPSHOTS))
+        scientists = model.growth(SCIENTISTS_CARD_ID)
+        self.assertAlmostEqual(scientists["log10_per_hour"], 0.1)
+        self.assertAlmostEqual(model.growth(1)["doubling_hours"], 1.0)
+        self.assertEqual(scientists["points"], len(SNAPSHOTS))
+        self.assertIsNone(model.growth(2))  # Never seen
+
+    def test_incremental_matches_batch(self):
+        """One snapshot at a time, in chunks or from a history gives the same fit."""
+        batch = GrowthModel()
+        batch.extend(SNAPSHOTS)
+
+        single = GrowthModel()
+        for timestamp, cards in SNAPSHOTS:
+            self.assertTrue(single.update(timestamp, cards))
+        chunked = GrowthModel()
+        chunked.extend(SNAPSHOTS[:5])
+        chunked.extend(SNAPSHOTS[5:])
+
+        directory = tempfile.mkdtemp()
+        try:
+            with CardHistory(directory) as history:
+                for timestamp, cards in SNAPSHOTS:
+                    history.append(cards, timestamp)
+                from_history = GrowthModel.from_history(history)
+        finally:
+            shutil.rmtree(directory)
+
+        for model in (single, chunked, from_history):
+            self.assertEqual(model.snapshots, batch.snapshots)
+            for card_id in (SCIENTISTS_CARD_ID, 1):
+                for key, value in batch.growth(card_id).items():
+                    self.assertAlmostEqual(model.growth(card_id)[key], value)
+
+    def test_old_snapshots_ignored(self):
+        """Snapshots not later than the latest one are not added."""
+        model = GrowthModel()
+        model.extend(SNAPSHOTS)
+        self.assertFalse(model.update(SNAPSHOTS[3][0], SNAPSHOTS[3][1]))
+        self.assertEqual(model.snapshots, len(SNAPSHOTS))
+
+    def test_drop_starts_new_piece(self):
+        """Spending Scientists starts a new piece; while short, the old slope is used."""
+        model = GrowthModel(card_ids=(SCIENTISTS_CARD_ID,))
+        model.extend(SNAPSHOTS)
+        spent_at = SNAPSHOTS[-1][0] + 3600
+        model.update(spent_at, {SCIENTISTS_CARD_ID: 5.0})
+        growth = model.growth(SCIENTISTS_CARD_ID)
+        self.assertEqual(growth["piece_start"], spent_at)
+        self.assertEqual(growth["points"], 1)
+        self.assertAlmostEqual(growth["log10_per_hour"], 0.1)
+
+        # Once the new piece has enough points its own slope takes over
+        for hour in range(1, 4):
+            model.update(spent_at + hour * 3600, {SCIENTISTS_CARD_ID: 5.0 * 100**hour})
+        self.assertAlmostEqual(model.growth(SCIENTISTS_CARD_ID)["log10_per_hour"], 2.0)
+
+
+class EtaTest(unittest.TestCase):
+    """ETAs extrapolate the current piece."""
+
+    def setUp(self):
+        self.model = GrowthModel()
+        self.model.extend(SNAPSHOTS)
+
+    def test_eta(self):
+        """Hours to a target, 0 once reached, None without growth."""
+        current = SNAPSHOTS[-1][1][SCIENTISTS_CARD_ID]
+        self.assertAlmostEqual(self.model.eta(SCIENTISTS_CARD_ID, current * 10), 10.0)
+        self.assertEqual(self.model.eta(SCIENTISTS_CARD_ID, current / 2), 0.0)
+        self.assertIsNone(self.model.eta(2, 100))
+
+        flat = GrowthModel(card_ids=(SCIENTISTS_CARD_ID,))
+        flat.extend([(hour * 3600, {SCIENTISTS_CARD_ID: 50.0}) for hour in range(5)])
+        self.assertIsNone(flat.eta(SCIENTISTS_CARD_ID, 100))
+
+    def test_experiment_etas(self):
+        """Costs come cheapest first, with timestamps after the latest snapshot."""
+        etas = experiment_etas(self.model, researched_experiments=())
+        costs = [eta["cost"] for eta in etas]
+        self.assertEqual(costs, sorted(costs))
+        for eta in etas:
+            expected = self.model.eta(SCIENTISTS_CARD_ID, eta["cost"])
+            self.assertEqual(eta["eta_hours"], expected)
+            self.assertTrue(
+                math.isclose(eta["eta_timestamp"], self.model.latest + expected * 3600)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
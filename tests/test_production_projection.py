@@ -0,0 +1,53 @@
+"""
+Tests for production projection
+Covers horizon validation
+"""
+
+import argparse
+import math
+import unittest
+from production_projection import positive_hours, project_production
+
+
+class PositiveHoursTest(unittest.TestCase):
+    """positive_hours() only accepts finite horizons above zero."""
+
+    def test_accepts_positive_hours(self):
+        """Positive numbers are returned as floats."""
+        self.assertEqual(positive_hours("24"), 24.0)
+        self.assertEqual(positive_hours("0.5"), 0.5)
+
+    def test_rejects_invalid_hours(self):
+        """Zero, negative, non-finite and non-numeric horizons are argparse errors."""
+        for value in ("0", "-3", "nan", "inf", "soon"):
+            with self.subTest(value=value), self.assertRaises(argparse.ArgumentTypeError):
+                positive_hours(value)
+
+    def test_parser_reports_error(self):
+        """A bad --horizon exits with a usage error instead of a math domain error."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--horizon", type=positive_hours)
+        with self.assertRaises(SystemExit):
+            parser.parse_args(["--horizon", "0"])
+
+
+class ProjectProductionTest(unittest.TestCase):
+    """project_production() works in log10 and rejects bad horizons."""
+
+    def test_projects_total_over_horizon(self):
+        """An industry at 24,000 over a 24 hour window gains 1,000 an hour."""
+        projection = project_production({"Potato": 24000.0}, horizon_hours=24.0)
+        log_total, log_rate, log_future = projection["Potato"]
+        self.assertAlmostEqual(10**log_total, 24000.0)
+        self.assertAlmostEqual(10**log_rate, 1000.0)
+        self.assertAlmostEqual(10**log_future, 48000.0)
+
+    def test_rejects_non_positive_horizon(self):
+        """Zero or NaN horizons raise ValueError."""
+        for hours in (0.0, -1.0, math.nan):
+            with self.subTest(hours=hours), self.assertRaises(ValueError):
+                project_production({"Potato": 1.0}, horizon_hours=hours)
+
+
+if __name__ == "__main__":
+    unittest.main()
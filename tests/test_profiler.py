@@ -0,0 +1,61 @@
+"""
+Tests for the opt-in profiler
+Covers phase and counter recording, aggregation and the summary line
+"""
+
+import unittest
+import profiler
+
+
+class ProfilingTest(unittest.TestCase):
+    """phase() and count() only record while a profile is active."""
+
+    def test_records_inside_profiling_block(self):
+        """Phases and counters land in the active profile."""
+        profile = profiler.Profile()
+        with profiler.profiling(profile):
+            with profiler.phase("scan"):
+                profiler.count("offsets", 3)
+            profiler.count("offsets")
+        record = profile.record(path="game.sav")
+        self.assertEqual(record["path"], "game.sav")
+        self.assertEqual(record["counters"], {"offsets": 4})
+        self.assertIn("scan", record["phases"])
+        self.assertGreaterEqual(record["total"], record["phases"]["scan"])
+
+    def test_no_op_without_profile(self):
+        """Outside a profiling block nothing is recorded."""
+        profile = profiler.Profile()
+        with profiler.phase("scan"):
+            profiler.count("offsets")
+        self.assertEqual(profile.phases, {})
+        self.assertEqual(profile.counters, {})
+
+
+class FormatTest(unittest.TestCase):
+    """Aggregation and text output."""
+
+    def test_aggregate_records(self):
+        """Phases and counters are summed across records."""
+        records = [
+            {"total": 1.0, "phases": {"scan": 0.5}, "counters": {"offsets": 2}},
+            {"total": 2.0, "phases": {"scan": 1.0, "parse": 0.5}, "counters": {}},
+        ]
+        total = profiler.aggregate_records(records)
+        self.assertEqual(total["saves"], 2)
+        self.assertEqual(total["total"], 3.0)
+        self.assertEqual(total["phases"], {"scan": 1.5, "parse": 0.5})
+        self.assertEqual(total["counters"], {"offsets": 2})
+
+    def test_summary_lists_slowest_phases(self):
+        """The summary line names the slowest phases first."""
+        record = {"total": 0.01, "phases": {"scan": 0.002, "parse": 0.006, "load": 0.001}}
+        self.assertEqual(
+            profiler.format_profile_summary(record, top_n=2),
+            "10.0 ms (parse 6.00 ms, scan 2.00 ms)",
+        )
+        self.assertEqual(profiler.format_profile_summary({"total": 0.01, "phases": {}}), "10.0 ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
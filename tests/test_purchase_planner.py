@@ -0,0 +1,91 @@
+"""
+Tests for the purchase planner
+Checks the knapsack and its backtracking against brute force
+"""
+
+import itertools
+import unittest
+from experiments_roi import EXPERIMENTS
+from purchase_planner import PurchasePlanner, experiment_value, plan_purchases
+
+# Few enough experiments to try every subset
+SAMPLE = dict(itertools.islice(EXPERIMENTS.items(), 0, 30, 3))
+
+
+def brute_force_value(budget):
+    """Best total value of any subset of SAMPLE within budget."""
+    best = 0.0
+    names = list(SAMPLE)
+    for size in range(len(names) + 1):
+        for bundle in itertools.combinations(names, size):
+            if sum(SAMPLE[name]["cost"] for name in bundle) <= budget:
+                value = sum(experiment_value(name, SAMPLE[name]) for name in bundle)
+                best = max(best, value)
+    return best
+
+
+class PurchasePlannerTest(unittest.TestCase):
+    """The planner finds the best bundle for every budget."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.total = sum(data["cost"] for data in SAMPLE.values())
+        cls.planner = PurchasePlanner(cls.total, researched_experiments=(), experiments=SAMPLE)
+
+    def test_matches_brute_force(self):
+        """best_value() and plan() agree with trying every subset."""
+        budgets = {0, 1, 30, 75, 150, 400, self.total // 2, self.total}
+        for budget in sorted(budget for budget in budgets if budget <= self.total):
+            with self.subTest(budget=budget):
+                plan = self.planner.plan(budget)
+                self.assertAlmostEqual(plan["value"], brute_force_value(budget))
+                self.assertLessEqual(plan["cost"], budget)
+                self.assertEqual(plan["leftover"], budget - plan["cost"])
+                self.assertEqual(len(set(plan["experiments"])), len(plan["experiments"]))
+                self.assertAlmostEqual(
+                    sum(experiment_value(name, SAMPLE[name]) for name in plan["experiments"]),
+                    plan["value"],
+                )
+
+    def test_full_budget_buys_everything(self):
+        """With enough Scientists every experiment is bought."""
+        self.assertEqual(sorted(self.planner.plan(self.total)["experiments"]), sorted(SAMPLE))
+
+    def test_budget_is_clamped(self):
+        """Budgets outside 0..max_budget are clamped."""
+        self.assertEqual(self.planner.plan(-5)["experiments"], [])
+        self.assertEqual(self.planner.best_value(10**9), self.planner.best_value(self.total))
+
+    def test_large_budget_is_solved_up_to_total_cost(self):
+        """Budgets beyond the total cost reuse the full-budget plan and keep their leftover."""
+        planner = PurchasePlanner(10**6, researched_experiments=(), experiments=SAMPLE)
+        self.assertEqual(len(planner._best), len(self.planner._best))  # pylint: disable=protected-access
+        plan = planner.plan(10**6)
+        self.assertEqual(plan["experiments"], self.planner.plan(self.total)["experiments"])
+        self.assertEqual(plan["budget"], 10**6)
+        self.assertEqual(plan["leftover"], 10**6 - self.total)
+        self.assertIsNone(planner.next_upgrade(10**6))
+
+    def test_marginal_values_sum_to_best(self):
+        """Marginal values add up to the best value of the whole budget."""
+        self.assertAlmostEqual(
+            sum(self.planner.marginal_values()), self.planner.best_value(self.total)
+        )
+
+    def test_next_upgrade(self):
+        """next_upgrade() is the first larger budget with a better plan."""
+        cheapest = min(data["cost"] for data in SAMPLE.values())
+        self.assertEqual(self.planner.next_upgrade(0), cheapest)
+        self.assertIsNone(self.planner.next_upgrade(self.total))
+
+    def test_plan_purchases(self):
+        """The default plan covers headroom for the next budget."""
+        plan = plan_purchases(100)
+        self.assertLessEqual(plan["cost"], 100)
+        if plan["next_budget"] is not None:
+            self.assertGreater(plan["next_budget"], 100)
+            self.assertGreater(plan["next_value"], plan["value"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for the purchase-order simulator
+Covers order simulation and which order the report calls fastest
+"""
+
+import math
+import unittest
+from purchase_simulator import format_simulation_report, simulate_order
+
+
+def summary(best, median, order):
+    """A strategy summary as simulate_strategies() returns it."""
+    return {
+        "runs": 10,
+        "reached": 10,
+        "best": best,
+        "best_order": order,
+        "mean": median,
+        "median": median,
+        "p10": best,
+        "p90": median * 2,
+    }
+
+
+class SimulateOrderTest(unittest.TestCase):
+    """simulate_order() returns hours until every industry reaches its goal."""
+
+    START = {"totals": [10.0, 10.0], "rates": [1.0, 1.0], "scientists": 0}
+
+    def test_without_purchases(self):
+        """With nothing bought, the goal is reached at the starting rates."""
+        hours = simulate_order([], self.START, 0.0, target_multiple=2.0, max_hours=100.0)
+        self.assertEqual(hours, 10.0)
+
+    def test_multiplier_speeds_up(self):
+        """An affordable x2 multiplier on both industries halves the time."""
+        order = [(0, (0, 1), 2.0, 0.0)]
+        hours = simulate_order(order, self.START, 0.0, target_multiple=2.0, max_hours=100.0)
+        self.assertEqual(hours, 5.0)
+
+    def test_unreachable_within_max_hours(self):
+        """A goal beyond max_hours is reported as never reached."""
+        hours = simulate_order([], self.START, 0.0, target_multiple=100.0, max_hours=10.0)
+        self.assertEqual(hours, math.inf)
+
+
+class FormatSimulationReportTest(unittest.TestCase):
+    """The report names the fastest order of any strategy."""
+
+    def test_fastest_order_is_overall_best(self):
+        """The best single run is reported even when its strategy's median is worse."""
+        report = {
+            "strategies": {
+                "greedy_roi": summary(19.7, 19.7, ["Greedy Order"]),
+                "random": summary(13.0, 25.0, ["Random Order"]),
+                "INDUSTRY>TRIALS>STATE": summary(13.7, 22.0, ["Category Order"]),
+            },
+            "simulations": 30,
+            "elapsed": 1.0,
+            "sims_per_sec": 30.0,
+        }
+        text = format_simulation_report(report)
+        fastest = text.split("Fastest order found", 1)[1]
+        self.assertIn("(random, 13.0 hours)", fastest)
+        self.assertIn("Random Order", fastest)
+        self.assertNotIn("Greedy Order", fastest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for the deduplicating save archive
+Covers XOR deltas, delta chains, deduplication and recovery from a torn index
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import save_archive
+from save_archive import INDEX_FILE, SaveArchive, apply_delta, xor_delta
+from save_generator import build_save
+
+
+def snapshot_series(count):
+    """Saves that differ a little from one to the next, like a game played over time."""
+    return [build_save(seed="series", scientists=100 + i) for i in range(count)]
+
+
+class XorDeltaTest(unittest.TestCase):
+    """xor_delta() and apply_delta() round-trip any pair of byte strings."""
+
+    def test_round_trip(self):
+        """Equal, longer, shorter and empty targets are rebuilt exactly."""
+        base = bytes(range(200))
+        for data in (base, base + b"tail", base[:50], b"", bytes(reversed(base))):
+            with self.subTest(size=len(data)):
+                self.assertEqual(apply_delta(base, xor_delta(base, data), len(data)), data)
+        self.assertEqual(apply_delta(b"", xor_delta(b"", b"abc"), 3), b"abc")
+
+    def test_identical_prefix_is_zero(self):
+        """Bytes shared with the base become zeros."""
+        self.assertEqual(xor_delta(b"abcd", b"abXd"), b"\x00\x00\x3b\x00")
+
+
+class SaveArchiveTest(unittest.TestCase):
+    """SaveArchive stores each distinct save once and reads every snapshot back."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_deduplicates(self):
+        """The same bytes are stored once; every distinct snapshot is recorded."""
+        data = build_save()
+        archive = SaveArchive(self.directory)
+        first = archive.add(data, name="a.sav", timestamp=1)
+        self.assertEqual(archive.add(data, name="b.sav", timestamp=2), first)
+        archive.add(data, name="b.sav", timestamp=2)  # Same snapshot again
+        stats = archive.stats()
+        self.assertEqual((stats["unique_saves"], stats["snapshots"]), (1, 2))
+        self.assertEqual(stats["raw_bytes"], 2 * len(data))
+        self.assertEqual(archive.get(first), data)
+        self.assertEqual(archive.get(first[:8]), data)
+
+    def test_delta_chains_round_trip(self):
+        """Deltas are used for similar saves, chains are capped, and all saves read back."""
+        saves = snapshot_series(save_archive.MAX_DELTA_CHAIN + 4)
+        archive = SaveArchive(self.directory)
+        digests = [archive.add(data, timestamp=i) for i, data in enumerate(saves)]
+        self.assertGreater(archive.stats()["delta_encoded"], 0)
+        self.assertLessEqual(
+            max(archive._chain_length(digest) for digest in digests),  # pylint: disable=protected-access
+            save_archive.MAX_DELTA_CHAIN,
+        )
+
+        reopened = SaveArchive(self.directory)
+        for digest, data in zip(digests, saves):
+            self.assertEqual(reopened.get(digest), data)
+        self.assertEqual(reopened.decode(digests[-1])["cards"].value(36), 100 + len(saves) - 1)
+
+    def test_delta_smaller_than_full_copies(self):
+        """Delta encoding stores a series in fewer bytes than full copies."""
+        saves = snapshot_series(8)
+        with_delta = SaveArchive(os.path.join(self.directory, "delta"))
+        without = SaveArchive(os.path.join(self.directory, "full"), delta=False)
+        for i, data in enumerate(saves):
+            with_delta.add(data, timestamp=i)
+            without.add(data, timestamp=i)
+        self.assertEqual(without.stats()["delta_encoded"], 0)
+        self.assertLess(with_delta.stats()["stored_bytes"], without.stats()["stored_bytes"])
+
+    def test_torn_index_line(self):
+        """An interrupted index write doesn't cost the next entry."""
+        saves = snapshot_series(2)
+        archive = SaveArchive(self.directory)
+        archive.add(saves[0], timestamp=1)
+        with open(os.path.join(self.directory, INDEX_FILE), "a", encoding="utf-8") as f:
+            f.write('{"type":"blo')
+
+        archive = SaveArchive(self.directory)
+        digest = archive.add(saves[1], timestamp=2)
+
+        reopened = SaveArchive(self.directory)
+        self.assertIn(digest, reopened)
+        self.assertEqual(reopened.get(digest), saves[1])
+        self.assertEqual(reopened.stats()["snapshots"], 2)
+
+    def test_snapshot_without_blob(self):
+        """stats() and get() cope with a snapshot whose blob was lost from the index."""
+        data = build_save()
+        archive = SaveArchive(self.directory)
+        digest = archive.add(data, timestamp=1)
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        with open(index_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        with open(index_path, "w", encoding="utf-8") as f:
+            f.writelines(line for line in lines if '"type":"blob"' not in line)
+
+        reopened = SaveArchive(self.directory)
+        stats = reopened.stats()
+        self.assertEqual((stats["snapshots"], stats["unreadable"], stats["raw_bytes"]), (1, 1, 0))
+        with self.assertRaises(KeyError):
+            reopened.get(digest)
+        # New saves are still stored and readable
+        other = build_save(scientists=1)
+        self.assertEqual(reopened.get(reopened.add(other, timestamp=2)), other)
+
+
+if __name__ == "__main__":
+    unittest.main()
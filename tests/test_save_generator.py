@@ -0,0 +1,55 @@
+"""
+Tests for the synthetic save generator
+Covers corpus reuse and regeneration when the settings change
+"""
+
+import os
+import tempfile
+import unittest
+from decoder import decode_save_bytes
+from save_generator import generate_corpus
+
+
+class GenerateCorpusTest(unittest.TestCase):
+    """generate_corpus() only reuses files written with the same settings."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def test_saves_decode(self):
+        """Every generated save decodes with the requested card count."""
+        for path in generate_corpus(self.directory, 3, card_offsets=(0x14A8, 0x2000)):
+            with open(path, "rb") as f:
+                decoded = decode_save_bytes(f.read())
+            self.assertEqual(len(decoded["cards"].ids), 39)
+
+    def test_same_settings_reuse_files(self):
+        """A second run with the same settings returns the files already written."""
+        first = generate_corpus(self.directory, 2, seed=7)
+        mtimes = [os.stat(path).st_mtime_ns for path in first]
+        second = generate_corpus(self.directory, 2, seed=7)
+        self.assertEqual(first, second)
+        self.assertEqual([os.stat(path).st_mtime_ns for path in second], mtimes)
+
+    def test_changed_settings_regenerate(self):
+        """Changing the seed, card count or offsets never reuses a stale save."""
+        base = generate_corpus(self.directory, 2, seed=7)
+        variants = (
+            generate_corpus(self.directory, 2, seed=8),
+            generate_corpus(self.directory, 2, seed=7, card_count=20),
+            generate_corpus(self.directory, 2, seed=7, card_offsets=(0x2000,)),
+        )
+        for paths in variants:
+            self.assertFalse(set(paths) & set(base))
+            for path, old in zip(paths, base):
+                with open(path, "rb") as f, open(old, "rb") as g:
+                    self.assertNotEqual(f.read(), g.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
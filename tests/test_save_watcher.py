@@ -0,0 +1,130 @@
+"""
+Tests for watch mode
+Covers SaveWatcher debouncing, the CLI watch loop and the GUI's polling while a job is running
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+import analyze_experiments
+from decode_cache import DecodeCache
+from save_generator import write_save
+from save_watcher import SaveWatcher
+
+try:
+    from decoder_gui import AdventureDecoderGUI
+except ImportError:  # No tkinter
+    AdventureDecoderGUI = None
+
+
+def touch(path, content, mtime_ns):
+    """Write content to path and give it a fixed modification time."""
+    with open(path, "wb") as f:
+        f.write(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class SaveWatcherTest(unittest.TestCase):
+    """SaveWatcher.poll() reports a change once it has settled."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "game.sav")
+        touch(self.path, b"a", 1_000_000_000)
+
+    def test_change_reported_after_debounce(self):
+        """A change is reported once, after it stayed unchanged for the debounce."""
+        watcher = SaveWatcher(self.path, debounce=2.0)
+        watcher.sync()
+        touch(self.path, b"bb", 2_000_000_000)
+
+        self.assertFalse(watcher.poll(now=10.0))  # change first seen
+        self.assertFalse(watcher.poll(now=11.0))  # still settling
+        self.assertTrue(watcher.poll(now=12.5))
+        self.assertFalse(watcher.poll(now=20.0))  # already reported
+
+    def test_unchanged_save_not_reported(self):
+        """Nothing is reported for a save that didn't change."""
+        watcher = SaveWatcher(self.path, debounce=0.0)
+        watcher.sync()
+        self.assertFalse(watcher.poll(now=1.0))
+        self.assertFalse(watcher.poll(now=2.0))
+
+
+class CliWatchTest(unittest.TestCase):
+    """analyze_experiments.watch() survives the save going missing."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "game.sav")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_missing_save_keeps_watching(self):
+        """An unreadable save is reported and the next change is still analyzed."""
+        path = self.path
+
+        class FakeWatcher:  # pylint: disable=too-few-public-methods
+            """Reports a change while the save is missing, then once it exists."""
+
+            def __init__(self, *_args, **_kwargs):
+                pass
+
+            def watch(self, _interval):
+                """Yield the path before and after the save is written."""
+                yield path
+                write_save(path)
+                yield path
+
+        output = io.StringIO()
+        with mock.patch.object(analyze_experiments, "SaveWatcher", FakeWatcher):
+            with contextlib.redirect_stdout(output):
+                status = analyze_experiments.watch(path, DecodeCache(), 0, 0)
+        self.assertEqual(status, 0)
+        self.assertIn("Could not read save file", output.getvalue())
+        self.assertIn("Current Scientists", output.getvalue())
+
+
+@unittest.skipIf(AdventureDecoderGUI is None, "tkinter is not available")
+class PollWatchTest(unittest.TestCase):
+    """The GUI doesn't lose a change that settles while a job is running."""
+
+    def test_change_during_job_is_decoded_afterwards(self):
+        """A save settling while a job runs is decoded once the job finishes."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.sav")
+            touch(path, b"a", 1_000_000_000)
+            watcher = SaveWatcher(path, debounce=0.0)
+            watcher.sync()
+
+            started = []
+            gui = types.SimpleNamespace(
+                watcher=watcher,
+                current_job=("future", "cancel_event"),
+                root=types.SimpleNamespace(after=lambda *args: None),
+                start_job=lambda *args: started.append(args),
+                decode_job=None,
+                display_watch_results=None,
+                poll_watch=None,
+            )
+
+            touch(path, b"bb", 2_000_000_000)
+            for _ in range(3):  # change seen and settled while the job runs
+                AdventureDecoderGUI.poll_watch(gui, watcher)
+            self.assertEqual(started, [])
+
+            gui.current_job = None
+            AdventureDecoderGUI.poll_watch(gui, watcher)  # sees the change
+            AdventureDecoderGUI.poll_watch(gui, watcher)  # and that it settled
+            self.assertEqual(len(started), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
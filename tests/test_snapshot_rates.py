@@ -0,0 +1,103 @@
+"""
+Tests for snapshot diffs and production rates
+Covers alignment, deltas and rates, the history path and growth averages
+"""
+
+import math
+import shutil
+import tempfile
+import unittest
+from card_history import CardHistory
+from decoder import _numpy
+from snapshot_rates import (
+    card_matrix,
+    growth_rates,
+    history_rates,
+    recent_growth,
+    snapshot_rates,
+)
+
+SNAPSHOTS = [
+    (0, {1: 100.0, 2: 10.0}),
+    (3600, {1: 160.0, 2: 12.0}),
+    (3 * 3600, {1: 260.0}),  # Card 2 missing
+    (4 * 3600, {1: 300.0, 2: 20.0}),
+]
+
+
+class CardMatrixTest(unittest.TestCase):
+    """card_matrix() aligns snapshots on card IDs."""
+
+    def test_alignment(self):
+        """Rows are sorted by time, missing cards are NaN and duplicates keep the last."""
+        snapshots = [(60, {1: 2.0}), (0, {1: 1.0, 2: 5.0}), (60, {1: 3.0})]
+        times, values = card_matrix(snapshots, (1, 2))
+        self.assertEqual(times.tolist(), [0.0, 60.0])
+        self.assertEqual(values[:3].tolist(), [1.0, 5.0, 3.0])
+        self.assertTrue(math.isnan(values[3]))
+
+
+class SnapshotRatesTest(unittest.TestCase):
+    """snapshot_rates() diffs consecutive snapshots."""
+
+    def test_deltas_and_rates(self):
+        """Deltas are per interval; rates divide by the interval in hours."""
+        result = snapshot_rates(SNAPSHOTS, card_ids=(1, 2))
+        self.assertEqual(list(result["hours"]), [1.0, 2.0, 1.0])
+        self.assertEqual([list(row) for row in result["deltas"]][0], [60.0, 2.0])
+        self.assertEqual(list(result["rates"][1])[0], 50.0)
+        self.assertTrue(math.isnan(result["rates"][1][1]))
+
+    def test_too_few_snapshots(self):
+        """One snapshot has no intervals."""
+        result = snapshot_rates(SNAPSHOTS[:1], card_ids=(1,))
+        self.assertEqual((len(result["hours"]), result["deltas"]), (0, []))
+
+    def test_growth_rates_skip_missing(self):
+        """Intervals with a missing card are left out of its average."""
+        growth = growth_rates(snapshot_rates(SNAPSHOTS, card_ids=(1, 2, 3)))
+        self.assertEqual(growth[1], 200.0 / 4)
+        self.assertEqual(growth[2], 2.0)  # Only the first interval has card 2 at both ends
+        self.assertNotIn(3, growth)
+
+    @unittest.skipIf(_numpy() is None, "NumPy is not installed")
+    def test_numpy_matches(self):
+        """The NumPy path gives the same growth."""
+        plain = growth_rates(snapshot_rates(SNAPSHOTS, card_ids=(1, 2)))
+        vectorized = growth_rates(snapshot_rates(SNAPSHOTS, card_ids=(1, 2), use_numpy=True))
+        self.assertEqual(plain.keys(), vectorized.keys())
+        for card_id, rate in plain.items():
+            self.assertAlmostEqual(vectorized[card_id], rate)
+
+
+class HistoryRatesTest(unittest.TestCase):
+    """Rates read from a CardHistory match rates from the snapshots."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.history = CardHistory(self.directory)
+        for timestamp, cards in SNAPSHOTS:
+            self.history.append(cards, timestamp)
+
+    def tearDown(self):
+        self.history.close()
+        shutil.rmtree(self.directory)
+
+    def test_matches_snapshot_rates(self):
+        """history_rates() gives the same deltas as snapshot_rates()."""
+        from_history = history_rates(self.history, card_ids=(1, 2))
+        direct = snapshot_rates(SNAPSHOTS, card_ids=(1, 2))
+        self.assertEqual(list(from_history["hours"]), list(direct["hours"]))
+        self.assertEqual(
+            repr([list(row) for row in from_history["deltas"]]),
+            repr([list(row) for row in direct["deltas"]]),
+        )
+
+    def test_recent_growth_window(self):
+        """recent_growth() only averages the last window_hours."""
+        self.assertEqual(recent_growth(self.history, window_hours=1, card_ids=(1,)), {1: 40.0})
+        self.assertEqual(recent_growth(self.history, window_hours=24, card_ids=(1,)), {1: 50.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
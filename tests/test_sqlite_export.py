@@ -0,0 +1,110 @@
+"""
+Tests for the SQLite export
+Covers the stored rows, resumable re-runs and deduplication by content hash
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from decoder import CARD_RECORD
+from sqlite_export import connect, export_saves
+from save_generator import DEFAULT_CARD_COUNT, DEFAULT_CARD_OFFSET, build_save, generate_corpus
+
+
+class ExportSavesTest(unittest.TestCase):
+    """export_saves() imports each distinct save once, across runs."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = generate_corpus(os.path.join(self.directory, "saves"), 5)
+        self.connection = connect(os.path.join(self.directory, "saves.db"))
+
+    def tearDown(self):
+        self.connection.close()
+        shutil.rmtree(self.directory)
+
+    def count(self, table):
+        """Rows in a table."""
+        return self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_rows(self):
+        """Each save gets its cards, missions and top_n rankings."""
+        counts = export_saves(self.connection, self.paths, top_n=2, chunk_saves=2)
+        self.assertEqual(counts, {"imported": 5, "skipped": 0, "failed": 0})
+        self.assertEqual(self.count("saves"), 5)
+        self.assertEqual(self.count("cards"), 5 * 39)
+        self.assertEqual(self.count("rankings"), 5 * 2)
+        self.assertGreater(self.count("missions"), 0)
+        scientists = self.connection.execute(
+            "SELECT value FROM cards JOIN saves USING (save_id) WHERE card_id = 36 AND path = ?",
+            (self.paths[0],),
+        ).fetchone()[0]
+        self.assertEqual(scientists, 105)
+
+    def test_rerun_skips_imported(self):
+        """A second run only imports saves whose content is new."""
+        export_saves(self.connection, self.paths[:3])
+        counts = export_saves(self.connection, self.paths)
+        self.assertEqual(counts, {"imported": 2, "skipped": 3, "failed": 0})
+        self.assertEqual(self.count("saves"), 5)
+        ids = [row[0] for row in self.connection.execute("SELECT save_id FROM saves")]
+        self.assertEqual(sorted(ids), [1, 2, 3, 4, 5])
+
+    def test_worker_processes(self):
+        """Worker processes skip already imported saves too."""
+        export_saves(self.connection, self.paths[:2])
+        counts = export_saves(self.connection, self.paths, workers=2)
+        self.assertEqual(counts, {"imported": 3, "skipped": 2, "failed": 0})
+        self.assertEqual(self.count("cards"), 5 * 39)
+
+    def test_copies_stored_once(self):
+        """A save copied under another name is stored once."""
+        copy = os.path.join(self.directory, "copy.sav")
+        shutil.copyfile(self.paths[0], copy)
+        counts = export_saves(self.connection, [self.paths[0], copy])
+        self.assertEqual(counts, {"imported": 1, "skipped": 1, "failed": 0})
+
+    def test_failures(self):
+        """Undecodable saves are stored with an error; unreadable ones are only counted."""
+        junk = os.path.join(self.directory, "junk.sav")
+        with open(junk, "wb") as f:
+            f.write(b"not a save")
+        missing = os.path.join(self.directory, "missing.sav")
+        counts = export_saves(self.connection, [junk, missing])
+        self.assertEqual(counts, {"imported": 0, "skipped": 0, "failed": 2})
+        error = self.connection.execute("SELECT error FROM saves").fetchone()[0]
+        self.assertEqual(error, "No ADCM header found")
+
+    def test_bad_values_dont_abort_the_chunk(self):
+        """NaN cards are left out and failed analyses recorded, without losing good saves."""
+        data = bytearray(build_save(seed="nan"))
+        # Card 1 is the last record of the vector
+        card_1 = DEFAULT_CARD_OFFSET + (DEFAULT_CARD_COUNT - 1) * CARD_RECORD.size
+        CARD_RECORD.pack_into(data, card_1, 1, 0, float("nan"))
+        nan_path = os.path.join(self.directory, "nan.sav")
+        inf_path = os.path.join(self.directory, "inf.sav")
+        with open(nan_path, "wb") as f:
+            f.write(data)
+        with open(inf_path, "wb") as f:
+            f.write(build_save(scientists=float("inf")))
+
+        counts = export_saves(self.connection, [self.paths[0], nan_path, inf_path])
+        self.assertEqual(counts, {"imported": 2, "skipped": 0, "failed": 1})
+        errors = dict(self.connection.execute("SELECT path, error FROM saves"))
+        self.assertIsNone(errors[nan_path])
+        self.assertIn("OverflowError", errors[inf_path])
+        self.assertEqual(self.count("cards"), 39 + 38)
+
+    def test_rolls_back_failed_chunk(self):
+        """A chunk that fails to insert leaves no partial rows behind."""
+        export_saves(self.connection, self.paths[:1])
+        self.connection.execute("DELETE FROM saves")  # Orphans the first save's cards
+        with self.assertRaises(sqlite3.IntegrityError):
+            export_saves(self.connection, self.paths[:2])
+        self.assertEqual(self.count("saves"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()